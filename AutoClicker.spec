@@ -6,7 +6,7 @@ a = Analysis(
     pathex=['.'],
     binaries=[],
     datas=[('assets', 'assets')],
-    hiddenimports=['src', 'src.main', 'src.memory', 'src.memory.manager', 'src.windows', 'src.windows.main_window', 'src.windows.config_window', 'src.clickers', 'src.clickers.simulating_game', 'src.clickers.antidetection_bypass', 'src.clickers.native_input', 'src.utils', 'src.utils.basics', 'src.lib.globals', 'src.driver', 'src.driver.components', 'src.driver.components.switch', 'src.driver.executions', 'src.driver.executions.startup'],
+    hiddenimports=['src', 'src.main', 'src.memory', 'src.memory.manager', 'src.windows', 'src.windows.main_window', 'src.windows.config_window', 'src.clickers', 'src.clickers.simulating_game', 'src.clickers.antidetection_bypass', 'src.clickers.native_input', 'src.utils', 'src.utils.basics', 'src.lib.globals', 'src.driver', 'src.driver.components', 'src.driver.components.switch', 'src.driver.executions', 'src.driver.executions.startup', 'src.windows.jobs_window', 'src.windows.macro_window', 'src.windows.condition_window', 'src.windows.presets_window', 'src.vision', 'src.vision.locator', 'src.vision.watcher', 'src.utils.lazy', 'src.utils.startup', 'src.clickers.engine', 'src.clickers.scheduler', 'src.clickers.timing', 'src.clickers.click_job', 'src.clickers.sampler', 'src.clickers.rng', 'src.clickers.presets', 'src.clickers.movement', 'src.clickers.trajectory', 'src.clickers.backends', 'src.clickers.backends.base', 'src.clickers.backends.hook', 'src.clickers.backends.recording', 'src.clickers.backends.registry', 'src.clickers.backends.tracing', 'src.clickers.backends.windows', 'src.clickers.backends.xtest', 'src.macros', 'src.macros.macro_file', 'src.macros.player', 'src.macros.recorder', 'src.macros.script', 'src.macros.timeline', 'src.memory.store', 'src.utils.metrics', 'src.utils.profiler', 'src.utils.trace', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
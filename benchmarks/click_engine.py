@@ -0,0 +1,260 @@
+"""
+Click Engine Benchmark - What the click loop actually achieves, headless.
+
+Every scenario runs the real ClickEngine (same compile path, scheduler and
+sleeper as the app) against an in-memory RecordingBackend, then reports:
+1. Achieved rate versus requested (and nominal) rate
+2. Interval error percentiles (p50/p95/p99/max), measured between
+   consecutive actions against the delay the job asked for
+3. Start-to-first-event and stop latency
+4. CPU time per 1000 actions (whole process)
+5. Allocations per action, from a second run under tracemalloc
+
+Scenarios: the app's default settings (humanized delays, timed presses,
+not high-rate), plain clicks, hold mode, fixed-position clicks (natural mouse
+movement, batched and paced) and one per BypassProfile. Jobs are seeded, so every run (and
+every version) draws the same delays, holds and moves. Results are written
+as JSON so runs can be compared across versions.
+
+Usage:
+    python -m benchmarks.click_engine [--duration S] [--interval-ms MS]
+        [--seed N] [--scenario NAME ...] [--output FILE]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass, replace
+from typing import List, Optional
+from src.clickers.antidetection_bypass import AntiDetectionBypass, BypassProfile
+from src.clickers.backends import RecordingBackend
+from src.clickers.click_job import ClickJob, compile_program
+from src.clickers.engine import ClickEngine, JobState
+from src.clickers.movement import compile_move
+from src.clickers.rng import JobRandom
+from src.clickers.timing import get_sleeper
+
+# Seconds to wait for the engine thread to process a command.
+COMMAND_TIMEOUT = 2.0
+
+
+@dataclass
+class Scenario:
+    """One benchmarked job configuration."""
+    name: str
+    job: ClickJob
+    profile: Optional[BypassProfile] = None
+
+
+class CountingBackend(RecordingBackend):
+    """Recording backend that keeps no events (for the allocation run)."""
+
+    def _record(self, kind: str, *args):
+        pass
+
+
+def build_scenarios(interval: float, seed: Optional[int] = None) -> List[Scenario]:
+    """Default, plain, hold, fixed-position (batched and paced) and one scenario per bypass profile."""
+    base = ClickJob(interval=interval, high_rate=True, press_duration=0, seed=seed)
+    fixed = replace(base, use_current_pos=False, click_pos=(400, 300))
+    scenarios = [
+        # What a user gets without touching the settings (100 ms, not `interval`).
+        Scenario("default", ClickJob(seed=seed)),
+        Scenario("plain", base),
+        Scenario("hold", replace(base, hold_mode=True, hold_duration=interval / 2)),
+        # Batched path injection (high-rate) versus paced moves with pauses.
+        Scenario("fixed_position", fixed),
+        Scenario("fixed_position_paced", replace(fixed, high_rate=False)),
+    ]
+    for profile in BypassProfile:
+        job = replace(base, bypass_enabled=True, bypass_profile=profile.value)
+        scenarios.append(Scenario(f"bypass_{profile.value}", job, profile))
+    return scenarios
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def compile_scenario(scenario: Scenario, backend, delays: Optional[array] = None):
+    """Compile the scenario job, optionally recording every requested delay."""
+    rng = JobRandom(scenario.job.seed)
+    bypass = None
+    if scenario.profile is not None:
+        bypass = AntiDetectionBypass(scenario.profile, rng)
+        bypass.reset_session()
+    move_to = compile_move(backend, bypass, rng.movement, batched=scenario.job.high_rate) if not scenario.job.use_current_pos else None
+    program = compile_program(scenario.job, backend, bypass, move_to, rng)
+    if delays is not None and program.next_delay is not None:
+        next_delay, append = program.next_delay, delays.append
+        def recorded_delay():
+            delay = next_delay()
+            append(delay)
+            return delay
+        program = replace(program, next_delay=recorded_delay)
+    return program
+
+
+def wait_for(predicate, timeout: float = COMMAND_TIMEOUT) -> bool:
+    """Spin (yielding) until `predicate()` is true or the timeout expires."""
+    end = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > end:
+            return False
+        time.sleep(0)
+    return True
+
+
+def run_scenario(scenario: Scenario, duration: float) -> dict:
+    """Run one scenario for `duration` seconds and compute its metrics."""
+    clock = time.perf_counter
+    backend = RecordingBackend(clock)
+    delays = array("d")
+    program = compile_scenario(scenario, backend, delays)
+    action_kind = "down" if scenario.job.is_mouse_button else "key_down"
+
+    engine = ClickEngine(get_sleeper(scenario.job.timing_precision), clock)
+    handle = engine.add_job(scenario.name, program)
+    wait_for(lambda: engine._thread is not None and engine._thread.is_alive())
+
+    cpu_started = time.process_time()
+    started = clock()
+    handle.start()
+    time.sleep(duration)
+    stop_requested = clock()
+    handle.stop()
+    wait_for(lambda: handle.state == JobState.STOPPED)
+    stopped = clock()
+    cpu = time.process_time() - cpu_started
+    stats = handle.get_stats()
+    engine.shutdown()
+
+    events = backend.events
+    actions = [event[0] for event in events if event[1] == action_kind and event[0] <= stop_requested]
+    last_event = max((event[0] for event in events), default=stop_requested)
+
+    # Delay i separates actions i and i + 1; the delays after the last action were still pending.
+    intervals = min(len(actions) - 1, len(delays)) if actions else 0
+    errors = []
+    for i in range(intervals):
+        errors.append(abs((actions[i + 1] - actions[i]) - delays[i]))
+    errors.sort()
+    elapsed = (actions[-1] - actions[0]) if len(actions) > 1 else 0.0
+    requested = sum(delays[:intervals])
+
+    return {
+        "name": scenario.name,
+        "job": scenario.job.to_dict(),
+        "actions": len(actions),
+        "nominal_rate": 1 / scenario.job.interval,
+        # Humanized jobs ask for varying delays; this is the rate they asked for.
+        "requested_rate": intervals / requested if requested > 0 else 0.0,
+        "achieved_rate": (len(actions) - 1) / elapsed if elapsed > 0 else 0.0,
+        "interval_error_ms": {
+            "p50": percentile(errors, 0.50) * 1000,
+            "p95": percentile(errors, 0.95) * 1000,
+            "p99": percentile(errors, 0.99) * 1000,
+            "max": (errors[-1] if errors else 0.0) * 1000,
+        },
+        "first_event_latency_ms": ((events[0][0] - started) * 1000) if events else None,
+        "stop_latency_ms": (max(stopped, last_event) - stop_requested) * 1000,
+        "cpu_ms_per_1k_actions": (cpu / len(actions) * 1e6) if actions else None,
+        "overruns": stats.overruns,
+        "skipped_ticks": stats.skipped_ticks,
+        "errors": handle.errors,
+    }
+
+
+def measure_allocations(scenario: Scenario, duration: float) -> dict:
+    """
+    Allocation cost per action, measured with tracemalloc.
+
+    tracemalloc only exposes live memory, so two figures are reported: the
+    traced blocks still allocated after the run (retained per action) and
+    the peak of transient memory above the starting point.
+    """
+    backend = CountingBackend()
+    program = compile_scenario(scenario, backend)
+    engine = ClickEngine(get_sleeper(scenario.job.timing_precision))
+    handle = engine.add_job(scenario.name, program)
+    handle.start()
+    time.sleep(min(0.1, duration))  # Warm up: buffers filled, code paths taken
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    ticks = handle.get_stats().ticks
+    time.sleep(duration)
+    actions = handle.get_stats().ticks - ticks
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    engine.shutdown()
+
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "retained_blocks_per_action": retained / actions if actions else None,
+        "peak_transient_bytes": peak - current,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Current git commit, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the click engine headless.")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds per scenario")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Requested interval")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the job random streams")
+    parser.add_argument("--alloc-duration", type=float, default=0.5, help="Seconds of the allocation run")
+    parser.add_argument("--scenario", action="append", help="Only run these scenarios")
+    parser.add_argument("--output", default="click_engine_benchmark.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    scenarios = build_scenarios(args.interval_ms / 1000, args.seed)
+    if args.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenario]
+
+    results = []
+    for scenario in scenarios:
+        result = run_scenario(scenario, args.duration)
+        result["allocations"] = measure_allocations(scenario, args.alloc_duration)
+        results.append(result)
+        error = result["interval_error_ms"]
+        print(f"{scenario.name:<20} {result['achieved_rate']:8.1f}/{result['requested_rate']:.1f}/s  "
+              f"err p50 {error['p50']:.3f} p99 {error['p99']:.3f} max {error['max']:.3f} ms  "
+              f"cpu {result['cpu_ms_per_1k_actions'] or 0:.1f} ms/1k")
+
+    report = {
+        "benchmark": "click_engine",
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "duration": args.duration,
+        "interval_ms": args.interval_ms,
+        "seed": args.seed,
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
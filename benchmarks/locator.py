@@ -0,0 +1,104 @@
+"""
+Locator Benchmark - Time to find a template image in a 1080p frame.
+
+Measures TemplateLocator.locate on an in-memory frame (no screen capture):
+1. Full search - no cached match, the whole pyramid search runs
+2. Cached search - the target is still where it was last found
+3. Moved target - the cached region misses and the full search runs
+
+By default the frame is synthetic (seeded, UI-like rectangles over noise)
+and the template is cut out of it. Screenshot fixtures can be passed
+instead; the template must then appear in the screenshot.
+
+Usage:
+    python -m benchmarks.locator [--runs N] [--seed N]
+        [--screenshot FILE --template FILE]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from src.vision.locator import LocatorError, TemplateLocator, np, to_gray
+
+# Budget of one locate on a 1080p frame.
+TARGET_MS = 20.0
+WIDTH, HEIGHT = 1920, 1080
+TEMPLATE_SIZE = (96, 64)
+
+
+def synthetic_frame(seed: int):
+    """Seeded 1080p grayscale frame: noise under flat-colored rectangles."""
+    rng = np.random.default_rng(seed)
+    frame = rng.normal(128, 20, (HEIGHT, WIDTH)).astype(np.float32)
+    for _ in range(300):
+        y, x = rng.integers(0, HEIGHT - 10), rng.integers(0, WIDTH - 10)
+        frame[y:y + rng.integers(10, 80), x:x + rng.integers(10, 80)] = rng.integers(0, 255)
+    return frame
+
+
+def measure(function, runs: int) -> dict:
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"p50": statistics.median(times), "max": max(times)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the template locator.")
+    parser.add_argument("--runs", type=int, default=50, help="Locates per case")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic frame")
+    parser.add_argument("--screenshot", help="Screenshot fixture (with --template)")
+    parser.add_argument("--template", help="Template fixture (with --screenshot)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.screenshot and args.template:
+            frame, template = to_gray(args.screenshot), to_gray(args.template)
+        else:
+            frame = synthetic_frame(args.seed)
+            width, height = TEMPLATE_SIZE
+            template = frame[500:500 + height, 900:900 + width].copy()
+        locator = TemplateLocator(template)
+    except LocatorError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    match = locator.locate(frame)
+    if match is None:
+        print("Template not found in the frame", file=sys.stderr)
+        return 1
+    # The same template pasted elsewhere, for the moved-target case.
+    moved = frame.copy()
+    width, height = locator.size
+    moved[match.top:match.top + height, match.left:match.left + width] = frame.mean()
+    left, top = (match.left + frame.shape[1] // 2) % (frame.shape[1] - width), (match.top + frame.shape[0] // 2) % (frame.shape[0] - height)
+    moved[top:top + height, left:left + width] = template
+
+    def full():
+        locator.last = None
+        locator.locate(frame)
+
+    def moved_target():
+        locator.last = match
+        locator.locate(moved)
+
+    results = [
+        ("full search", measure(full, args.runs)),
+        ("cached search", measure(lambda: locator.locate(frame), args.runs)),
+        ("moved target", measure(moved_target, args.runs)),
+    ]
+
+    print(f"Template {width}x{height} in a {frame.shape[1]}x{frame.shape[0]} frame, {len(locator.levels)} pyramid levels, match at {match.center} (score {match.score:.3f})")
+    print(f"{'case':<16}{'p50 ms':>10}{'max ms':>10}")
+    for name, result in results:
+        print(f"{name:<16}{result['p50']:>10.2f}{result['max']:>10.2f}")
+    verdict = "within" if results[0][1]["p50"] <= TARGET_MS else "over"
+    print(f"Full search {verdict} the {TARGET_MS:g} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
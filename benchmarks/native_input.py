@@ -0,0 +1,116 @@
+"""
+Native Input Benchmark - Events/s of the injection paths.
+
+Compares, for the same left clicks:
+1. Allocating path - a new INPUT, ULONG and pointer per event (previous code)
+2. Per-call API - NativeInput.mouse_down/mouse_up (prefilled INPUT per button)
+3. Compiled events - templates from NativeInput.compile_button
+4. Compiled burst - one template holding 32 clicks
+
+On Windows the real SendInput is called (events are injected, so keep the
+cursor somewhere harmless). Elsewhere SendInput is replaced by a C function
+with the same ctypes signature, which measures the Python-side overhead.
+
+Usage:
+    python -m benchmarks.native_input [--events N]
+"""
+
+import argparse
+import ctypes
+import sys
+import time
+from ctypes import wintypes
+from src.clickers.native_input import (
+    INPUT, INPUT_MOUSE, MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP,
+    InputMethod, NativeInput
+)
+
+BURST = 32
+
+
+class _StubUser32:
+    """SendInput stand-in: labs() returns its first argument, the event count."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(None)
+        self.SendInput = libc.labs
+        self.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+        self.SendInput.restype = wintypes.UINT
+
+
+def make_native_input() -> NativeInput:
+    """SendInput-backed NativeInput (stubbed outside Windows)."""
+    if sys.platform == "win32":
+        return NativeInput(InputMethod.SENDINPUT)
+    native = NativeInput.__new__(NativeInput)
+    native.method = native.active_method = InputMethod.SENDINPUT
+    native.interception_available = False
+    native.interception_context = native.interception_device = None
+    native.batch_size = NativeInput.DEFAULT_BATCH_SIZE
+    native._owner, native._views = None, {}
+    native._init_buffers()
+    native.user32 = _StubUser32()
+    native.screen_width, native.screen_height = 1920, 1080
+    return native
+
+
+def allocating_click(native: NativeInput):
+    """Click the way every event was sent before templates existed."""
+    for flags in (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP):
+        extra = ctypes.pointer(wintypes.ULONG(0))
+        inp = INPUT()
+        inp.type = INPUT_MOUSE
+        inp.union.mi.dwFlags = flags
+        inp.union.mi.dwExtraInfo = extra
+        native.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+
+
+def measure(name: str, function, events_per_call: int, events: int) -> dict:
+    """Run `function` until `events` events are sent; report the rate."""
+    calls = max(1, events // events_per_call)
+    function()  # Warm up
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        function()
+    elapsed = time.perf_counter() - started
+
+    sent = calls * events_per_call
+    return {
+        "name": name,
+        "events_per_s": sent / elapsed,
+        "ns_per_event": elapsed / sent * 1e9,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the native input injection paths.")
+    parser.add_argument("--events", type=int, default=200_000, help="Events sent per path")
+    args = parser.parse_args(argv)
+
+    native = make_native_input()
+    down, up = native.compile_button("left")
+    def compiled_click():
+        down()
+        up()
+    burst = native.compile_events([("down", "left"), ("up", "left")] * BURST)
+    def api_click():
+        native.mouse_down("left")
+        native.mouse_up("left")
+
+    results = [
+        measure("allocating path", lambda: allocating_click(native), 2, args.events),
+        measure("per-call API", api_click, 2, args.events),
+        measure("compiled events", compiled_click, 2, args.events),
+        measure(f"compiled burst x{BURST}", burst, 2 * BURST, args.events),
+    ]
+
+    stub = "" if sys.platform == "win32" else " (SendInput stubbed)"
+    print(f"Native input injection, {args.events} events per path{stub}")
+    print(f"{'path':<22}{'events/s':>14}{'ns/event':>12}")
+    for result in results:
+        print(f"{result['name']:<22}{result['events_per_s']:>14,.0f}{result['ns_per_event']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Presets Benchmark - Latency of switching the running job to a preset.
+
+Runs the main job on the real ClickEngine against an in-memory
+RecordingBackend, with a few presets (plain, turbo, hold, held until
+stopped) compiled by a PresetBank, then switches between them in a loop.
+Reports, in microseconds, the cost of the switch call (what a hotkey
+callback pays) and the time until the engine thread runs the new program
+(the budget is well under 1 ms).
+
+Usage:
+    python -m benchmarks.presets [--switches N] [--interval-ms MS]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+from src.clickers.backends import RecordingBackend
+from src.clickers.click_job import ClickJob, compile_program
+from src.clickers.engine import ClickEngine
+from src.clickers.presets import Preset, PresetBank
+from src.clickers.timing import get_sleeper
+from benchmarks.click_engine import percentile, wait_for
+
+BUDGET_US = 1000.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark switching the running job between presets.")
+    parser.add_argument("--switches", type=int, default=2000, help="Preset switches")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Click interval of the presets")
+    args = parser.parse_args(argv)
+
+    backend = RecordingBackend()
+    base = ClickJob(interval=args.interval_ms / 1000, high_rate=True, seed=1)
+    bank = PresetBank(lambda job: compile_program(job, backend, None))
+    for preset in (
+        Preset("plain", base),
+        Preset("turbo", replace(base, clicks_per_tick=5, press_duration=0)),
+        Preset("hold", replace(base, hold_mode=True, hold_duration=base.interval / 2)),
+        Preset("held", replace(base, hold_mode=True, hold_duration=0)),
+    ):
+        bank.add(preset)
+    started = time.perf_counter()
+    bank.compile_all()
+    compile_time = time.perf_counter() - started
+
+    engine = ClickEngine(get_sleeper(base.timing_precision))
+    handle = engine.add_job("Main", bank.programs["plain"])
+    handle.start()
+    names = [preset.name for preset in bank]
+    calls, applied = [], []
+    for i in range(args.switches):
+        program = bank.programs[names[(i + 1) % len(names)]]
+        started = time.perf_counter()
+        bank.switch(names[(i + 1) % len(names)], handle)
+        called = time.perf_counter()
+        if not wait_for(lambda: handle.program is program):
+            print("The engine did not apply a switch", file=sys.stderr)
+            engine.shutdown()
+            return 1
+        done = time.perf_counter()
+        calls.append((called - started) * 1e6)
+        applied.append((done - started) * 1e6)
+    engine.shutdown()
+
+    print(f"{len(names)} presets compiled in {compile_time * 1000:.2f} ms, {args.switches} switches at {args.interval_ms:g} ms intervals")
+    print(f"{'us':<10}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    for label, values in (("call", calls), ("applied", applied)):
+        values.sort()
+        print(f"{label:<10}{sum(values) / len(values):>10.1f}{percentile(values, 0.5):>10.1f}{percentile(values, 0.99):>10.1f}{values[-1]:>10.1f}")
+    print(f"p99 switch {'within' if percentile(applied, 0.99) < BUDGET_US else 'over'} the {BUDGET_US / 1000:g} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
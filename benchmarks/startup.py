@@ -0,0 +1,80 @@
+"""
+Startup Benchmark - Cold start of the app, in fresh interpreters.
+
+Each run is a new Python process with an empty temporary config directory
+(HOME and APPDATA point to it). It reports the time to import src.main and,
+when a display is available (Windows, or DISPLAY set), the time from launch
+until the main window is mapped; the window is closed right after. Both are
+compared to the budgets of src.utils.startup.
+
+Usage:
+    python -m benchmarks.startup [--runs N] [--imports-only]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from src.utils.startup import IMPORT_BUDGET, STARTUP_BUDGET
+from benchmarks.click_engine import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child process: mark the phases, close the window once shown, print the marks.
+CHILD = """
+import json
+from src.utils.startup import StartupProfile
+profile = StartupProfile()
+from src.main import AutoClicker
+profile.mark("imports")
+if {window}:
+    app = AutoClicker(startup=profile)
+    def close():
+        if profile.finished: app.on_closing()
+        else: app.root.after(5, close)
+    close()
+    app.run()
+print(json.dumps(dict(profile.marks)))
+"""
+
+
+def run_once(window: bool) -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, APPDATA=home)
+        output = subprocess.run([sys.executable, "-c", CHILD.format(window=window)], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cold start of the app.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes started")
+    parser.add_argument("--imports-only", action="store_true", help="Only time the imports (no window)")
+    args = parser.parse_args(argv)
+    window = not args.imports_only and (sys.platform == "win32" or bool(os.environ.get("DISPLAY")))
+
+    runs = []
+    for _ in range(args.runs):
+        try:
+            runs.append(run_once(window))
+        except subprocess.CalledProcessError as e:
+            print(e.stderr, file=sys.stderr)
+            return 1
+
+    print(f"{args.runs} fresh processes{'' if window else ', no window (imports only)'}")
+    print(f"{'ms':<14}{'p50':>10}{'max':>10}")
+    results = {}
+    for phase in runs[0]:
+        values = sorted(marks[phase] * 1000 for marks in runs)
+        results[phase] = percentile(values, 0.5)
+        print(f"{phase:<14}{results[phase]:>10.1f}{values[-1]:>10.1f}")
+    for phase, budget in (("imports", IMPORT_BUDGET), ("window shown", STARTUP_BUDGET)):
+        if phase in results:
+            print(f"Median {phase} {'within' if results[phase] < budget * 1000 else 'over'} the {budget * 1000:g} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
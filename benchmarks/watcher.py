@@ -0,0 +1,62 @@
+"""
+Watcher Benchmark - Cost of one condition check.
+
+Runs ConditionWatcher.check in a loop for a color rule and a change rule on
+regions of a given size, and reports the mean and max time per check (the
+budget is well under 1 ms). Regions come from a synthetic frame by default,
+or from the real screen with --screen (X11 display or Windows desktop).
+
+Usage:
+    python -m benchmarks.watcher [--checks N] [--size PX] [--screen]
+"""
+
+import argparse
+import sys
+from src.vision.locator import np
+from src.vision.watcher import Condition, ConditionWatcher, ImageSampler, WatchAction, WatcherError, WatchRule, screen_sampler
+
+BUDGET_MS = 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the condition watcher checks.")
+    parser.add_argument("--checks", type=int, default=5000, help="Checks per rule set")
+    parser.add_argument("--size", type=int, default=16, help="Side of the square regions, in pixels")
+    parser.add_argument("--screen", action="store_true", help="Sample the real screen instead of a synthetic frame")
+    args = parser.parse_args(argv)
+    if np is None:
+        print("NumPy is required", file=sys.stderr)
+        return 1
+
+    frame = np.random.default_rng(1).integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+    factory = screen_sampler if args.screen else (lambda region: ImageSampler(frame, region))
+    region = (100, 100, args.size, args.size)
+    cases = [
+        ("color", [WatchRule(Condition(region, (0, 255, 0)), WatchAction.GATE)]),
+        ("change", [WatchRule(Condition(region), WatchAction.STOP)]),
+        ("both", [WatchRule(Condition(region, (0, 255, 0)), WatchAction.GATE), WatchRule(Condition((400, 300, args.size, args.size)), WatchAction.STOP)]),
+    ]
+
+    source = "screen" if args.screen else "synthetic frame"
+    print(f"{args.checks} checks per case, {args.size}x{args.size} regions, {source}")
+    print(f"{'rules':<10}{'mean ms':>10}{'max ms':>10}")
+    worst = 0.0
+    for name, rules in cases:
+        watcher = ConditionWatcher(rules, lambda action: None, sampler_factory=factory)
+        try:
+            watcher.open()
+        except WatcherError as e:
+            print(e, file=sys.stderr)
+            return 1
+        for _ in range(args.checks):
+            watcher.check()
+        watcher.close()
+        stats = watcher.stats
+        worst = max(worst, stats.mean_time * 1000)
+        print(f"{name:<10}{stats.mean_time * 1000:>10.3f}{stats.max_time * 1000:>10.3f}")
+    print(f"Mean check {'within' if worst < BUDGET_MS else 'over'} the {BUDGET_MS:g} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
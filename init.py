@@ -1,3 +1,9 @@
+import sys
+from src.utils.startup import StartupProfile
+
+# Created before anything else is imported, so the imports are part of the profile.
+profile = StartupProfile(trace_imports="--startup-profile" in sys.argv)
+
 from src.main import main
 
-if __name__ == "__main__": main()
\ No newline at end of file
+if __name__ == "__main__": main(profile)
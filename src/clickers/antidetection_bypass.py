@@ -13,12 +13,14 @@ Tecnicas implementadas:
 6. Variacion adaptativa (cambia patrones con el tiempo)
 """
 
-import random
-import math
 import time
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, replace
 from typing import Tuple, Optional
 from enum import Enum
+from src.clickers.rng import JobRandom
+from src.clickers.sampler import DrawStream, RollingWindow
+from src.clickers.trajectory import ease
 
 class BypassProfile(Enum):
     """Perfiles de bypass predefinidos."""
@@ -69,6 +71,9 @@ class HumanizationConfig:
     rhythm_change_chance: float = 0.05   # 5% de cambiar ritmo base
     rhythm_variation: float = 0.2        # +-20% del ritmo base
 
+    # Estadisticas del modo adaptativo
+    stats_window: int = 100              # Intervalos recientes analizados (coste O(1) con cualquier tamano)
+
 
 class AntiDetectionBypass:
     """Sistema principal de bypass anti-deteccion."""
@@ -115,9 +120,10 @@ class AntiDetectionBypass:
         BypassProfile.ADAPTIVE: HumanizationConfig()  # Default, se ajusta dinamicamente
     }
 
-    def __init__(self, profile: BypassProfile = BypassProfile.MODERATE):
+    def __init__(self, profile: BypassProfile = BypassProfile.MODERATE, rng: Optional[JobRandom] = None):
         self.profile = profile
-        self.config = self.PROFILES.get(profile, HumanizationConfig())
+        # Copia propia: el modo adaptativo modifica la configuracion
+        self.config = replace(self.PROFILES.get(profile, HumanizationConfig()))
 
         # Estado interno
         self.click_count = 0
@@ -125,13 +131,34 @@ class AntiDetectionBypass:
         self.current_rhythm_modifier = 1.0
         self.in_burst_mode = False
         self.burst_clicks_remaining = 0
-        self.last_pause_time = time.time()
         self.session_start_time = time.time()
+        self.last_pause_time = self.session_start_time
 
-        # Estadisticas para modo adaptativo
-        self.timing_history = []
+        # Estadisticas para modo adaptativo (ventana movil, O(1) por click)
+        self.timing_history = RollingWindow(self.config.stats_window)
         self.detection_score = 0.0
 
+        # Fuentes de aleatoriedad y reloj (sustituibles para generar lotes)
+        self._now = time.time
+        self._projected_time = self.session_start_time
+        self.set_random(rng or JobRandom())
+
+    def set_random(self, rng: JobRandom):
+        """
+        Usa los flujos aleatorios de un trabajo (intervalos, holds y raton).
+        Con la misma semilla y reset_session() se repite la misma secuencia.
+        """
+        self.rng = rng
+        self._uniform = rng.interval.random
+        self._normal = rng.interval.normal
+        self._hold_normal = rng.hold.normal
+        self._draws = DrawStream(stream=rng.interval)
+        self._hold_draws = DrawStream(stream=rng.hold)
+
+    def _uniform_between(self, low: float, high: float) -> float:
+        """Equivalente a random.uniform usando la fuente actual."""
+        return low + (high - low) * self._uniform()
+
     def reset_session(self):
         """Reinicia el estado de la sesion."""
         self.click_count = 0
@@ -139,19 +166,25 @@ class AntiDetectionBypass:
         self.current_rhythm_modifier = 1.0
         self.in_burst_mode = False
         self.burst_clicks_remaining = 0
-        self.last_pause_time = time.time()
         self.session_start_time = time.time()
-        self.timing_history = []
+        self.last_pause_time = self.session_start_time
+        self.config = replace(self.PROFILES.get(self.profile, HumanizationConfig()))
+        self.timing_history.clear()
         self.detection_score = 0.0
+        self._projected_time = self.session_start_time
 
-    def gaussian_variation(self, base: float) -> float:
+    def gaussian_variation(self, base: float, normal=None) -> float:
         """
         Genera variacion usando distribucion gaussiana.
         Los humanos no tienen variacion uniforme - sus tiempos
         se agrupan alrededor de un valor central con cola.
+
+        Args:
+            base: Valor central
+            normal: Fuente de normales estandar (por defecto la de intervalos)
         """
         sigma = base * self.config.gaussian_sigma
-        variation = random.gauss(0, sigma)
+        variation = sigma * (normal or self._normal)()
         # Limitar variacion extrema (3 sigma)
         variation = max(-3 * sigma, min(3 * sigma, variation))
         return max(0.01, base + variation)
@@ -171,7 +204,7 @@ class AntiDetectionBypass:
         self.fatigue_level = min(self.fatigue_level, self.config.fatigue_max)
 
         # Recuperacion gradual durante pausas largas
-        time_since_pause = time.time() - self.last_pause_time
+        time_since_pause = self._now() - self.last_pause_time
         if time_since_pause > 5:  # Si paso mas de 5 segundos
             recovery = self.config.fatigue_recovery * (time_since_pause / 60)
             self.fatigue_level = max(0, self.fatigue_level - recovery)
@@ -183,8 +216,8 @@ class AntiDetectionBypass:
         Determina si deberia ocurrir una micro-pausa.
         Simula distracciones humanas momentaneas.
         """
-        if random.random() < self.config.micropause_chance:
-            duration = random.uniform(
+        if self._uniform() < self.config.micropause_chance:
+            duration = self._uniform_between(
                 self.config.micropause_min,
                 self.config.micropause_max
             )
@@ -196,12 +229,12 @@ class AntiDetectionBypass:
         Determina si deberia ocurrir una pausa larga.
         Simula distracciones mayores (mirar telefono, etc).
         """
-        if random.random() < self.config.longpause_chance:
-            duration = random.uniform(
+        if self._uniform() < self.config.longpause_chance:
+            duration = self._uniform_between(
                 self.config.longpause_min,
                 self.config.longpause_max
             )
-            self.last_pause_time = time.time()
+            self.last_pause_time = self._now()
             # Recuperar algo de fatiga durante pausa larga
             self.fatigue_level *= 0.7
             return True, duration
@@ -224,12 +257,10 @@ class AntiDetectionBypass:
             return True
 
         # Chance de entrar en burst mode
-        if random.random() < self.config.burst_chance:
+        if self._uniform() < self.config.burst_chance:
             self.in_burst_mode = True
-            self.burst_clicks_remaining = random.randint(
-                self.config.burst_min_clicks,
-                self.config.burst_max_clicks
-            )
+            span = self.config.burst_max_clicks - self.config.burst_min_clicks + 1
+            self.burst_clicks_remaining = self.config.burst_min_clicks + int(self._uniform() * span)
             return True
 
         return False
@@ -239,8 +270,8 @@ class AntiDetectionBypass:
         Actualiza el modificador de ritmo.
         Los humanos cambian su velocidad de click con el tiempo.
         """
-        if random.random() < self.config.rhythm_change_chance:
-            change = random.uniform(
+        if self._uniform() < self.config.rhythm_change_chance:
+            change = self._uniform_between(
                 -self.config.rhythm_variation,
                 self.config.rhythm_variation
             )
@@ -289,18 +320,52 @@ class AntiDetectionBypass:
 
         # 8. Cooldown post-burst
         if not self.in_burst_mode and self.burst_clicks_remaining == 0 and in_burst:
-            interval += random.uniform(
+            interval += self._uniform_between(
                 self.config.burst_cooldown * 0.8,
                 self.config.burst_cooldown * 1.2
             )
 
         # Guardar para estadisticas
-        self.timing_history.append(interval)
-        if len(self.timing_history) > 100:
-            self.timing_history.pop(0)
+        self.timing_history.push(interval)
 
         return max(0.01, interval)
 
+    def generate_batch(self, base_interval: float, count: int,
+                       base_hold: Optional[float] = None) -> Tuple[array, Optional[array]]:
+        """
+        Genera por adelantado los delays (y holds) de `count` clicks.
+
+        Ejecuta la misma maquina de estados que las llamadas individuales, en
+        el mismo orden (hold, delay y adaptacion por click), pero los numeros
+        aleatorios salen de lotes vectorizados y el reloj es el tiempo
+        proyectado de la sesion. La distribucion resultante es la misma.
+
+        Args:
+            base_interval: Intervalo base en segundos
+            count: Numero de clicks a generar
+            base_hold: Duracion base del hold, o None si no hay hold
+
+        Returns:
+            Tupla (delays, holds); holds es None si base_hold es None
+        """
+        delays = array("d", bytes(8 * count))
+        holds = array("d", bytes(8 * count)) if base_hold is not None else None
+        saved = (self._uniform, self._normal, self._hold_normal, self._now)
+        self._uniform, self._normal = self._draws.uniform, self._draws.normal
+        self._hold_normal = self._hold_draws.normal
+        self._now = lambda: self._projected_time
+        try:
+            for i in range(count):
+                if holds is not None:
+                    holds[i] = self.get_hold_duration(base_hold)
+                delay = self.get_humanized_delay(base_interval)
+                self.adapt_profile()
+                delays[i] = delay
+                self._projected_time += delay
+        finally:
+            self._uniform, self._normal, self._hold_normal, self._now = saved
+        return delays, holds
+
     def get_mouse_jitter(self, target_x: int, target_y: int) -> Tuple[int, int]:
         """
         Aplica jitter natural al objetivo del raton.
@@ -316,12 +381,13 @@ class AntiDetectionBypass:
         if not self.config.mouse_jitter_enabled:
             return target_x, target_y
 
-        if random.random() > self.config.mouse_jitter_chance:
+        movement = self.rng.movement
+        if movement.random() > self.config.mouse_jitter_chance:
             return target_x, target_y
 
         # Jitter gaussiano (mas realista que uniforme)
-        jitter_x = int(random.gauss(0, self.config.mouse_jitter_pixels / 2))
-        jitter_y = int(random.gauss(0, self.config.mouse_jitter_pixels / 2))
+        jitter_x = int(movement.gauss(0, self.config.mouse_jitter_pixels / 2))
+        jitter_y = int(movement.gauss(0, self.config.mouse_jitter_pixels / 2))
 
         return target_x + jitter_x, target_y + jitter_y
 
@@ -332,12 +398,14 @@ class AntiDetectionBypass:
         Returns:
             Dict con steps, delay_base, y curva de movimiento
         """
+        movement = self.rng.movement
+
         # Numero variable de pasos
-        steps = random.randint(8, 25)
+        steps = movement.randint(8, 25)
 
         # Velocidad variable
         base_delay = 0.005
-        speed_mod = 1 + random.uniform(
+        speed_mod = 1 + movement.uniform(
             -self.config.mouse_speed_variation,
             self.config.mouse_speed_variation
         )
@@ -346,7 +414,7 @@ class AntiDetectionBypass:
         # Tipo de curva (lineal, ease-in, ease-out, ease-in-out)
         curve_types = ['linear', 'ease_in', 'ease_out', 'ease_in_out']
         curve_weights = [0.2, 0.25, 0.25, 0.3]
-        curve = random.choices(curve_types, weights=curve_weights)[0]
+        curve = movement.choices(curve_types, weights=curve_weights)[0]
 
         return {
             'steps': steps,
@@ -365,18 +433,7 @@ class AntiDetectionBypass:
         Returns:
             Progreso modificado por la curva
         """
-        if curve_type == 'linear':
-            return t
-        elif curve_type == 'ease_in':
-            return t * t
-        elif curve_type == 'ease_out':
-            return 1 - (1 - t) ** 2
-        elif curve_type == 'ease_in_out':
-            if t < 0.5:
-                return 2 * t * t
-            else:
-                return 1 - ((-2 * t + 2) ** 2) / 2
-        return t
+        return ease(t, curve_type)
 
     def get_hold_duration(self, base_duration: float) -> float:
         """
@@ -388,8 +445,8 @@ class AntiDetectionBypass:
         Returns:
             Duracion humanizada
         """
-        # Variacion gaussiana
-        duration = self.gaussian_variation(base_duration)
+        # Variacion gaussiana (flujo propio de los holds)
+        duration = self.gaussian_variation(base_duration, self._hold_normal)
 
         # Aplicar fatiga (holds mas largos cuando cansado)
         fatigue = self.calculate_fatigue()
@@ -408,10 +465,9 @@ class AntiDetectionBypass:
         if len(self.timing_history) < 10:
             return 0.0
 
-        # Calcular desviacion estandar
-        mean = sum(self.timing_history) / len(self.timing_history)
-        variance = sum((x - mean) ** 2 for x in self.timing_history) / len(self.timing_history)
-        std_dev = math.sqrt(variance)
+        # Desviacion estandar (mantenida incrementalmente por la ventana)
+        mean = self.timing_history.mean
+        std_dev = self.timing_history.std_dev
 
         # Coeficiente de variacion (CV)
         cv = std_dev / mean if mean > 0 else 0
@@ -456,7 +512,7 @@ class AntiDetectionBypass:
             Dict con estadisticas
         """
         session_duration = time.time() - self.session_start_time
-        avg_interval = sum(self.timing_history) / len(self.timing_history) if self.timing_history else 0
+        avg_interval = self.timing_history.mean
 
         return {
             'click_count': self.click_count,
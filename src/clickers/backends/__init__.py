@@ -0,0 +1,56 @@
+import os, sys
+from .base import BackendError, InputBackend
+from .hook import HookBackend
+from .recording import RecordingBackend
+from .tracing import TracingBackend
+from .windows import WindowsBackend
+from .xtest import XTestBackend
+from .registry import CALIBRATION_FILE_NAME, DEFAULT_BACKENDS, NATIVE_METHODS, BackendProbe, BackendRegistry
+
+__all__ = [
+    "BackendError", "InputBackend", "HookBackend", "RecordingBackend", "TracingBackend", "WindowsBackend", "XTestBackend", "create_backend",
+    "CALIBRATION_FILE_NAME", "DEFAULT_BACKENDS", "NATIVE_METHODS", "BackendProbe", "BackendRegistry"
+]
+
+
+def create_backend(name: str = "auto", native_input=None, registry: BackendRegistry = None) -> InputBackend:
+    """
+    Create an input backend by name.
+
+    Args:
+        name: "auto", "hook", "xtest", "windows" or "recording". "auto" uses
+            the fastest calibrated backend of `registry`, or without one,
+            XTest on X11 sessions when python-xlib is installed and the
+            mouse/keyboard libraries everywhere else.
+        native_input: NativeInput for the "windows" backend
+        registry: Calibration results used by "auto" (probed if missing)
+
+    Raises:
+        BackendError: If the backend is not available on this system
+    """
+    if name == "windows":
+        if native_input is None:
+            from src.clickers.native_input import get_native_input
+            native_input = get_native_input()
+        return WindowsBackend(native_input)
+    if name == "xtest":
+        return XTestBackend()
+    if name == "hook":
+        return HookBackend()
+    if name == "recording":
+        return RecordingBackend()
+    if name != "auto":
+        raise BackendError(f"Unknown input backend '{name}'")
+
+    best = registry.best(DEFAULT_BACKENDS) if registry is not None else None
+    if best is not None:
+        try:
+            return create_backend(best)
+        except BackendError:
+            pass
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        try:
+            return XTestBackend()
+        except BackendError:
+            pass
+    return HookBackend()
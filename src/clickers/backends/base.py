@@ -0,0 +1,135 @@
+"""
+Input Backend - Common interface of every input injection method.
+
+The click engine, the game simulator and the natural mouse movement only
+talk to an InputBackend, never to a platform API, so the same jobs run on
+Windows, on X11 and headless (recording backend, for tests and benchmarks).
+
+Events use the same tuple format as NativeInput.send_events:
+    ("down", button) / ("up", button) - mouse buttons
+    ("key_down", key) / ("key_up", key) - keyboard keys
+    ("move", x, y) - absolute move in screen pixels
+    ("move_rel", dx, dy) - relative move
+
+Backends may buffer events until `flush()`. The compiled functions returned
+by `compile_*` always flush, once per call.
+"""
+
+from typing import Callable, Sequence, Tuple
+
+# Harmless event used to time a backend (see compile_probe).
+PROBE_EVENT = ("move_rel", 0, 0)
+
+
+class BackendError(RuntimeError):
+    """Raised when a backend is not available or cannot inject an event."""
+
+
+class InputBackend:
+    """Base class and interface of the input backends."""
+
+    name = "base"
+    # Bumped when the injection path changes; invalidates cached calibrations.
+    version = 1
+
+    def supports_batching(self) -> bool:
+        """Whether several events can be submitted with one system call."""
+        return False
+
+    # Primitives (may be buffered until flush).
+
+    def mouse_down(self, button: str = "left"):
+        """Press a mouse button down."""
+        raise NotImplementedError
+
+    def mouse_up(self, button: str = "left"):
+        """Release a mouse button."""
+        raise NotImplementedError
+
+    def key_down(self, key: str):
+        """Press a key down."""
+        raise NotImplementedError
+
+    def key_up(self, key: str):
+        """Release a key."""
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int):
+        """Move the cursor to screen coordinates."""
+        raise NotImplementedError
+
+    def move_rel(self, dx: int, dy: int):
+        """Move the cursor relative to its position."""
+        x, y = self.get_position()
+        self.move_to(x + dx, y + dy)
+
+    def get_position(self) -> Tuple[int, int]:
+        """Current cursor position."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Send any buffered events."""
+
+    def send_batch(self, events: Sequence[Tuple]) -> int:
+        """
+        Send a sequence of events and flush once.
+
+        Returns:
+            Number of events sent
+        """
+        for event in events:
+            self._dispatch(event)
+        self.flush()
+        return len(events)
+
+    def _dispatch(self, event: Tuple):
+        kind = event[0]
+        if kind == "down":
+            self.mouse_down(event[1])
+        elif kind == "up":
+            self.mouse_up(event[1])
+        elif kind == "key_down":
+            self.key_down(event[1])
+        elif kind == "key_up":
+            self.key_up(event[1])
+        elif kind == "move":
+            self.move_to(event[1], event[2])
+        elif kind == "move_rel":
+            self.move_rel(event[1], event[2])
+
+    # Compiled actions, resolved once per job.
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        """Press and release functions of a mouse button."""
+        down, up, flush = self.mouse_down, self.mouse_up, self.flush
+        def press():
+            down(button)
+            flush()
+        def release():
+            up(button)
+            flush()
+        return press, release
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        """Press and release functions of a key."""
+        down, up, flush = self.key_down, self.key_up, self.flush
+        def press():
+            down(key)
+            flush()
+        def release():
+            up(key)
+            flush()
+        return press, release
+
+    def compile_events(self, events: Sequence[Tuple]) -> Callable[[], None]:
+        """Function sending a fixed sequence of events (one flush per call)."""
+        events = tuple(events)
+        send_batch = self.send_batch
+        return lambda: send_batch(events)
+
+    def compile_probe(self) -> Callable[[], None]:
+        """Function sending one event that changes nothing (a zero relative move), to time the backend."""
+        return self.compile_events([PROBE_EVENT])
+
+    def close(self):
+        """Release the resources of the backend."""
@@ -0,0 +1,51 @@
+"""
+Hook Backend - Injection through the `mouse` and `keyboard` libraries.
+
+This is the default (non-native) input of the app. The libraries send each
+event immediately, so `flush()` has nothing to do.
+"""
+
+from functools import partial
+from typing import Callable, Tuple
+from src.clickers.backends.base import BackendError, InputBackend
+
+
+class HookBackend(InputBackend):
+    """Input backend over the `mouse` and `keyboard` libraries."""
+
+    name = "hook"
+
+    def __init__(self):
+        try:
+            import mouse, keyboard
+        except ImportError as e:
+            raise BackendError(f"mouse/keyboard libraries not available: {e}")
+        self.mouse = mouse
+        self.keyboard = keyboard
+
+    def mouse_down(self, button: str = "left"):
+        self.mouse.press(button)
+
+    def mouse_up(self, button: str = "left"):
+        self.mouse.release(button)
+
+    def key_down(self, key: str):
+        self.keyboard.press(key)
+
+    def key_up(self, key: str):
+        self.keyboard.release(key)
+
+    def move_to(self, x: int, y: int):
+        self.mouse.move(x, y)
+
+    def move_rel(self, dx: int, dy: int):
+        self.mouse.move(dx, dy, absolute=False)
+
+    def get_position(self) -> Tuple[int, int]:
+        return self.mouse.get_position()
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        return partial(self.mouse.press, button), partial(self.mouse.release, button)
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        return partial(self.keyboard.press, key), partial(self.keyboard.release, key)
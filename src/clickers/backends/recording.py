@@ -0,0 +1,78 @@
+"""
+Recording Backend - In-memory input sink for tests and benchmarks.
+
+Nothing is injected: every event is appended, with its timestamp, to a
+list that can be inspected afterwards. Flushes are counted so batching
+behaviour can be checked too.
+"""
+
+import time
+from typing import Callable, List, Set, Tuple
+from src.clickers.backends.base import InputBackend
+
+
+class RecordingBackend(InputBackend):
+    """
+    Input backend that records events instead of sending them.
+
+    Args:
+        clock: Clock used to timestamp the events
+        position: Initial cursor position
+    """
+
+    name = "recording"
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, position: Tuple[int, int] = (0, 0)):
+        self.clock = clock
+        self.events: List[Tuple] = []    # (timestamp, kind, *args)
+        self.flushes = 0
+        self.position = position
+        self.pressed: Set[str] = set()   # Buttons and keys currently down
+
+    def supports_batching(self) -> bool:
+        return True
+
+    def _record(self, kind: str, *args):
+        self.events.append((self.clock(), kind) + args)
+
+    def mouse_down(self, button: str = "left"):
+        self.pressed.add(button)
+        self._record("down", button)
+
+    def mouse_up(self, button: str = "left"):
+        self.pressed.discard(button)
+        self._record("up", button)
+
+    def key_down(self, key: str):
+        self.pressed.add(key)
+        self._record("key_down", key)
+
+    def key_up(self, key: str):
+        self.pressed.discard(key)
+        self._record("key_up", key)
+
+    def move_to(self, x: int, y: int):
+        self.position = (int(x), int(y))
+        self._record("move", self.position[0], self.position[1])
+
+    def move_rel(self, dx: int, dy: int):
+        self.move_to(self.position[0] + dx, self.position[1] + dy)
+
+    def get_position(self) -> Tuple[int, int]:
+        return self.position
+
+    def flush(self):
+        self.flushes += 1
+
+    def clear(self):
+        """Forget the recorded events and flush count."""
+        self.events = []
+        self.flushes = 0
+
+    def count(self, kind: str) -> int:
+        """Number of recorded events of one kind (e.g. "down")."""
+        return sum(1 for event in self.events if event[1] == kind)
+
+    def timestamps(self, kind: str) -> List[float]:
+        """Timestamps of the recorded events of one kind."""
+        return [event[0] for event in self.events if event[1] == kind]
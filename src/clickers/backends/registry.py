@@ -0,0 +1,214 @@
+"""
+Backend Registry - Probe, calibrate and pick the fastest input backend.
+
+Each candidate backend is probed once: it is created, then timed with a
+short micro-benchmark of events that change nothing (zero relative moves,
+see InputBackend.compile_probe):
+1. Per-event latency - median time of one event sent and flushed
+2. Throughput - events per second, in batches when the backend batches
+
+A backend that cannot be created or fails to inject is recorded as not
+working. The results are cached as JSON in the config directory, keyed by
+the OS build and the version of every backend, so later launches read the
+cache instead of probing. Backends are only probed when they are first
+asked for (`best()`), and `calibrate()` probes them all again on request.
+
+Default backends: "xtest" (X11) and "hook". Native methods (Windows):
+"interception", "sendinput" and "mouse_event".
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Sequence
+from src.clickers.backends.base import PROBE_EVENT, BackendError, InputBackend
+from src.clickers.backends.hook import HookBackend
+from src.clickers.backends.windows import WindowsBackend
+from src.clickers.backends.xtest import XTestBackend
+
+CALIBRATION_FILE_NAME = "backend_calibration.json"
+
+# Events timed one by one, and events per batch in the throughput run.
+PROBE_EVENTS = 200
+PROBE_BATCH = 20
+
+DEFAULT_BACKENDS = ("xtest", "hook")
+NATIVE_METHODS = ("interception", "sendinput", "mouse_event")
+
+# Backend class of every candidate (its version is part of the cache key).
+BACKEND_CLASSES = {
+    "xtest": XTestBackend,
+    "hook": HookBackend,
+    "interception": WindowsBackend,
+    "sendinput": WindowsBackend,
+    "mouse_event": WindowsBackend,
+}
+
+
+def _native_backend(method_name: str) -> InputBackend:
+    from src.clickers.native_input import InputMethod, get_native_input
+    native_input = get_native_input().for_method(InputMethod(method_name))
+    # Without the driver, the Interception method silently uses SendInput.
+    if method_name == "interception" and not (native_input.interception_available and native_input.interception_device):
+        raise BackendError("Interception driver not installed")
+    return WindowsBackend(native_input)
+
+
+def _candidates() -> Dict[str, Callable[[], InputBackend]]:
+    """Backends that can exist on this system, with their factories."""
+    factories = {}
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        factories["xtest"] = XTestBackend
+    factories["hook"] = HookBackend
+    if sys.platform == "win32":
+        for method_name in NATIVE_METHODS:
+            factories[method_name] = lambda method_name=method_name: _native_backend(method_name)
+    return factories
+
+
+def environment_key() -> dict:
+    """What a calibration is only valid for: the OS build and the backend versions."""
+    return {
+        "os": platform.platform(),
+        "machine": platform.machine(),
+        "backends": {name: f"{cls.__name__}/{cls.version}" for name, cls in BACKEND_CLASSES.items()},
+    }
+
+
+@dataclass
+class BackendProbe:
+    """Calibration result of one backend."""
+    name: str
+    working: bool = False
+    error: str = ""
+    latency: float = 0.0        # Seconds per event (median), sent and flushed
+    throughput: float = 0.0     # Events per second
+    batching: bool = False
+    probed_at: float = 0.0      # Unix time of the probe
+
+
+def measure(backend: InputBackend, events: int = PROBE_EVENTS, batch: int = PROBE_BATCH,
+            clock: Callable[[], float] = time.perf_counter) -> BackendProbe:
+    """
+    Time a backend with harmless events.
+
+    Raises:
+        Exception: Whatever the backend raises when it cannot inject
+    """
+    import statistics  # Only needed when calibrating, not at every startup.
+    probe = backend.compile_probe()
+    probe()  # Warm-up (first calls may load or connect lazily).
+    times = []
+    for _ in range(events):
+        started = clock()
+        probe()
+        times.append(clock() - started)
+    result = BackendProbe(backend.name, working=True, latency=statistics.median(times), batching=backend.supports_batching())
+    if result.batching:
+        send = backend.compile_events([PROBE_EVENT] * batch)
+        calls = max(1, events // batch)
+        started = clock()
+        for _ in range(calls):
+            send()
+        result.throughput = calls * batch / max(clock() - started, 1e-9)
+    else:
+        result.throughput = events / max(sum(times), 1e-9)
+    return result
+
+
+class BackendRegistry:
+    """
+    Calibration results of the input backends, cached on disk.
+
+    Args:
+        cache_path: JSON cache file (None = never cached)
+        factories: Backend factories by name (default: this system's candidates)
+    """
+
+    def __init__(self, cache_path: Optional[str], factories: Optional[Dict[str, Callable[[], InputBackend]]] = None):
+        self.cache_path = cache_path
+        self.factories = factories if factories is not None else _candidates()
+        self.results: Dict[str, BackendProbe] = {}
+        self._loaded = False
+
+    def load(self) -> bool:
+        """Read the cached results; False if there is no cache for this system."""
+        self._loaded = True
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            if data.get("key") != environment_key():
+                return False
+            self.results = {name: BackendProbe(**values) for name, values in data.get("results", {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Ignoring the backend calibration cache: {e}")
+            self.results = {}
+            return False
+        return True
+
+    def save(self):
+        if not self.cache_path:
+            return
+        from src.memory.store import write_atomic
+        data = {"key": environment_key(), "results": {name: asdict(result) for name, result in self.results.items()}}
+        try:
+            write_atomic(self.cache_path, json.dumps(data, indent=2).encode("utf-8"))
+        except OSError as e:
+            print(f"Error saving the backend calibration: {e}")
+
+    def clear(self):
+        """Forget every result (the cache is ignored until the next save)."""
+        self.results = {}
+        self._loaded = True
+
+    def probe(self, name: str) -> BackendProbe:
+        """Create and time one backend (not cached; see calibrate)."""
+        factory = self.factories.get(name)
+        if factory is None:
+            return BackendProbe(name, error="Not available on this system", probed_at=time.time())
+        backend = None
+        try:
+            backend = factory()
+            result = measure(backend)
+        except Exception as e:
+            result = BackendProbe(name, error=str(e) or type(e).__name__)
+        finally:
+            if backend is not None:
+                backend.close()
+        result.name = name
+        result.probed_at = time.time()
+        return result
+
+    def calibrate(self, names: Optional[Sequence[str]] = None) -> Dict[str, BackendProbe]:
+        """Probe backends again (default: every candidate) and save the results."""
+        if not self._loaded:
+            self.load()
+        for name in names if names is not None else list(self.factories):
+            self.results[name] = self.probe(name)
+        self.save()
+        return self.results
+
+    def best(self, names: Sequence[str]) -> Optional[str]:
+        """
+        Fastest working backend among `names` (lowest per-event latency).
+
+        Only the backends missing from the cache are probed.
+
+        Returns:
+            The backend name, or None if none of them works
+        """
+        if not self._loaded:
+            self.load()
+        names = [name for name in names if name in self.factories]
+        missing = [name for name in names if name not in self.results]
+        if missing:
+            self.calibrate(missing)
+        working = [self.results[name] for name in names if self.results[name].working]
+        if not working:
+            return None
+        return min(working, key=lambda result: result.latency).name
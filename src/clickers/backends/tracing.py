@@ -0,0 +1,120 @@
+"""
+Tracing Backend - Records every event of another backend in a trace file.
+
+Wraps any InputBackend and stores each event it sends (timestamp, engine
+deadline, type, button/key code, coordinates, return code) in a
+TraceRecorder ring. Compiled actions keep the fast path of the wrapped
+backend; the trace costs one record per event after the call returns.
+"""
+
+import time
+from typing import Callable, Sequence, Tuple
+from src.clickers.backends.base import InputBackend
+from src.utils.trace import (
+    EVENT_DOWN, EVENT_KEY_DOWN, EVENT_KEY_UP, EVENT_MOVE, EVENT_MOVE_REL, EVENT_TYPES, EVENT_UP, TraceRecorder
+)
+
+
+class TracingBackend(InputBackend):
+    """
+    Input backend forwarding to another one and tracing what it sends.
+
+    Args:
+        backend: Backend that actually injects the events
+        recorder: Trace ring receiving the records
+        scheduled: Returns the deadline the current event was scheduled for
+            (ClickEngine.deadline in the app; 0 = not scheduled)
+        clock: Clock used to timestamp the events (the engine clock)
+    """
+
+    name = "tracing"
+
+    def __init__(self, backend: InputBackend, recorder: TraceRecorder,
+                 scheduled: Callable[[], float] = lambda: 0.0,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.backend = backend
+        self.recorder = recorder
+        self.scheduled = scheduled
+        self.clock = clock
+
+    def supports_batching(self) -> bool:
+        return self.backend.supports_batching()
+
+    def _call(self, function: Callable, args: Tuple, event_type: int, code: int = 0, x: int = 0, y: int = 0):
+        try:
+            result = function(*args)
+        except Exception:
+            self.recorder.record(self.clock(), self.scheduled(), event_type, code, x, y, -1)
+            raise
+        self.recorder.record(self.clock(), self.scheduled(), event_type, code, x, y, result if type(result) is int else 0)
+        return result
+
+    def _traced(self, function: Callable, events: Sequence[Tuple[int, int, int, int]]) -> Callable:
+        """Compiled function recording `events` (type, code, x, y) after each call."""
+        record, clock, scheduled = self.recorder.record, self.clock, self.scheduled
+        def traced():
+            try:
+                result = function()
+            except Exception:
+                now, deadline = clock(), scheduled()
+                for event_type, code, x, y in events:
+                    record(now, deadline, event_type, code, x, y, -1)
+                raise
+            now, deadline = clock(), scheduled()
+            rc = result if type(result) is int else 0
+            for event_type, code, x, y in events:
+                record(now, deadline, event_type, code, x, y, rc)
+            return result
+        return traced
+
+    def _resolve(self, event: Tuple) -> Tuple[int, int, int, int]:
+        event_type = EVENT_TYPES.get(event[0], 0)
+        if event_type in (EVENT_MOVE, EVENT_MOVE_REL):
+            return event_type, 0, int(event[1]), int(event[2])
+        return event_type, self.recorder.code(str(event[1])), 0, 0
+
+    def mouse_down(self, button: str = "left"):
+        self._call(self.backend.mouse_down, (button,), EVENT_DOWN, self.recorder.code(button))
+
+    def mouse_up(self, button: str = "left"):
+        self._call(self.backend.mouse_up, (button,), EVENT_UP, self.recorder.code(button))
+
+    def key_down(self, key: str):
+        self._call(self.backend.key_down, (key,), EVENT_KEY_DOWN, self.recorder.code(key))
+
+    def key_up(self, key: str):
+        self._call(self.backend.key_up, (key,), EVENT_KEY_UP, self.recorder.code(key))
+
+    def move_to(self, x: int, y: int):
+        self._call(self.backend.move_to, (x, y), EVENT_MOVE, 0, int(x), int(y))
+
+    def move_rel(self, dx: int, dy: int):
+        self._call(self.backend.move_rel, (dx, dy), EVENT_MOVE_REL, 0, int(dx), int(dy))
+
+    def get_position(self) -> Tuple[int, int]:
+        return self.backend.get_position()
+
+    def flush(self):
+        self.backend.flush()
+
+    def send_batch(self, events: Sequence[Tuple]) -> int:
+        resolved = [self._resolve(event) for event in events]
+        return self._traced(lambda: self.backend.send_batch(events), resolved)()
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        press, release = self.backend.compile_button(button)
+        code = self.recorder.code(button)
+        return self._traced(press, ((EVENT_DOWN, code, 0, 0),)), self._traced(release, ((EVENT_UP, code, 0, 0),))
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        press, release = self.backend.compile_key(key)
+        code = self.recorder.code(key)
+        return self._traced(press, ((EVENT_KEY_DOWN, code, 0, 0),)), self._traced(release, ((EVENT_KEY_UP, code, 0, 0),))
+
+    def compile_events(self, events: Sequence[Tuple]) -> Callable[[], None]:
+        events = tuple(events)
+        return self._traced(self.backend.compile_events(events), tuple(self._resolve(event) for event in events))
+
+    def close(self):
+        """Close the wrapped backend (the recorder is owned by the caller)."""
+        self.backend.close()
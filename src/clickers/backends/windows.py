@@ -0,0 +1,68 @@
+"""
+Windows Backend - Native injection (Interception, SendInput, mouse_event).
+
+Thin adapter over NativeInput: compiled actions use its allocation-free
+event templates and batches go through one SendInput call per chunk.
+"""
+
+from typing import Callable, Sequence, Tuple
+from src.clickers.backends.base import InputBackend
+from src.clickers.native_input import NativeInput
+
+
+class WindowsBackend(InputBackend):
+    """
+    Input backend over a NativeInput instance.
+
+    Args:
+        native_input: NativeInput with the selected method
+    """
+
+    name = "windows"
+
+    def __init__(self, native_input: NativeInput):
+        self.native_input = native_input
+
+    def supports_batching(self) -> bool:
+        return self.native_input.supports_batching()
+
+    def mouse_down(self, button: str = "left"):
+        self.native_input.mouse_down(button)
+
+    def mouse_up(self, button: str = "left"):
+        self.native_input.mouse_up(button)
+
+    def key_down(self, key: str):
+        self.native_input.key_down(key)
+
+    def key_up(self, key: str):
+        self.native_input.key_up(key)
+
+    def move_to(self, x: int, y: int):
+        self.native_input.move_to(x, y)
+
+    def move_rel(self, dx: int, dy: int):
+        self.native_input.move_to(dx, dy, absolute=False)
+
+    def get_position(self) -> Tuple[int, int]:
+        return self.native_input.get_cursor_pos()
+
+    def send_batch(self, events: Sequence[Tuple]) -> int:
+        return self.native_input.send_events(events).inserted
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        return self.native_input.compile_button(button)
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        return self.native_input.compile_key(key)
+
+    def compile_events(self, events: Sequence[Tuple]) -> Callable[[], None]:
+        if self.native_input.supports_batching():
+            return self.native_input.compile_events(events)
+        return super().compile_events(events)
+
+    def compile_probe(self) -> Callable[[], None]:
+        return self.native_input.compile_probe()
+
+    def close(self):
+        self.native_input.cleanup()
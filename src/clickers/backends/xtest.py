@@ -0,0 +1,159 @@
+"""
+X11 Backend - Injection with the XTEST extension (python-xlib).
+
+Works on any X server, including Xvfb for headless testing. Requests are
+queued on the display connection and written with a single flush per
+action, so a burst of clicks costs one round of socket writes.
+"""
+
+from threading import Lock
+from typing import Callable, Optional, Sequence, Tuple
+from src.clickers.backends.base import BackendError, InputBackend
+
+# X11 pointer buttons.
+BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+# App key names that differ from the X keysym names.
+KEYSYM_NAMES = {
+    "space": "space",
+    "enter": "Return",
+    "tab": "Tab",
+    "escape": "Escape",
+    "backspace": "BackSpace",
+    "shift": "Shift_L",
+    "ctrl": "Control_L",
+    "alt": "Alt_L",
+    "capslock": "Caps_Lock",
+}
+
+
+class XTestBackend(InputBackend):
+    """
+    Input backend for X11 servers with the XTEST extension.
+
+    Args:
+        display_name: X display to connect to (None = $DISPLAY)
+
+    Raises:
+        BackendError: If python-xlib is missing or the display cannot be used
+    """
+
+    name = "xtest"
+
+    def __init__(self, display_name: Optional[str] = None):
+        try:
+            from Xlib import X, XK, display
+            from Xlib.ext import xtest
+        except ImportError as e:
+            raise BackendError(f"python-xlib not available: {e}")
+        try:
+            self.display = display.Display(display_name)
+        except Exception as e:
+            raise BackendError(f"Cannot open X display: {e}")
+        if not self.display.has_extension("XTEST"):
+            self.display.close()
+            raise BackendError("X server has no XTEST extension")
+
+        self.X = X
+        self.XK = XK
+        self._fake_input = xtest.fake_input
+        self._root = self.display.screen().root
+        # The connection is shared by the engine and GUI threads.
+        self._lock = Lock()
+
+    def supports_batching(self) -> bool:
+        return True
+
+    def _button(self, button: str) -> int:
+        return BUTTONS.get(button, 1)
+
+    def _keycode(self, key: str) -> int:
+        name = key.lower()
+        name = KEYSYM_NAMES.get(name, name.upper() if name[:1] == "f" and name[1:].isdigit() else name)
+        keycode = self.display.keysym_to_keycode(self.XK.string_to_keysym(name))
+        if not keycode:
+            raise BackendError(f"No keycode for key '{key}'")
+        return keycode
+
+    def _request(self, event: Tuple) -> Optional[Tuple[int, int, int, int]]:
+        """(event type, detail, x, y) of an event, resolved once."""
+        X = self.X
+        kind = event[0]
+        if kind == "down":
+            return X.ButtonPress, self._button(event[1]), 0, 0
+        if kind == "up":
+            return X.ButtonRelease, self._button(event[1]), 0, 0
+        if kind == "key_down":
+            return X.KeyPress, self._keycode(event[1]), 0, 0
+        if kind == "key_up":
+            return X.KeyRelease, self._keycode(event[1]), 0, 0
+        if kind == "move":
+            return X.MotionNotify, 0, int(event[1]), int(event[2])
+        if kind == "move_rel":
+            return X.MotionNotify, 1, int(event[1]), int(event[2])  # detail 1 = relative
+        return None
+
+    def _queue(self, request: Tuple[int, int, int, int]):
+        event_type, detail, x, y = request
+        self._fake_input(self.display, event_type, detail, x=x, y=y)
+
+    def mouse_down(self, button: str = "left"):
+        with self._lock:
+            self._fake_input(self.display, self.X.ButtonPress, self._button(button))
+
+    def mouse_up(self, button: str = "left"):
+        with self._lock:
+            self._fake_input(self.display, self.X.ButtonRelease, self._button(button))
+
+    def key_down(self, key: str):
+        with self._lock:
+            self._fake_input(self.display, self.X.KeyPress, self._keycode(key))
+
+    def key_up(self, key: str):
+        with self._lock:
+            self._fake_input(self.display, self.X.KeyRelease, self._keycode(key))
+
+    def move_to(self, x: int, y: int):
+        with self._lock:
+            self._fake_input(self.display, self.X.MotionNotify, x=int(x), y=int(y))
+
+    def move_rel(self, dx: int, dy: int):
+        with self._lock:
+            self._fake_input(self.display, self.X.MotionNotify, 1, x=int(dx), y=int(dy))
+
+    def get_position(self) -> Tuple[int, int]:
+        with self._lock:
+            pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def flush(self):
+        with self._lock:
+            self.display.flush()
+
+    def send_batch(self, events: Sequence[Tuple]) -> int:
+        requests = [request for request in map(self._request, events) if request is not None]
+        with self._lock:
+            for request in requests:
+                self._queue(request)
+            self.display.flush()
+        return len(requests)
+
+    def compile_events(self, events: Sequence[Tuple]) -> Callable[[], None]:
+        requests = tuple(request for request in map(self._request, events) if request is not None)
+        display, fake_input, lock = self.display, self._fake_input, self._lock
+        def send():
+            with lock:
+                for event_type, detail, x, y in requests:
+                    fake_input(display, event_type, detail, x=x, y=y)
+                display.flush()
+        return send
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        return self.compile_events([("down", button)]), self.compile_events([("up", button)])
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        return self.compile_events([("key_down", key)]), self.compile_events([("key_up", key)])
+
+    def close(self):
+        with self._lock:
+            self.display.close()
@@ -0,0 +1,326 @@
+"""
+Click Job - Immutable, validated snapshot of the click settings.
+
+The GUI widgets are read (and validated) once, on the Tk thread, when a job
+is built. The job is then compiled into specialized callables so the click
+engine only has to run `action()` and wait `next_delay()` seconds, without
+touching widgets, parsing strings or re-checking settings on every pass.
+"""
+
+import os
+import random
+from dataclasses import dataclass, fields
+from typing import Callable, Optional, Tuple
+from src.clickers.rng import JobRandom
+from src.clickers.sampler import BatchSampler, PairedSampler, uniform_batch
+from src.clickers.scheduler import OverrunPolicy
+from src.clickers.timing import TimingPrecision
+
+MOUSE_BUTTONS = ("left", "right", "middle")
+
+# Interval limits in seconds.
+MIN_INTERVAL = 0.1
+MIN_HIGH_RATE_INTERVAL = 0.001
+
+
+class ClickJobError(ValueError):
+    """Raised when the click settings are not valid."""
+
+
+def human_delay(base: float, variation: float = 0.02, rng=random) -> float:
+    """Uniform variation around `base`, never negative (drawn from `rng`)."""
+    return max(0, base + rng.uniform(-variation, variation))
+
+
+@dataclass(frozen=True)
+class ClickJob:
+    """Validated click settings for one run."""
+    click_key: str = "left"
+    interval: float = 0.1                  # Seconds between actions
+    hold_mode: bool = False
+    hold_duration: float = 0.1             # Seconds, 0 = hold until stopped
+    use_current_pos: bool = True
+    click_pos: Tuple[int, int] = (0, 0)
+    use_native_input: bool = False
+    input_method: str = "auto"
+    bypass_enabled: bool = False
+    bypass_profile: str = "moderate"
+    high_rate: bool = False
+    clicks_per_tick: int = 1               # Clicks sent together per tick (turbo)
+    press_duration: float = 0.02           # Seconds between down and up of a click, 0 = together
+    timing_precision: TimingPrecision = TimingPrecision.BALANCED
+    overrun_policy: OverrunPolicy = OverrunPolicy.SKIP
+    seed: Optional[int] = None             # Seed of the job's random streams, None = new every run
+    target_image: str = ""                 # Reference image located on screen instead of click_pos
+
+    @property
+    def is_mouse_button(self) -> bool:
+        """Whether the job clicks a mouse button rather than a key."""
+        return self.click_key in MOUSE_BUTTONS
+
+    @property
+    def holds_forever(self) -> bool:
+        """Whether the job presses once and holds until stopped."""
+        return self.hold_mode and self.hold_duration == 0
+
+    @property
+    def timed_press(self) -> bool:
+        """Whether single clicks are split into a press and a scheduled release."""
+        return not self.hold_mode and self.press_duration > 0 and self.clicks_per_tick == 1
+
+    @classmethod
+    def from_settings(cls, hours="0", minutes="0", seconds="0", milliseconds="0",
+                      hold_duration="0.1", press_ms="20", **settings) -> "ClickJob":
+        """
+        Parse and validate raw settings (as typed in the GUI).
+
+        Args:
+            hours, minutes, seconds, milliseconds: Interval parts (str or int)
+            hold_duration: Hold duration in seconds (str or float)
+            press_ms: Press duration of single clicks in milliseconds (str or float)
+            **settings: Remaining ClickJob fields
+
+        Returns:
+            A validated ClickJob
+
+        Raises:
+            ClickJobError: If any value is missing or out of range
+        """
+        try:
+            interval = int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(milliseconds) / 1000
+        except (TypeError, ValueError):
+            raise ClickJobError("Invalid time values")
+
+        high_rate = settings.get("high_rate", False)
+        if high_rate:
+            if interval < MIN_HIGH_RATE_INTERVAL:
+                raise ClickJobError("Total interval must be at least 1 millisecond")
+        elif interval < MIN_INTERVAL:
+            raise ClickJobError("Total interval must be at least 0.1 seconds (enable high-rate mode for faster intervals)")
+
+        try:
+            hold = float(hold_duration)
+        except (TypeError, ValueError):
+            raise ClickJobError("Invalid hold duration")
+        if hold < 0:
+            raise ClickJobError("Hold duration cannot be negative")
+
+        try:
+            press = float(press_ms) / 1000
+        except (TypeError, ValueError):
+            raise ClickJobError("Invalid press duration")
+        if not 0 <= press <= 1:
+            raise ClickJobError("Press duration must be between 0 and 1000 milliseconds")
+
+        click_key = settings.get("click_key") or ""
+        if not click_key:
+            raise ClickJobError("No click key or button selected")
+
+        try:
+            settings["clicks_per_tick"] = int(settings.get("clicks_per_tick", 1))
+        except (TypeError, ValueError):
+            raise ClickJobError("Invalid clicks per tick")
+        if not 1 <= settings["clicks_per_tick"] <= 100:
+            raise ClickJobError("Clicks per tick must be between 1 and 100")
+
+        seed = settings.get("seed")
+        if seed is not None and seed != "":
+            try:
+                settings["seed"] = int(seed)
+            except (TypeError, ValueError):
+                raise ClickJobError("Random seed must be an integer")
+        else:
+            settings["seed"] = None
+
+        target_image = settings.get("target_image") or ""
+        if target_image and not settings.get("use_current_pos", True) and not os.path.isfile(target_image):
+            raise ClickJobError(f"Target image not found: {target_image}")
+        settings["target_image"] = target_image
+
+        x, y = settings.pop("click_pos", (0, 0))
+        return cls(interval=interval, hold_duration=hold, press_duration=press, click_pos=(int(x), int(y)), **settings)
+
+    def to_dict(self) -> dict:
+        """Serialize the job to JSON-compatible values."""
+        data = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, (TimingPrecision, OverrunPolicy)):
+                value = value.value
+            elif isinstance(value, tuple):
+                value = list(value)
+            data[field.name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClickJob":
+        """Rebuild a job saved with `to_dict`, ignoring unknown keys."""
+        known = {field.name for field in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        try:
+            if "timing_precision" in values:
+                values["timing_precision"] = TimingPrecision(values["timing_precision"])
+            if "overrun_policy" in values:
+                values["overrun_policy"] = OverrunPolicy(values["overrun_policy"])
+            if "click_pos" in values:
+                values["click_pos"] = tuple(int(v) for v in values["click_pos"])
+            if values.get("seed") is not None:
+                values["seed"] = int(values["seed"])
+        except (TypeError, ValueError) as e:
+            raise ClickJobError(f"Invalid saved job: {e}")
+        return cls(**values)
+
+
+def _repeat_tap(press: Callable, release: Callable, count: int) -> Callable[[], None]:
+    """Tap function sending `count` press/release pairs back to back."""
+    if count == 1:
+        def tap():
+            press()
+            release()
+    else:
+        def tap():
+            for _ in range(count):
+                press()
+                release()
+    return tap
+
+
+def _resolve_primitives(job: ClickJob, backend) -> Tuple[Callable, Callable, Callable]:
+    """Pick the press, release and tap functions for the job once."""
+    key = job.click_key
+    count = job.clicks_per_tick
+    # Compiled by the backend: nothing is looked up or allocated per click.
+    if job.is_mouse_button:
+        press, release = backend.compile_button(key)
+        pair = [("down", key), ("up", key)]
+    else:
+        press, release = backend.compile_key(key)
+        pair = [("key_down", key), ("key_up", key)]
+    if job.high_rate and backend.supports_batching():
+        # High-throughput modes submit every event of a tick in one call.
+        tap = backend.compile_events(pair * count)
+    else:
+        tap = _repeat_tap(press, release, count)
+    return press, release, tap
+
+
+def _press_sampler(press_duration: float, rng: JobRandom) -> BatchSampler:
+    # Presses vary by +-50% (10-30 ms by default, like NativeInput.click).
+    return BatchSampler(uniform_batch(press_duration, press_duration / 2, rng.hold))
+
+
+def compile_timing(job: ClickJob, bypass_system, rng: Optional[JobRandom] = None) -> Tuple[Callable[[], float], Optional[Callable[[], float]], Optional[Callable[[], None]]]:
+    """
+    Build the functions returning the next delay and hold duration.
+
+    Randomized values are precomputed in batches; the returned prefetch
+    function tops the buffers up and is meant to run in the slack time
+    after an action. Delays and holds are drawn from the interval and hold
+    streams of `rng` (a new JobRandom seeded with `job.seed` by default).
+
+    Returns:
+        Tuple (next_delay, next_hold, prefetch); next_hold is None for
+        jobs without hold or timed press, prefetch is None when nothing
+        is precomputed
+    """
+    interval = job.interval
+    two_phase = job.hold_mode or job.timed_press
+    # Single clicks hold for their press duration.
+    hold = job.hold_duration if job.hold_mode else job.press_duration
+    rng = rng or JobRandom(job.seed)
+    if job.bypass_enabled:
+        # Delays and holds share the humanization state, so they are generated together.
+        bypass_system.set_random(rng)
+        sampler = PairedSampler(lambda n: bypass_system.generate_batch(interval, n, hold if job.hold_mode else None))
+        if not job.timed_press:
+            return sampler.next_delay, sampler.next_hold if two_phase else None, sampler.prefetch
+        # A click's press is not a humanized hold: it must not add fatigue or follow the hold
+        # profile, so it is jittered like without bypass and the delays keep their distribution.
+        presses = _press_sampler(hold, rng)
+        def prefetch():
+            sampler.prefetch()
+            presses.prefetch()
+        return sampler.next_delay, presses.next, prefetch
+    if job.high_rate:
+        # Exact interval and hold for tight jitter; the +-30/+-20 ms variation
+        # would swamp millisecond intervals and sub-millisecond holds.
+        return (lambda: interval), (lambda: hold) if two_phase else None, None
+
+    delays = BatchSampler(uniform_batch(interval, 0.03, rng.interval))
+    if not two_phase:
+        return delays.next, None, delays.prefetch
+    holds = BatchSampler(uniform_batch(hold, 0.02, rng.hold)) if job.hold_mode else _press_sampler(hold, rng)
+    def prefetch():
+        delays.prefetch()
+        holds.prefetch()
+    return delays.next, holds.next, prefetch
+
+
+@dataclass(frozen=True)
+class JobProgram:
+    """
+    Compiled, ready-to-run form of a ClickJob.
+
+    `action` runs at every tick. For hold and timed-press jobs it only
+    presses, and the engine schedules `release` `next_hold()` seconds later
+    instead of sleeping, so other jobs keep running while the button is down.
+    An `action` returning False pressed nothing, so no release is scheduled.
+    Jobs without `next_delay` press once when started and release when stopped.
+    A `next_delay` returning None ends the job (e.g. at the end of a macro).
+    """
+    job: ClickJob
+    action: Callable[[], None]
+    next_delay: Optional[Callable[[], Optional[float]]] = None
+    release: Optional[Callable[[], None]] = None
+    next_hold: Optional[Callable[[], float]] = None
+    prefetch: Optional[Callable[[], None]] = None  # Refills precomputed values
+    cleanup: Optional[Callable[[], None]] = None   # Releases anything else held when stopped or paused
+
+
+def compile_program(job: ClickJob, backend, bypass_system,
+                    move_to: Optional[Callable[[int, int], None]] = None,
+                    rng: Optional[JobRandom] = None,
+                    locate: Optional[Callable[[], Optional[Tuple[int, int]]]] = None) -> JobProgram:
+    """
+    Turn a job into the specialized callables run by the click engine.
+
+    Args:
+        job: Validated click job
+        backend: InputBackend that injects the job's events
+        bypass_system: AntiDetectionBypass used when bypass is enabled
+        move_to: Function moving the cursor, used for fixed-position jobs
+        rng: Random streams of the job (default: seeded with `job.seed`);
+            pass the same instance used by `move_to`
+        locate: Function returning the position of the job's target image
+            (None while it is not visible), replacing `job.click_pos`
+
+    Returns:
+        JobProgram for the job
+    """
+    press, release, tap = _resolve_primitives(job, backend)
+
+    if job.holds_forever:
+        return JobProgram(job, press, release=release)
+
+    two_phase = job.hold_mode or job.timed_press
+    act = press if two_phase else tap
+    if not job.use_current_pos and move_to is not None and locate is not None:
+        inner = act
+        def act():
+            # No click while the target is not on screen (False: nothing pressed, nothing to release).
+            position = locate()
+            if position is None:
+                return False
+            move_to(*position)
+            inner()
+    elif not job.use_current_pos and move_to is not None:
+        x, y = job.click_pos
+        inner = act
+        def act():
+            move_to(x, y)
+            inner()
+
+    next_delay, next_hold, prefetch = compile_timing(job, bypass_system, rng)
+    if two_phase:
+        return JobProgram(job, act, next_delay, release, next_hold, prefetch)
+    return JobProgram(job, act, next_delay, prefetch=prefetch)
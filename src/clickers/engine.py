@@ -0,0 +1,319 @@
+"""
+Click Engine - Many click jobs multiplexed on one scheduler thread.
+
+Every running job owns a DeadlineScheduler, and the engine keeps the next
+deadline of each one in a priority queue (heap). A single thread sleeps
+until the earliest deadline, fires that job, asks it for its next delay and
+pushes it back. Jobs do not own threads, so dozens of jobs cost one thread.
+
+Hold releases are scheduled on the same heap instead of sleeping, so a job
+holding a key for seconds never delays the other jobs.
+
+Every action is timed (injection call duration and lateness against its
+deadline) into the job's JobMetrics histograms. The deadline being fired is
+exposed as `ClickEngine.deadline` for the input trace.
+
+All control calls (start, stop, pause, program swaps) may come from any
+thread: they are queued and applied on the engine thread, which is also the
+only thread that injects input.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from enum import Enum
+from threading import Event, Thread
+from typing import Callable, List, Optional
+from src.clickers.click_job import JobProgram
+from src.clickers.scheduler import DeadlineScheduler, ScheduleStats
+from src.clickers.timing import HybridSleeper, get_sleeper
+from src.utils.metrics import JobMetrics
+
+# Heap entry kinds.
+_TICK = 0
+_RELEASE = 1
+
+# Minimum slack (seconds) before the next deadline to refill precomputed values.
+PREFETCH_SLACK = 0.002
+
+
+class JobState(Enum):
+    """Lifecycle states of an engine job."""
+    STOPPED = "stopped"
+    RUNNING = "running"
+    PAUSED = "paused"
+
+
+class EngineJob:
+    """
+    Handle of a job registered on a ClickEngine.
+
+    The handle is safe to use from any thread; its methods only queue
+    commands for the engine thread.
+    """
+
+    def __init__(self, engine: "ClickEngine", name: str, program: JobProgram):
+        self.engine = engine
+        self.name = name
+        self.program = program
+        self.state = JobState.STOPPED
+        self.scheduler = DeadlineScheduler(program.job.overrun_policy, clock=engine.clock)
+        self.errors = 0          # Actions that raised an exception
+        self.last_error = None
+        self.metrics = JobMetrics()
+        # Bumped whenever pending heap entries must be ignored.
+        self._generation = 0
+        self._pressed = False
+        # Bumped by every tick's press; a release only applies to the press it was scheduled for.
+        self._presses = 0
+
+    def start(self):
+        """Start (or restart) the job from a fresh timing grid."""
+        self.engine._command(self._start)
+
+    def stop(self):
+        """Stop the job, releasing anything it holds."""
+        self.engine._command(self._stop)
+
+    def pause(self):
+        """Pause the job, keeping its statistics."""
+        self.engine._command(self._pause)
+
+    def resume(self):
+        """Resume a paused job; the next tick fires immediately."""
+        self.engine._command(self._resume)
+
+    def set_program(self, program: JobProgram):
+        """Swap the compiled program, keeping the job's timing grid."""
+        self.engine._command(lambda: self._set_program(program))
+
+    @property
+    def job(self):
+        """ClickJob of the current program."""
+        return self.program.job
+
+    def get_stats(self) -> ScheduleStats:
+        """Requested versus achieved timing of the job."""
+        return self.scheduler.get_stats()
+
+    # The methods below run on the engine thread only.
+
+    def _release(self):
+        if self._pressed:
+            self._pressed = False
+            self._inject(self.program.release)
+
+    def _release_all(self):
+        """Release the scheduled hold and anything else the program holds."""
+        self._release()
+        if self.program.cleanup is not None:
+            self._inject(self.program.cleanup)
+
+    def _inject(self, function: Callable[[], None]) -> Optional[bool]:
+        """Fire an action outside a tick, timing the injection call."""
+        clock = self.engine.clock
+        started = clock()
+        ok = self._fire_once(function)
+        self.metrics.record_injection(clock() - started, ok is not False)
+        return ok
+
+    def _start(self):
+        self._stop()
+        self.state = JobState.RUNNING
+        self.metrics.reset()
+        now = self.engine.clock()
+        self.scheduler.start(now)
+        if self.program.next_delay is None:
+            # Press once and hold until stopped.
+            self._inject(self.program.action)
+            self._pressed = self.program.release is not None
+        else:
+            self.engine._push(now, self, _TICK)
+
+    def _stop(self):
+        self._generation += 1
+        self._release_all()
+        self.state = JobState.STOPPED
+
+    def _pause(self):
+        if self.state != JobState.RUNNING:
+            return
+        self._generation += 1
+        self._release_all()
+        self.scheduler.pause(self.engine.clock())
+        self.state = JobState.PAUSED
+
+    def _resume(self):
+        if self.state != JobState.PAUSED:
+            return
+        self.state = JobState.RUNNING
+        now = self.scheduler.resume(self.engine.clock())
+        if self.program.next_delay is None:
+            self._inject(self.program.action)
+            self._pressed = self.program.release is not None
+            return
+        self.engine._push(now, self, _TICK)
+
+    def _set_program(self, program: JobProgram):
+        self._release_all()
+        self.program = program
+        self.scheduler.policy = program.job.overrun_policy
+
+    def _fail(self, error: Exception):
+        """Stop the job after its program raised (the other jobs keep running)."""
+        self.errors += 1
+        self.last_error = error
+        self._stop()
+
+    def _fire_once(self, function: Callable[[], None]) -> Optional[bool]:
+        """Run an action: True if it ran, None if it pressed nothing (returned False), False if it raised."""
+        try:
+            return None if function() is False else True
+        except Exception as e:
+            self.errors += 1
+            self.last_error = e
+            return False
+
+
+class ClickEngine:
+    """
+    Heap-based scheduler running any number of click jobs on one thread.
+
+    Args:
+        sleeper: Hybrid sleeper used to reach each deadline precisely
+        clock: Monotonic clock shared by all jobs
+    """
+
+    def __init__(self, sleeper: Optional[HybridSleeper] = None, clock: Callable[[], float] = time.perf_counter):
+        self.sleeper = sleeper or get_sleeper()
+        self.clock = clock
+        self.jobs: List[EngineJob] = []
+        self._heap = []
+        self._sequence = itertools.count()
+        self._commands = deque()
+        self._wake = Event()
+        self._alive = False
+        self._thread: Optional[Thread] = None
+        # Deadline of the heap entry being fired (0 while running commands).
+        self.deadline = 0.0
+
+    def add_job(self, name: str, program: JobProgram) -> EngineJob:
+        """Register a job (stopped) and make sure the engine thread runs."""
+        handle = EngineJob(self, name, program)
+        self.jobs.append(handle)
+        self.start()
+        return handle
+
+    def remove_job(self, handle: EngineJob):
+        """Stop and unregister a job."""
+        handle.stop()
+        if handle in self.jobs:
+            self.jobs.remove(handle)
+
+    def start(self):
+        """Start the engine thread if it is not running yet."""
+        if self._alive:
+            return
+        self._alive = True
+        self._thread = Thread(target=self._run, name="ClickEngine", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout: float = 1.0):
+        """Stop every job, release held inputs and end the engine thread."""
+        for handle in list(self.jobs):
+            handle.stop()
+        self._command(self._halt)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def call_soon(self, function: Callable[[], None]):
+        """Run `function` on the engine thread, after the commands already queued (e.g. program swaps)."""
+        if not self._alive:
+            # No thread, so no job is injecting.
+            function()
+            return
+        self._command(function)
+
+    def _halt(self):
+        self._alive = False
+
+    def _command(self, command: Callable[[], None]):
+        self._commands.append(command)
+        self._wake.set()
+
+    def _push(self, deadline: float, handle: EngineJob, kind: int, press: int = 0):
+        heapq.heappush(self._heap, (deadline, next(self._sequence), handle._generation, kind, handle, press))
+
+    def _run_commands(self):
+        commands = self._commands
+        self.deadline = 0.0
+        while commands:
+            commands.popleft()()
+
+    def _run(self):
+        heap = self._heap
+        wake = self._wake
+        clock = self.clock
+        while self._alive:
+            wake.clear()
+            self._run_commands()
+            if not self._alive:
+                break
+            if not heap:
+                wake.wait()
+                continue
+
+            deadline, _, generation, kind, handle, press = heap[0]
+            if generation != handle._generation:
+                heapq.heappop(heap)
+                continue
+            # A new command (e.g. an earlier job) interrupts the wait.
+            if not self.sleeper.sleep_until(deadline, wake=wake):
+                continue
+            heapq.heappop(heap)
+            self.deadline = deadline
+
+            if kind == _RELEASE:
+                # A stale release (its press was already released before pressing again) must not cut the current press short.
+                if press == handle._presses:
+                    handle._release()
+                continue
+
+            program = handle.program
+            # A hold longer than the interval is released before pressing again.
+            handle._release()
+            now = clock()
+            handle.scheduler.record_fire(now)
+            ok = handle._fire_once(program.action)
+            fired = clock()
+            handle.metrics.record_action(now - deadline, fired - now, ok is not False)
+            try:
+                # Every tick takes its hold, even when the press failed, so paired holds and delays stay in step.
+                hold = program.next_hold() if program.release is not None else None
+                delay = program.next_delay()
+            except Exception as e:
+                handle._fail(e)
+                continue
+            if ok and hold is not None:
+                handle._pressed = True
+                handle._presses += 1
+                self._push(fired + hold, handle, _RELEASE, handle._presses)
+            if delay is None:
+                # The program is finished.
+                handle._stop()
+                continue
+            self._push(handle.scheduler.advance(delay), handle, _TICK)
+            # Refill precomputed delays while there is time to spare.
+            if program.prefetch is not None and heap[0][0] - clock() > PREFETCH_SLACK:
+                try:
+                    program.prefetch()
+                except Exception as e:
+                    handle._fail(e)
+
+        # Never leave a button or key pressed behind.
+        self._run_commands()
+        for handle in self.jobs:
+            handle._generation += 1
+            handle._release_all()
@@ -0,0 +1,113 @@
+"""
+Mouse Movement - Human-like cursor moves through an input backend.
+
+Moves are split into small steps with short, varying pauses. With the
+anti-detection system, the step count, pacing and easing curve come from
+the bypass profile and the target gets a little jitter. Every draw comes
+from the job's movement stream, so seeded jobs repeat the same paths.
+
+The whole path is planned at once (see trajectory.py), then either played
+paced, one point and pause at a time, or injected as one batch of move
+events without pauses so fixed-position jobs can run at high rates.
+"""
+
+import time
+from typing import Callable, List, Optional, Tuple
+from src.clickers.rng import RandomStream
+from src.clickers.trajectory import build_path, curve_shape, gaussian_delays, path_events, uniform_delays
+
+# Stream of the moves made outside a job.
+_default_stream = RandomStream()
+
+
+def plan_move(start: Tuple[int, int], x: int, y: int, bypass_system=None, rng: Optional[RandomStream] = None,
+              paced: bool = True) -> Tuple[List[Tuple[int, int]], Optional[list]]:
+    """
+    Points (and pauses) of a natural move from `start` to (x, y).
+
+    Args:
+        start: Current cursor position
+        x, y: Target screen coordinates
+        bypass_system: AntiDetectionBypass for humanized moves (None = simple move)
+        rng: Movement stream (default: the bypass system's, or a shared one)
+        paced: Also draw the pause after each point
+
+    Returns:
+        Tuple (points, delays); delays is None when not paced
+    """
+    if rng is None:
+        rng = bypass_system.rng.movement if bypass_system is not None else _default_stream
+
+    if bypass_system is not None:
+        # Use bypass system for enhanced humanization.
+        params = bypass_system.get_mouse_movement_params()
+        steps = params['steps']
+        # Apply jitter to target position.
+        x, y = bypass_system.get_mouse_jitter(x, y)
+        # Eased path with micro-jitter on some points.
+        points = build_path(start, (x, y), curve_shape(params['curve'], steps), rng)
+        delays = gaussian_delays(steps, params['delay'], bypass_system.config.gaussian_sigma, rng) if paced else None
+    elif tuple(start) == (x, y):
+        # Already there: no steps and no pauses.
+        return [], ([] if paced else None)
+    else:
+        # Original simple movement.
+        steps = rng.randint(5, 15)
+        points = build_path(start, (x, y), curve_shape("linear", steps))
+        delays = uniform_delays(steps, 0.005, 0.003, rng) if paced else None
+    return points, delays
+
+
+def move_naturally(backend, x: int, y: int, bypass_system=None,
+                   sleep: Callable[[float], None] = time.sleep, rng=None):
+    """
+    Move the cursor to (x, y) with natural human-like motion.
+
+    Args:
+        backend: InputBackend used to read and move the cursor
+        x, y: Target screen coordinates
+        bypass_system: AntiDetectionBypass for humanized moves (None = simple move)
+        sleep: Function used to pause between steps
+        rng: Random stream of the move (default: the bypass system's
+            movement stream, or a shared one)
+    """
+    points, delays = plan_move(backend.get_position(), x, y, bypass_system, rng)
+    move_to, flush = backend.move_to, backend.flush
+    for (new_x, new_y), delay in zip(points, delays):
+        move_to(new_x, new_y)
+        flush()
+        sleep(delay)
+
+
+def move_batched(backend, x: int, y: int, bypass_system=None, rng=None, relative: bool = False) -> int:
+    """
+    Send the whole natural path to (x, y) as one batch of move events.
+
+    Args:
+        backend: InputBackend used to read and move the cursor
+        x, y: Target screen coordinates
+        bypass_system: AntiDetectionBypass for humanized moves (None = simple move)
+        rng: Random stream of the move
+        relative: Send relative deltas instead of absolute positions
+
+    Returns:
+        Number of events sent
+    """
+    start = backend.get_position()
+    points, _ = plan_move(start, x, y, bypass_system, rng, paced=False)
+    events = path_events(start, points, relative)
+    return backend.send_batch(events) if events else 0
+
+
+def compile_move(backend, bypass_system=None, rng=None, batched: bool = False,
+                 relative: bool = False) -> Callable[[int, int], None]:
+    """
+    Move function bound to a backend, as used by fixed-position jobs.
+
+    Args:
+        batched: Inject each path in one batch, without pauses (high-rate jobs)
+        relative: With `batched`, send relative deltas
+    """
+    if batched:
+        return lambda x, y: move_batched(backend, x, y, bypass_system, rng, relative)
+    return lambda x, y: move_naturally(backend, x, y, bypass_system, rng=rng)
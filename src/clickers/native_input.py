@@ -15,8 +15,10 @@ El sistema detecta automaticamente cual metodo funciona mejor.
 
 import ctypes
 from ctypes import wintypes
-from typing import Tuple, Optional, Callable
+from dataclasses import dataclass
+from typing import Tuple, Optional, Callable, List, Sequence
 from enum import Enum
+import copy
 import time
 import sys
 
@@ -99,6 +101,148 @@ class INPUT(ctypes.Structure):
     ]
 
 
+class InterceptionMouseStroke(ctypes.Structure):
+    """Interception driver mouse stroke structure."""
+    _fields_ = [
+        ("state", ctypes.c_ushort),
+        ("flags", ctypes.c_ushort),
+        ("rolling", ctypes.c_short),
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("information", ctypes.c_uint),
+    ]
+
+
+# SendInput flags per mouse button.
+MOUSE_DOWN_FLAGS = {
+    "left": MOUSEEVENTF_LEFTDOWN,
+    "right": MOUSEEVENTF_RIGHTDOWN,
+    "middle": MOUSEEVENTF_MIDDLEDOWN,
+}
+MOUSE_UP_FLAGS = {
+    "left": MOUSEEVENTF_LEFTUP,
+    "right": MOUSEEVENTF_RIGHTUP,
+    "middle": MOUSEEVENTF_MIDDLEUP,
+}
+
+# Interception stroke states per (button, down).
+INTERCEPTION_BUTTON_STATES = {
+    ("left", True): 0x001, ("left", False): 0x002,      # LEFT_DOWN / LEFT_UP
+    ("right", True): 0x004, ("right", False): 0x008,    # RIGHT_DOWN / RIGHT_UP
+    ("middle", True): 0x010, ("middle", False): 0x020,  # MIDDLE_DOWN / MIDDLE_UP
+}
+
+# Extra-info value shared by every injected event.
+_EXTRA_INFO = wintypes.ULONG(0)
+_EXTRA_INFO_PTR = ctypes.pointer(_EXTRA_INFO)
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+
+
+class InputInjectionError(OSError):
+    """Raised when SendInput inserted fewer events than requested."""
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batched SendInput submission."""
+    requested: int = 0   # Events handed to SendInput
+    inserted: int = 0    # Events SendInput reported as inserted
+    calls: int = 0       # SendInput calls made
+
+    @property
+    def partial(self) -> bool:
+        """True if some events were blocked (e.g. by UIPI or another hook)."""
+        return self.inserted < self.requested
+
+
+class InputBatch:
+    """
+    Builder for a batch of input events submitted with one SendInput call.
+
+    Events are written into a preallocated `INPUT * capacity` array, so
+    adding an event does not allocate a new structure.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.events = (INPUT * capacity)()
+        self.count = 0
+
+    def clear(self):
+        """Forget all queued events (the array is reused)."""
+        self.count = 0
+
+    def is_full(self) -> bool:
+        """Whether the array has no room left."""
+        return self.count >= self.capacity
+
+    def add_mouse(self, flags: int, dx: int = 0, dy: int = 0, data: int = 0):
+        """Queue a mouse event."""
+        inp = self.events[self.count]
+        inp.type = INPUT_MOUSE
+        mi = inp.union.mi
+        mi.dx = dx
+        mi.dy = dy
+        mi.mouseData = data
+        mi.dwFlags = flags
+        mi.time = 0
+        mi.dwExtraInfo = _EXTRA_INFO_PTR
+        self.count += 1
+
+    def add_key(self, vk: int, scan: int, flags: int):
+        """Queue a keyboard event."""
+        inp = self.events[self.count]
+        inp.type = INPUT_KEYBOARD
+        ki = inp.union.ki
+        ki.wVk = vk
+        ki.wScan = scan
+        ki.dwFlags = flags
+        ki.time = 0
+        ki.dwExtraInfo = _EXTRA_INFO_PTR
+        self.count += 1
+
+
+class EventTemplate:
+    """
+    Ready-to-send events compiled once, sent without any allocation.
+
+    The INPUT array, the pointer to each chunk and the size argument are
+    all built up front, so `send()` is a single SendInput call per chunk.
+
+    Args:
+        send_input: The SendInput function
+        batch: Events to freeze into the template
+        batch_size: Maximum events per SendInput call
+    """
+
+    __slots__ = ("events", "count", "_send_input", "_chunks", "_size")
+
+    def __init__(self, send_input: Callable, batch: InputBatch, batch_size: int):
+        self.count = batch.count
+        self.events = (INPUT * max(1, self.count))()
+        ctypes.memmove(self.events, batch.events, self.count * ctypes.sizeof(INPUT))
+        self._send_input = send_input
+        self._size = ctypes.sizeof(INPUT)
+        base = ctypes.addressof(self.events)
+        self._chunks = tuple(
+            (min(batch_size, self.count - start), ctypes.cast(base + start * self._size, ctypes.POINTER(INPUT)))
+            for start in range(0, self.count, batch_size)
+        )
+
+    def send(self):
+        """
+        Submit the events.
+
+        Raises:
+            InputInjectionError: If SendInput reported a partial insertion
+        """
+        send_input, size = self._send_input, self._size
+        for count, pointer in self._chunks:
+            inserted = send_input(count, pointer, size)
+            if inserted != count:
+                raise InputInjectionError(f"SendInput inserted {inserted} of {count} events")
+
+
 class NativeInput:
     """
     Native input system with multiple injection methods.
@@ -141,11 +285,19 @@ class NativeInput:
         'f9': 0x43, 'f10': 0x44, 'f11': 0x57, 'f12': 0x58,
     }
 
-    def __init__(self, method: InputMethod = InputMethod.AUTO):
+    # Default number of events submitted per SendInput call in batch mode
+    DEFAULT_BATCH_SIZE = 32
+
+    def __init__(self, method: InputMethod = InputMethod.AUTO, batch_size: int = DEFAULT_BATCH_SIZE):
         self.method = method
         self.interception_available = False
         self.interception_context = None
         self.interception_device = None
+        self.batch_size = max(1, batch_size)
+        # Instances of other methods sharing this one's driver context (see for_method).
+        self._owner: Optional["NativeInput"] = None
+        self._views = {}
+        self._init_buffers()
 
         # Load Windows APIs
         self.user32 = ctypes.windll.user32
@@ -190,6 +342,50 @@ class NativeInput:
         else:
             self.active_method = method
 
+    def _init_buffers(self):
+        self._batch = InputBatch(self.batch_size)
+        # Reused by the one-event paths (input is injected from one thread): moves only
+        # write the fields that change, and each button or key transition gets an INPUT
+        # filled once, on first use, then passed to SendInput as is.
+        self._move = InputBatch(1)
+        self._move.add_mouse(MOUSEEVENTF_MOVE)
+        self._move_input = self._move.events[0].union.mi
+        self._move_ref = ctypes.byref(self._move.events[0])
+        self._prefilled = {}
+        self._stroke = InterceptionMouseStroke()
+        self._stroke_ref = ctypes.byref(self._stroke)
+        self.last_batch_result = BatchResult()
+
+    def for_method(self, method: InputMethod) -> "NativeInput":
+        """
+        Get the instance injecting with `method`.
+
+        Instances of other methods are created once and cached; they share
+        this instance's Windows APIs and Interception context instead of
+        loading the driver and opening a new context. Only the instance that
+        opened the context destroys it, in cleanup().
+        """
+        owner = self._owner or self
+        if method == owner.method:
+            return owner
+        view = owner._views.get(method)
+        if view is None:
+            view = copy.copy(owner)
+            view._owner = owner
+            view._views = {}
+            view.method = method
+            view._init_buffers()
+            view.active_method = view._detect_best_method() if method == InputMethod.AUTO else method
+            owner._views[method] = view
+        return view
+
+    def set_batch_size(self, batch_size: int):
+        """Change the events per SendInput call (recompile the events afterwards)."""
+        owner = self._owner or self
+        for instance in [owner, *owner._views.values()]:
+            instance.batch_size = max(1, batch_size)
+            instance._batch = InputBatch(instance.batch_size)
+
     def _init_interception(self) -> bool:
         """
         Initialize Interception driver if available.
@@ -222,11 +418,25 @@ class NativeInput:
         return False
 
     def _detect_best_method(self) -> InputMethod:
-        """Detect the best available input method."""
+        """Detect the best available input method (used until the methods are calibrated)."""
         if self.interception_available:
             return InputMethod.INTERCEPTION
         return InputMethod.SENDINPUT
 
+    def prefer(self, method: InputMethod) -> bool:
+        """
+        Use `method` as the AUTO method, e.g. the fastest one found by calibration.
+
+        Returns:
+            False if this instance is not AUTO or the method is not usable here
+        """
+        if self.method != InputMethod.AUTO or method in (InputMethod.AUTO, InputMethod.DEFAULT):
+            return False
+        if method == InputMethod.INTERCEPTION and not (self.interception_available and self.interception_device):
+            return False
+        self.active_method = method
+        return True
+
     def get_cursor_pos(self) -> Tuple[int, int]:
         """Get current cursor position."""
         point = wintypes.POINT()
@@ -243,24 +453,28 @@ class NativeInput:
         abs_y = int(y * 65535 / self.screen_height)
         return abs_x, abs_y
 
-    def _send_mouse_input(self, flags: int, dx: int = 0, dy: int = 0, data: int = 0):
-        """Send mouse input using SendInput API."""
-        extra = ctypes.pointer(wintypes.ULONG(0))
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.union.mi.dx = dx
-        inp.union.mi.dy = dy
-        inp.union.mi.mouseData = data
-        inp.union.mi.dwFlags = flags
-        inp.union.mi.time = 0
-        inp.union.mi.dwExtraInfo = extra
-
-        self.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+    def _send_mouse_input(self, flags: int, dx: int = 0, dy: int = 0):
+        """Send a mouse move using SendInput API."""
+        mi = self._move_input
+        mi.dx = dx
+        mi.dy = dy
+        mi.dwFlags = flags
+        self.user32.SendInput(1, self._move_ref, _INPUT_SIZE)
+
+    def _prefilled_input(self, event: Tuple):
+        """Reference to the INPUT of a ("down"/"up"/"key_down"/"key_up", name) event, filled on first use."""
+        ref = self._prefilled.get(event)
+        if ref is None:
+            batch = InputBatch(1)
+            self._queue_event(batch, event)
+            # A key without a code queues nothing.
+            ref = ctypes.byref(batch.events[0]) if batch.count else False
+            self._prefilled[event] = ref
+        return ref
 
     def _send_mouse_event_legacy(self, flags: int, dx: int = 0, dy: int = 0, data: int = 0):
         """Send mouse input using legacy mouse_event API."""
-        extra = ctypes.pointer(wintypes.ULONG(0))
-        self.user32.mouse_event(flags, dx, dy, data, extra)
+        self.user32.mouse_event(flags, dx, dy, data, _EXTRA_INFO_PTR)
 
     def _send_interception_click(self, button: str, down: bool):
         """Send mouse click through Interception driver."""
@@ -268,36 +482,12 @@ class NativeInput:
             return False
 
         try:
-            # Interception mouse stroke structure
-            class InterceptionMouseStroke(ctypes.Structure):
-                _fields_ = [
-                    ("state", ctypes.c_ushort),
-                    ("flags", ctypes.c_ushort),
-                    ("rolling", ctypes.c_short),
-                    ("x", ctypes.c_int),
-                    ("y", ctypes.c_int),
-                    ("information", ctypes.c_uint),
-                ]
-
-            stroke = InterceptionMouseStroke()
-            stroke.flags = 0
-            stroke.rolling = 0
-            stroke.x = 0
-            stroke.y = 0
-            stroke.information = 0
-
-            # Set button state
-            if button == "left":
-                stroke.state = 0x001 if down else 0x002  # LEFT_DOWN / LEFT_UP
-            elif button == "right":
-                stroke.state = 0x004 if down else 0x008  # RIGHT_DOWN / RIGHT_UP
-            elif button == "middle":
-                stroke.state = 0x010 if down else 0x020  # MIDDLE_DOWN / MIDDLE_UP
-
+            stroke = self._stroke
+            stroke.state = INTERCEPTION_BUTTON_STATES.get((button, down), 0)
             self.interception_dll.interception_send(
                 self.interception_context,
                 self.interception_device,
-                ctypes.byref(stroke),
+                self._stroke_ref,
                 1
             )
             return True
@@ -310,17 +500,10 @@ class NativeInput:
             if self._send_interception_click(button, True):
                 return
 
-        flags_map = {
-            "left": MOUSEEVENTF_LEFTDOWN,
-            "right": MOUSEEVENTF_RIGHTDOWN,
-            "middle": MOUSEEVENTF_MIDDLEDOWN,
-        }
-        flags = flags_map.get(button, MOUSEEVENTF_LEFTDOWN)
-
         if self.active_method == InputMethod.MOUSE_EVENT:
-            self._send_mouse_event_legacy(flags)
+            self._send_mouse_event_legacy(MOUSE_DOWN_FLAGS.get(button, MOUSEEVENTF_LEFTDOWN))
         else:
-            self._send_mouse_input(flags)
+            self.user32.SendInput(1, self._prefilled_input(("down", button)), _INPUT_SIZE)
 
     def mouse_up(self, button: str = "left"):
         """Release mouse button."""
@@ -328,23 +511,28 @@ class NativeInput:
             if self._send_interception_click(button, False):
                 return
 
-        flags_map = {
-            "left": MOUSEEVENTF_LEFTUP,
-            "right": MOUSEEVENTF_RIGHTUP,
-            "middle": MOUSEEVENTF_MIDDLEUP,
-        }
-        flags = flags_map.get(button, MOUSEEVENTF_LEFTUP)
-
         if self.active_method == InputMethod.MOUSE_EVENT:
-            self._send_mouse_event_legacy(flags)
+            self._send_mouse_event_legacy(MOUSE_UP_FLAGS.get(button, MOUSEEVENTF_LEFTUP))
         else:
-            self._send_mouse_input(flags)
+            self.user32.SendInput(1, self._prefilled_input(("up", button)), _INPUT_SIZE)
+
+    def click(self, button: str = "left", press_duration: Optional[float] = None):
+        """
+        Perform a mouse click (down + up), blocking while the button is down.
+
+        The click engine does not use this: it schedules the up event
+        separately so it never sleeps between down and up.
 
-    def click(self, button: str = "left"):
-        """Perform a mouse click (down + up)."""
+        Args:
+            button: Mouse button
+            press_duration: Seconds between down and up (None = random 10-30 ms)
+        """
         self.mouse_down(button)
         # Small delay between down and up for realism
-        time.sleep(0.01 + (time.time() % 0.02))  # 10-30ms random
+        if press_duration is None:
+            press_duration = 0.01 + (time.time() % 0.02)  # 10-30ms random
+        if press_duration > 0:
+            time.sleep(press_duration)
         self.mouse_up(button)
 
     def move_to(self, x: int, y: int, absolute: bool = True):
@@ -364,64 +552,227 @@ class NativeInput:
             else:
                 self._send_mouse_input(flags, x, y)
 
-    def _send_key_input(self, vk: int, scan: int, down: bool):
-        """Send keyboard input using SendInput with scan codes."""
-        extra = ctypes.pointer(wintypes.ULONG(0))
-        inp = INPUT()
-        inp.type = INPUT_KEYBOARD
-        inp.union.ki.wVk = 0  # Use scan code only for better compatibility
-        inp.union.ki.wScan = scan
-        inp.union.ki.dwFlags = KEYEVENTF_SCANCODE | (0 if down else KEYEVENTF_KEYUP)
-        inp.union.ki.time = 0
-        inp.union.ki.dwExtraInfo = extra
-
-        self.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
-
     def key_down(self, key: str):
-        """Press a key down."""
-        key_lower = key.lower()
-        vk = self.VK_CODES.get(key_lower, 0)
-        scan = self.SCAN_CODES.get(key_lower, 0)
-
-        if scan:
-            self._send_key_input(vk, scan, True)
-        elif vk:
-            # Fallback to VK code if no scan code available
-            extra = ctypes.pointer(wintypes.ULONG(0))
-            inp = INPUT()
-            inp.type = INPUT_KEYBOARD
-            inp.union.ki.wVk = vk
-            inp.union.ki.wScan = 0
-            inp.union.ki.dwFlags = 0
-            inp.union.ki.time = 0
-            inp.union.ki.dwExtraInfo = extra
-            self.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
+        """Press a key down (SendInput, scan code preferred over vk)."""
+        ref = self._prefilled_input(("key_down", key))
+        if ref:
+            self.user32.SendInput(1, ref, _INPUT_SIZE)
 
     def key_up(self, key: str):
         """Release a key."""
-        key_lower = key.lower()
-        vk = self.VK_CODES.get(key_lower, 0)
-        scan = self.SCAN_CODES.get(key_lower, 0)
+        ref = self._prefilled_input(("key_up", key))
+        if ref:
+            self.user32.SendInput(1, ref, _INPUT_SIZE)
 
-        if scan:
-            self._send_key_input(vk, scan, False)
-        elif vk:
-            extra = ctypes.pointer(wintypes.ULONG(0))
-            inp = INPUT()
-            inp.type = INPUT_KEYBOARD
-            inp.union.ki.wVk = vk
-            inp.union.ki.wScan = 0
-            inp.union.ki.dwFlags = KEYEVENTF_KEYUP
-            inp.union.ki.time = 0
-            inp.union.ki.dwExtraInfo = extra
-            self.user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
-
-    def key_press(self, key: str):
-        """Press and release a key."""
+    def key_press(self, key: str, press_duration: Optional[float] = None):
+        """Press and release a key, blocking while it is down (see `click`)."""
         self.key_down(key)
-        time.sleep(0.01 + (time.time() % 0.02))
+        if press_duration is None:
+            press_duration = 0.01 + (time.time() % 0.02)
+        if press_duration > 0:
+            time.sleep(press_duration)
         self.key_up(key)
 
+    def _mouse_flags(self, button: str, down: bool) -> int:
+        """SendInput flags for a button transition."""
+        if down:
+            return MOUSE_DOWN_FLAGS.get(button, MOUSEEVENTF_LEFTDOWN)
+        return MOUSE_UP_FLAGS.get(button, MOUSEEVENTF_LEFTUP)
+
+    def _key_event(self, key: str, down: bool) -> Tuple[int, int, int]:
+        """(vk, scan, flags) for a key transition, scan codes preferred."""
+        key_lower = key.lower()
+        scan = self.SCAN_CODES.get(key_lower, 0)
+        up_flag = 0 if down else KEYEVENTF_KEYUP
+        if scan:
+            return 0, scan, KEYEVENTF_SCANCODE | up_flag
+        return self.VK_CODES.get(key_lower, 0), 0, up_flag
+
+    def supports_batching(self) -> bool:
+        """Whether the active method can submit several events per call."""
+        if self.active_method == InputMethod.INTERCEPTION:
+            # Without the driver context and a device, Interception falls back to SendInput.
+            return not (self.interception_available and self.interception_device)
+        return self.active_method == InputMethod.SENDINPUT
+
+    def submit_batch(self, batch: InputBatch) -> BatchResult:
+        """
+        Submit queued events in as few SendInput calls as possible.
+
+        At most `batch_size` events go into one call. SendInput returns how
+        many events it inserted; a short count means the rest were blocked,
+        which is reported instead of silently ignored.
+
+        Args:
+            batch: Queued events (cleared afterwards)
+
+        Returns:
+            BatchResult with requested/inserted counts
+        """
+        result = BatchResult(requested=batch.count)
+        size = ctypes.sizeof(INPUT)
+        base = ctypes.addressof(batch.events)
+        sent = 0
+        while sent < batch.count:
+            chunk = min(self.batch_size, batch.count - sent)
+            pointer = ctypes.cast(base + sent * size, ctypes.POINTER(INPUT))
+            inserted = self.user32.SendInput(chunk, pointer, size)
+            result.calls += 1
+            result.inserted += inserted
+            sent += chunk
+            if inserted < chunk:
+                # Input is blocked; the remaining events would fail too.
+                break
+        batch.clear()
+        self.last_batch_result = result
+        return result
+
+    def send_events(self, events: Sequence[Tuple]) -> BatchResult:
+        """
+        Send a sequence of events with batched SendInput calls.
+
+        Each event is one of:
+            ("down", button) / ("up", button) - mouse buttons
+            ("key_down", key) / ("key_up", key) - keyboard keys
+            ("move", x, y) - absolute move in screen pixels
+            ("move_rel", dx, dy) - relative move
+
+        Falls back to one call per event when the active method cannot batch.
+        """
+        if not self.supports_batching():
+            return self._send_events_unbatched(events)
+        batch = self._batch
+        total = BatchResult()
+        for event in events:
+            self._queue_event(batch, event)
+            if batch.is_full():
+                self._merge(total, self.submit_batch(batch))
+        if batch.count:
+            self._merge(total, self.submit_batch(batch))
+        self.last_batch_result = total
+        return total
+
+    def _queue_event(self, batch: InputBatch, event: Tuple):
+        kind = event[0]
+        if kind == "down" or kind == "up":
+            batch.add_mouse(self._mouse_flags(event[1], kind == "down"))
+        elif kind == "key_down" or kind == "key_up":
+            vk, scan, flags = self._key_event(event[1], kind == "key_down")
+            if vk or scan:
+                batch.add_key(vk, scan, flags)
+        elif kind == "move":
+            abs_x, abs_y = self._to_absolute(event[1], event[2])
+            batch.add_mouse(MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE, abs_x, abs_y)
+        elif kind == "move_rel":
+            batch.add_mouse(MOUSEEVENTF_MOVE, event[1], event[2])
+
+    def _merge(self, total: BatchResult, result: BatchResult):
+        total.requested += result.requested
+        total.inserted += result.inserted
+        total.calls += result.calls
+
+    def _send_events_unbatched(self, events: Sequence[Tuple]) -> BatchResult:
+        for event in events:
+            kind = event[0]
+            if kind == "down":
+                self.mouse_down(event[1])
+            elif kind == "up":
+                self.mouse_up(event[1])
+            elif kind == "key_down":
+                self.key_down(event[1])
+            elif kind == "key_up":
+                self.key_up(event[1])
+            elif kind == "move":
+                self.move_to(event[1], event[2])
+            elif kind == "move_rel":
+                self.move_to(event[1], event[2], absolute=False)
+        result = BatchResult(requested=len(events), inserted=len(events), calls=len(events))
+        self.last_batch_result = result
+        return result
+
+    def click_burst(self, button: str = "left", count: int = 1) -> BatchResult:
+        """
+        "Turbo" click: `count` down/up pairs submitted in batched SendInput calls.
+
+        Raises:
+            InputInjectionError: If SendInput reported a partial insertion
+        """
+        return self._check(self.send_events([("down", button), ("up", button)] * count))
+
+    def key_burst(self, key: str, count: int = 1) -> BatchResult:
+        """"Turbo" key press: `count` down/up pairs in batched SendInput calls."""
+        return self._check(self.send_events([("key_down", key), ("key_up", key)] * count))
+
+    def _check(self, result: BatchResult) -> BatchResult:
+        if result.partial:
+            raise InputInjectionError(f"SendInput inserted {result.inserted} of {result.requested} events")
+        return result
+
+    # Compiled events: a job's key or button is resolved once, when the job is
+    # compiled, into preallocated structures for the active method. Sending
+    # them does no lookups and allocates nothing; recompile after set_method.
+
+    def compile_events(self, events: Sequence[Tuple]) -> Callable[[], None]:
+        """
+        Compile events (same format as `send_events`) into a SendInput template.
+
+        Returns:
+            Function sending all the events; raises InputInjectionError on
+            a partial insertion
+        """
+        batch = InputBatch(max(1, len(events)))
+        for event in events:
+            self._queue_event(batch, event)
+        return EventTemplate(self.user32.SendInput, batch, self.batch_size).send
+
+    def compile_button(self, button: str = "left") -> Tuple[Callable[[], None], Callable[[], None]]:
+        """Compile the press and release of a mouse button for the active method."""
+        return self._compile_button(button, True), self._compile_button(button, False)
+
+    def compile_key(self, key: str) -> Tuple[Callable[[], None], Callable[[], None]]:
+        """Compile the press and release of a key (always SendInput, like key_down)."""
+        return self.compile_events([("key_down", key)]), self.compile_events([("key_up", key)])
+
+    def _compile_button(self, button: str, down: bool) -> Callable[[], None]:
+        fallback = self.compile_events([("down" if down else "up", button)])
+        if self.active_method == InputMethod.MOUSE_EVENT:
+            mouse_event = self.user32.mouse_event
+            flags = self._mouse_flags(button, down)
+            return lambda: mouse_event(flags, 0, 0, 0, _EXTRA_INFO_PTR)
+        if self.active_method != InputMethod.INTERCEPTION or not self.interception_available or not self.interception_device:
+            return fallback
+
+        # The byref object keeps the stroke alive.
+        stroke_ref = ctypes.byref(InterceptionMouseStroke(state=INTERCEPTION_BUTTON_STATES.get((button, down), 0)))
+        send, context, device = self.interception_dll.interception_send, self.interception_context, self.interception_device
+        def send_stroke():
+            try:
+                send(context, device, stroke_ref, 1)
+            except Exception:
+                fallback()
+        return send_stroke
+
+    def compile_probe(self) -> Callable[[], None]:
+        """
+        Compile an event that changes nothing (no button, zero relative move)
+        for the active method, used to time the injection path.
+
+        Returns:
+            Function sending the event; raises InputInjectionError if the
+            event was not inserted
+        """
+        if self.active_method == InputMethod.INTERCEPTION and self.interception_available and self.interception_device:
+            stroke_ref = ctypes.byref(InterceptionMouseStroke())
+            send, context, device = self.interception_dll.interception_send, self.interception_context, self.interception_device
+            def send_stroke():
+                if send(context, device, stroke_ref, 1) <= 0:
+                    raise InputInjectionError("Interception did not send the stroke")
+            return send_stroke
+        if self.active_method == InputMethod.MOUSE_EVENT:
+            mouse_event = self.user32.mouse_event
+            return lambda: mouse_event(MOUSEEVENTF_MOVE, 0, 0, 0, _EXTRA_INFO_PTR)
+        return self.compile_events([("move_rel", 0, 0)])
+
     def get_method_name(self) -> str:
         """Get the name of the active input method."""
         return self.active_method.value
@@ -438,21 +789,33 @@ class NativeInput:
         return self.interception_available
 
     def cleanup(self):
-        """Cleanup resources."""
+        """Cleanup resources (once; instances from for_method leave them to their owner)."""
+        if self._owner is not None:
+            return
         if self.interception_context and self.interception_available:
             try:
                 self.interception_dll.interception_destroy_context(self.interception_context)
             except Exception:
                 pass
+        for instance in [self, *self._views.values()]:
+            instance.interception_context = None
+            instance.interception_available = False
 
 
 # Singleton instance for easy access
 _native_input: Optional[NativeInput] = None
 
 
-def get_native_input() -> NativeInput:
-    """Get or create the native input singleton."""
+def get_native_input(preferred: Optional[InputMethod] = None) -> NativeInput:
+    """
+    Get or create the native input singleton (created on first call only).
+
+    Args:
+        preferred: Method used for AUTO if usable (see NativeInput.prefer)
+    """
     global _native_input
     if _native_input is None:
         _native_input = NativeInput(InputMethod.AUTO)
+    if preferred is not None:
+        _native_input.prefer(preferred)
     return _native_input
@@ -0,0 +1,87 @@
+"""
+RNG - Seedable random streams, one set per click job.
+
+Every job draws its randomness from its own JobRandom instead of the global
+`random` module, split into independent streams per concern:
+1. interval - delays between actions (and the humanization state machine)
+2. hold - hold and press durations
+3. movement - mouse path steps, pacing and jitter
+
+With a seed (from the settings or `--seed`), a job produces the same
+sequence of delays, holds and moves on every run, so a benchmark or a bug
+can be replayed exactly and changes compared on identical event sequences.
+Sub-stream seeds are derived from the job seed and the stream name, so
+adding draws to one concern never shifts the others.
+
+Batch draws use NumPy when it is installed; a seed reproduces the same
+sequence as long as NumPy availability is the same.
+"""
+
+import hashlib
+import random
+from array import array
+from typing import Optional
+from src.utils.lazy import numpy
+
+
+def derive_seed(seed: Optional[int], name: str) -> Optional[int]:
+    """Independent 64-bit seed of a named sub-stream (None stays None)."""
+    if seed is None:
+        return None
+    digest = hashlib.sha256(f"{seed}/{name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class RandomStream(random.Random):
+    """
+    random.Random with batch draws for the precomputing samplers.
+
+    Args:
+        seed: Integer seed, or None for OS entropy
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        super().__init__(seed)
+        self._generator_seed = seed
+        self._generator = False  # Created on the first batch draw.
+
+    @property
+    def generator(self):
+        """NumPy generator of the batch draws, or None without NumPy."""
+        if self._generator is False:
+            np = numpy()
+            self._generator = np.random.default_rng(self._generator_seed) if np is not None else None
+        return self._generator
+
+    def normal(self) -> float:
+        """One standard normal draw."""
+        return self.gauss(0, 1)
+
+    def uniforms(self, n: int) -> array:
+        """Draw `n` uniform values in [0, 1) in one batch."""
+        if self.generator is not None:
+            return array("d", self.generator.random(n).tobytes())
+        rand = self.random
+        return array("d", [rand() for _ in range(n)])
+
+    def normals(self, n: int) -> array:
+        """Draw `n` standard normal values in one batch."""
+        if self.generator is not None:
+            return array("d", self.generator.standard_normal(n).tobytes())
+        gauss = self.gauss
+        return array("d", [gauss(0, 1) for _ in range(n)])
+
+
+class JobRandom:
+    """
+    The random streams of one job.
+
+    Args:
+        seed: Job seed, or None for a different sequence on every run
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.interval = RandomStream(derive_seed(seed, "interval"))
+        self.hold = RandomStream(derive_seed(seed, "hold"))
+        self.movement = RandomStream(derive_seed(seed, "movement"))
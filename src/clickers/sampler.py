@@ -0,0 +1,297 @@
+"""
+Batch Sampler - Precomputed delays and hold durations.
+
+Drawing random numbers (and running the humanization state machine) right
+before every wait puts avoidable work on the timing-critical path. The
+samplers here generate values in batches into a preallocated ring buffer, so
+the click engine only pops the next value; refills happen in the slack time
+after an action.
+
+Random draws are vectorized with NumPy when it is installed, with a pure
+Python fallback. Each value still comes from the same distribution as the
+per-call code it replaces. Draws come from a job's RandomStream when one is
+given (seeded runs), from a shared unseeded stream otherwise.
+
+RollingWindow keeps the mean and variance of the last N values updated
+incrementally, so reading them costs the same for any window size.
+"""
+
+import math
+from array import array
+from typing import Callable, Optional, Sequence
+from src.clickers.rng import RandomStream
+from src.utils.lazy import numpy
+
+# Default ring buffer sizes.
+DEFAULT_CAPACITY = 1024
+DEFAULT_BATCH = 256
+
+
+# Stream of the callers that do not pass their own.
+_default_stream = RandomStream()
+
+
+def draw_uniforms(n: int, stream: Optional[RandomStream] = None) -> array:
+    """Draw `n` uniform values in [0, 1) in one batch."""
+    return (stream or _default_stream).uniforms(n)
+
+
+def draw_normals(n: int, stream: Optional[RandomStream] = None) -> array:
+    """Draw `n` standard normal values in one batch."""
+    return (stream or _default_stream).normals(n)
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO of floats backed by a preallocated array."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._head = 0   # Next index to read
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def free(self) -> int:
+        """Number of values that can still be pushed."""
+        return self.capacity - self._size
+
+    def clear(self):
+        """Drop all buffered values."""
+        self._head = 0
+        self._size = 0
+
+    def push_many(self, values: Sequence[float]) -> int:
+        """Append as many `values` as fit; returns how many were stored."""
+        count = min(len(values), self.capacity - self._size)
+        tail = (self._head + self._size) % self.capacity
+        first = min(count, self.capacity - tail)
+        self._data[tail:tail + first] = array("d", values[:first])
+        if count > first:
+            self._data[0:count - first] = array("d", values[first:count])
+        self._size += count
+        return count
+
+    def pop(self) -> float:
+        """Remove and return the oldest value (IndexError when empty)."""
+        if not self._size:
+            raise IndexError("pop from empty RingBuffer")
+        value = self._data[self._head]
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        return value
+
+
+class RollingWindow:
+    """
+    Mean and variance of the last `capacity` values, in O(1) per update.
+
+    Values live in a preallocated circular array. The mean and the sum of
+    squared deviations are updated with Welford's method (adding a value
+    while the window fills, replacing the oldest one afterwards) and are
+    recomputed exactly once per full turn of the window, so rounding error
+    cannot build up over long sessions.
+
+    Args:
+        capacity: Number of values kept
+    """
+
+    def __init__(self, capacity: int = 100):
+        if capacity < 1:
+            raise ValueError("RollingWindow capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._next = 0     # Index of the next write (the oldest value when full)
+        self._size = 0
+        self._mean = 0.0
+        self._m2 = 0.0     # Sum of squared deviations from the mean
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Drop all values."""
+        self._next = 0
+        self._size = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest one when the window is full."""
+        index = self._next
+        self._next = index + 1 if index + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._data[index] = value
+            self._size += 1
+            delta = value - self._mean
+            self._mean += delta / self._size
+            self._m2 += delta * (value - self._mean)
+            return
+        old = self._data[index]
+        self._data[index] = value
+        mean = self._mean + (value - old) / self._size
+        self._m2 += (value - old) * (value - mean + old - self._mean)
+        self._mean = mean
+        if self._next == 0:
+            self._recompute()
+
+    def _recompute(self):
+        data = self._data
+        mean = math.fsum(data) / self._size
+        self._mean = mean
+        self._m2 = math.fsum((x - mean) ** 2 for x in data)
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values in the window (0 when empty)."""
+        return self._mean if self._size else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values in the window."""
+        return max(0.0, self._m2 / self._size) if self._size else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Population standard deviation of the values in the window."""
+        return math.sqrt(self.variance)
+
+    def values(self) -> array:
+        """Values in the window, oldest first."""
+        if self._size < self.capacity:
+            return self._data[:self._size]
+        return self._data[self._next:] + self._data[:self._next]
+
+
+class BatchSampler:
+    """
+    Serves values from a ring buffer refilled in batches.
+
+    Args:
+        generate: Function returning a sequence of `n` new values
+        capacity: Ring buffer size
+        batch_size: Values generated per refill
+    """
+
+    def __init__(self, generate: Callable[[int], Sequence[float]],
+                 capacity: int = DEFAULT_CAPACITY, batch_size: int = DEFAULT_BATCH):
+        self.generate = generate
+        self.batch_size = min(batch_size, capacity)
+        self.buffer = RingBuffer(capacity)
+        self.refill()
+
+    def next(self) -> float:
+        """Pop the next value (refills inline only if prefetching fell behind)."""
+        buffer = self.buffer
+        if not buffer._size:
+            self.refill()
+        return buffer.pop()
+
+    def prefetch(self):
+        """Refill once the buffer drops below one batch."""
+        if self.buffer._size < self.batch_size:
+            self.refill()
+
+    def refill(self):
+        """Top the buffer up with whole batches."""
+        while self.buffer.free() >= self.batch_size:
+            self.buffer.push_many(self.generate(self.batch_size))
+
+
+def uniform_batch(base: float, variation: float,
+                  stream: Optional[RandomStream] = None) -> Callable[[int], array]:
+    """Batch version of `max(0, base + uniform(-variation, variation))`."""
+    low, span = base - variation, 2 * variation
+    stream = stream or _default_stream
+    np = numpy()
+    def generate(n: int) -> array:
+        if stream.generator is not None:
+            values = np.maximum(0.0, low + span * stream.generator.random(n))
+            return array("d", values.tobytes())
+        return array("d", [max(0.0, low + span * u) for u in stream.uniforms(n)])
+    return generate
+
+
+class PairedSampler:
+    """
+    Delay and hold samplers filled together by one generator.
+
+    Used for stateful generators (the anti-detection system), where each
+    tick's hold and delay must be produced in the original order.
+
+    Args:
+        generate: Function returning `(delays, holds)` for `n` ticks
+    """
+
+    def __init__(self, generate: Callable[[int], tuple], capacity: int = DEFAULT_CAPACITY,
+                 batch_size: int = DEFAULT_BATCH):
+        self.generate = generate
+        self.batch_size = min(batch_size, capacity)
+        self.delays = RingBuffer(capacity)
+        self.holds = RingBuffer(capacity)
+        self.refill()
+
+    def next_delay(self) -> float:
+        """Pop the delay that follows the current tick."""
+        if not self.delays._size:
+            self.refill()
+        return self.delays.pop()
+
+    def next_hold(self) -> float:
+        """Pop the hold duration of the current tick."""
+        if not self.holds._size:
+            self.refill()
+        return self.holds.pop()
+
+    def prefetch(self):
+        """Refill once the delays drop below one batch."""
+        if self.delays._size < self.batch_size:
+            self.refill()
+
+    def refill(self):
+        """Top both buffers up with whole batches."""
+        while self.delays.free() >= self.batch_size and self.holds.free() >= self.batch_size:
+            delays, holds = self.generate(self.batch_size)
+            self.delays.push_many(delays)
+            if holds is not None:
+                self.holds.push_many(holds)
+
+
+class DrawStream:
+    """
+    Sequential source of uniform and standard normal draws, refilled in bulk.
+
+    Stateful code can consume as many draws per step as it needs while the
+    expensive generation happens in vectorized batches.
+
+    Args:
+        batch_size: Draws generated per refill
+        stream: RandomStream the draws come from (None = shared stream)
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH * 4, stream: Optional[RandomStream] = None):
+        self.batch_size = batch_size
+        self.stream = stream
+        self._uniforms = array("d")
+        self._normals = array("d")
+        self._u = 0
+        self._n = 0
+
+    def uniform(self) -> float:
+        """Next uniform draw in [0, 1)."""
+        if self._u >= len(self._uniforms):
+            self._uniforms = draw_uniforms(self.batch_size, self.stream)
+            self._u = 0
+        value = self._uniforms[self._u]
+        self._u += 1
+        return value
+
+    def normal(self) -> float:
+        """Next standard normal draw."""
+        if self._n >= len(self._normals):
+            self._normals = draw_normals(self.batch_size, self.stream)
+            self._n = 0
+        value = self._normals[self._n]
+        self._n += 1
+        return value
@@ -0,0 +1,186 @@
+"""
+Deadline Scheduler - Drift-free timing for the click loop.
+
+Instead of sleeping a fixed delay after every action (which stretches each
+interval by the time the action itself took), the scheduler keeps a grid of
+absolute deadlines on a monotonic clock. The time spent clicking, holding or
+moving the mouse is therefore subtracted from the wait automatically.
+
+When an action takes longer than the interval, an explicit overrun policy
+decides what happens with the ticks that were missed:
+1. SKIP - Drop the missed ticks and stay aligned with the original grid
+2. CATCH_UP - Fire the missed ticks back-to-back until the grid is reached
+3. REANCHOR - Restart the grid from the moment the overrun was detected
+"""
+
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+from src.clickers.timing import HybridSleeper, get_sleeper
+
+
+class OverrunPolicy(Enum):
+    """What to do with ticks whose deadline already passed."""
+    SKIP = "skip"            # Keep the original grid, drop missed ticks
+    CATCH_UP = "catch_up"    # Fire missed ticks immediately (bounded)
+    REANCHOR = "reanchor"    # Start a new grid from now
+
+
+@dataclass
+class ScheduleStats:
+    """Snapshot of the timing achieved by a scheduler."""
+    ticks: int = 0
+    requested_interval: float = 0.0  # Mean interval that was asked for
+    achieved_interval: float = 0.0   # Mean interval between real fire times
+    overruns: int = 0                # Ticks that fired after their deadline
+    skipped_ticks: int = 0           # Ticks dropped by the SKIP policy
+    elapsed: float = 0.0             # Seconds since the first tick
+
+    @property
+    def requested_rate(self) -> float:
+        """Requested actions per second."""
+        return 1.0 / self.requested_interval if self.requested_interval > 0 else 0.0
+
+    @property
+    def achieved_rate(self) -> float:
+        """Achieved actions per second."""
+        return 1.0 / self.achieved_interval if self.achieved_interval > 0 else 0.0
+
+    @property
+    def drift(self) -> float:
+        """Relative error of the achieved interval (0.01 = 1% slower)."""
+        if self.requested_interval <= 0 or self.achieved_interval <= 0:
+            return 0.0
+        return self.achieved_interval / self.requested_interval - 1.0
+
+
+class DeadlineScheduler:
+    """
+    Absolute-deadline scheduler with a configurable overrun policy.
+
+    The scheduler is passive: callers ask for the next deadline, perform
+    the action once it is reached, and report the delay until the following
+    tick with `advance`. `wait` is provided for simple single-job loops.
+    """
+
+    # Upper bound of ticks fired back-to-back by the CATCH_UP policy, so a
+    # long stall (e.g. a suspended machine) does not turn into a click storm.
+    MAX_CATCH_UP = 10
+
+    def __init__(self, policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleeper: Optional[HybridSleeper] = None):
+        self.policy = policy
+        self.clock = clock
+        self.sleeper = sleeper or get_sleeper()
+        self.next_deadline = 0.0
+        self.reset()
+
+    def reset(self):
+        """Forget the current grid and all statistics."""
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self._catch_up_left = self.MAX_CATCH_UP
+        self._requested_total = 0.0
+        self._first_fire = 0.0
+        self._last_fire = 0.0
+        self._last_delay = 0.0
+        self._paused_at = None
+
+    def start(self, now: Optional[float] = None) -> float:
+        """Anchor the grid so the first tick is due immediately."""
+        self.reset()
+        self.next_deadline = self.clock() if now is None else now
+        return self.next_deadline
+
+    def pause(self, now: Optional[float] = None):
+        """Freeze the grid; the paused time is excluded from the statistics."""
+        if self._paused_at is None:
+            self._paused_at = self.clock() if now is None else now
+
+    def resume(self, now: Optional[float] = None) -> float:
+        """Continue after `pause`, with the next tick due immediately."""
+        if now is None:
+            now = self.clock()
+        if self._paused_at is not None:
+            if self.ticks:
+                self._first_fire += now - self._paused_at
+                self._last_fire += now - self._paused_at
+            self._paused_at = None
+        self.next_deadline = now
+        return now
+
+    def time_left(self, now: Optional[float] = None) -> float:
+        """Seconds until the next deadline (negative when late)."""
+        return self.next_deadline - (self.clock() if now is None else now)
+
+    def record_fire(self, now: Optional[float] = None):
+        """Register that the current tick was executed at `now`."""
+        if now is None:
+            now = self.clock()
+        if self.ticks == 0:
+            self._first_fire = now
+        self._last_fire = now
+        self.ticks += 1
+
+    def advance(self, delay: float, now: Optional[float] = None) -> float:
+        """
+        Move the deadline forward by `delay` seconds and apply the overrun policy.
+
+        Args:
+            delay: Requested time between the current tick and the next one
+            now: Current clock value (read from the clock when omitted)
+
+        Returns:
+            Absolute deadline of the next tick
+        """
+        if now is None:
+            now = self.clock()
+        self._requested_total += delay
+        self._last_delay = delay
+        deadline = self.next_deadline + delay
+
+        if deadline >= now:
+            self._catch_up_left = self.MAX_CATCH_UP
+        else:
+            self.overruns += 1
+            if self.policy == OverrunPolicy.SKIP and delay > 0:
+                missed = int((now - deadline) // delay) + 1
+                self.skipped_ticks += missed
+                deadline += missed * delay
+            elif self.policy == OverrunPolicy.CATCH_UP and self._catch_up_left > 0:
+                self._catch_up_left -= 1
+            else:
+                deadline = now
+
+        self.next_deadline = deadline
+        return deadline
+
+    def wait(self, should_continue: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Block until the next deadline using the hybrid sleeper.
+
+        The sleeper polls `should_continue` between coarse slices, so a stop
+        request is noticed quickly even with very long intervals.
+
+        Returns:
+            False if `should_continue` returned False before the deadline
+        """
+        return self.sleeper.sleep_until(self.next_deadline, should_continue)
+
+    def get_stats(self) -> ScheduleStats:
+        """Return the requested versus achieved timing so far."""
+        # The delay requested after the last tick has not elapsed yet.
+        completed = self._requested_total - self._last_delay if self.ticks else 0.0
+        requested = completed / (self.ticks - 1) if self.ticks > 1 else self._last_delay
+        achieved = (self._last_fire - self._first_fire) / (self.ticks - 1) if self.ticks > 1 else 0.0
+        return ScheduleStats(
+            ticks=self.ticks,
+            requested_interval=requested,
+            achieved_interval=achieved,
+            overruns=self.overruns,
+            skipped_ticks=self.skipped_ticks,
+            elapsed=self._last_fire - self._first_fire if self.ticks else 0.0
+        )
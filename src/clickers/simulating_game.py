@@ -1,9 +1,10 @@
-import time, keyboard
+import time
 from threading import Thread
 
 class GameSimulator:
-    def __init__(self, root, button):
+    def __init__(self, root, button, backend):
         self.root = root
+        self.backend = backend # Input backend the keys are sent through.
         self.simulating_game = False
         self.simulate_game_button = button
         self.simulate_game_button.config(command=self.toggle_simulation)
@@ -34,9 +35,11 @@ class GameSimulator:
         for i in range(len(sequence)):
             if not self.simulating_game: break
             key = sequence[i]
-            keyboard.press(key)
+            self.backend.key_down(key)
+            self.backend.flush()
             time.sleep(1)
-            keyboard.release(key)
+            self.backend.key_up(key)
+            self.backend.flush()
             if key == "w": sequence[i] = "s"
             elif key == "s": sequence[i] = "w"
             elif key == "a": sequence[i] = "d"
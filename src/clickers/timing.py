@@ -0,0 +1,122 @@
+"""
+Timing Engine - High-resolution waits for the click loop.
+
+`time.sleep` alone is too coarse for sub-100 ms intervals: depending on the
+platform it oversleeps by 0.5-15 ms. The hybrid sleeper waits in two phases:
+1. Coarse phase - a regular sleep that ends a little before the deadline
+2. Fine phase - spin on the clock (optionally yielding) until the deadline
+
+The length of the fine phase is the accuracy-vs-CPU trade-off: the longer
+it is, the more late wake-ups it absorbs and the more CPU it burns. The
+sleeper also learns how much the OS oversleeps and ends the coarse phase
+earlier accordingly.
+"""
+
+import time
+from enum import Enum
+from threading import Event
+from typing import Callable, Optional
+
+
+class TimingPrecision(Enum):
+    """Accuracy-vs-CPU presets for the hybrid sleeper."""
+    EFFICIENT = "efficient"  # Plain sleep, lowest CPU, ~1-15 ms error
+    BALANCED = "balanced"    # Short yielding spin, good for most intervals
+    PRECISE = "precise"      # Longer busy spin, sub-millisecond jitter
+
+
+class HybridSleeper:
+    """
+    Sleep-then-spin waiter with a tunable spin window.
+
+    Args:
+        spin_window: Seconds before the deadline at which sleeping stops and
+            spinning starts (0 disables spinning)
+        yield_during_spin: Release the CPU with `time.sleep(0)` while spinning
+        clock: Monotonic clock used for the deadlines
+    """
+
+    PRESETS = {
+        TimingPrecision.EFFICIENT: (0.0, True),
+        TimingPrecision.BALANCED: (0.002, True),
+        TimingPrecision.PRECISE: (0.004, False),
+    }
+
+    # Longest single coarse sleep, so stop requests are noticed quickly.
+    MAX_SLICE = 0.05
+
+    def __init__(self, spin_window: float = 0.002, yield_during_spin: bool = True,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.spin_window = max(0.0, spin_window)
+        self.yield_during_spin = yield_during_spin
+        self.clock = clock
+        # Exponential moving average of how late coarse sleeps wake up.
+        self.oversleep = 0.0
+
+    @classmethod
+    def for_precision(cls, precision: TimingPrecision) -> "HybridSleeper":
+        """Create a sleeper from one of the predefined presets."""
+        spin_window, yield_during_spin = cls.PRESETS.get(precision, cls.PRESETS[TimingPrecision.BALANCED])
+        return cls(spin_window, yield_during_spin)
+
+    def sleep_until(self, deadline: float, should_continue: Optional[Callable[[], bool]] = None,
+                    wake: Optional[Event] = None) -> bool:
+        """
+        Wait until the clock reaches `deadline`.
+
+        Args:
+            deadline: Absolute time on `clock`
+            should_continue: Polled between coarse slices; returning False aborts the wait
+            wake: Event that aborts the coarse phase as soon as it is set
+
+        Returns:
+            False if the wait was aborted, True once the deadline is reached
+        """
+        clock = self.clock
+        while True:
+            if should_continue is not None and not should_continue():
+                return False
+            coarse = deadline - clock() - self.spin_window - self.oversleep
+            if coarse <= 0:
+                break
+            chunk = min(coarse, self.MAX_SLICE)
+            started = clock()
+            if wake is None:
+                time.sleep(chunk)
+            elif wake.wait(chunk):
+                return False
+            late = (clock() - started) - chunk
+            self.oversleep += (max(0.0, late) - self.oversleep) * 0.1
+
+        if self.spin_window <= 0:
+            # No spin window: finish with a plain sleep.
+            remaining = deadline - clock()
+            if remaining > 0:
+                time.sleep(remaining)
+            return True
+
+        if self.yield_during_spin:
+            while clock() < deadline:
+                time.sleep(0)
+        else:
+            while clock() < deadline:
+                pass
+        return True
+
+    def sleep(self, seconds: float, should_continue: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait for a relative number of seconds."""
+        if seconds <= 0:
+            return True
+        return self.sleep_until(self.clock() + seconds, should_continue)
+
+
+# Shared sleepers, one per precision preset.
+_sleepers = {}
+
+
+def get_sleeper(precision: TimingPrecision = TimingPrecision.BALANCED) -> HybridSleeper:
+    """Get or create the shared sleeper for a precision preset."""
+    sleeper = _sleepers.get(precision)
+    if sleeper is None:
+        sleeper = _sleepers[precision] = HybridSleeper.for_precision(precision)
+    return sleeper
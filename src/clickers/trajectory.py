@@ -0,0 +1,137 @@
+"""
+Trajectory - Whole mouse paths computed in one pass.
+
+A natural mouse move is a list of points eased along a curve, with a
+little gaussian micro-jitter, plus the pause after each point. Instead of
+computing every step inside the move loop, the whole path is built at once
+(vectorized with NumPy when it is installed) before the first point is
+sent. The eased progress of each curve only depends on the curve type and
+the step count, so it is computed once and cached.
+
+Paths can then be played paced (one move and pause per point) or turned
+into one batch of absolute or relative move events for high-rate jobs.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+from src.utils.lazy import numpy
+
+CURVES = ("linear", "ease_in", "ease_out", "ease_in_out")
+
+# Share of path points that get micro-jitter, and its sigma in pixels.
+MICRO_JITTER_CHANCE = 0.2
+MICRO_JITTER_SIGMA = 1.0
+
+
+def ease(t: float, curve: str) -> float:
+    """Eased progress of `t` (0-1) along a curve type."""
+    if curve == "ease_in":
+        return t * t
+    if curve == "ease_out":
+        return 1 - (1 - t) ** 2
+    if curve == "ease_in_out":
+        return 2 * t * t if t < 0.5 else 1 - ((-2 * t + 2) ** 2) / 2
+    return t
+
+
+@lru_cache(maxsize=256)
+def curve_shape(curve: str, steps: int):
+    """
+    Eased progress of each of the `steps` points of a path (cached).
+
+    Returns:
+        Read-only NumPy array, or a tuple without NumPy
+    """
+    np = numpy()
+    if np is None:
+        return tuple(ease(i / steps, curve) for i in range(1, steps + 1))
+    t = np.arange(1, steps + 1, dtype=float) / steps
+    if curve == "ease_in":
+        t = t * t
+    elif curve == "ease_out":
+        t = 1 - (1 - t) ** 2
+    elif curve == "ease_in_out":
+        t = np.where(t < 0.5, 2 * t * t, 1 - ((-2 * t + 2) ** 2) / 2)
+    t.setflags(write=False)
+    return t
+
+
+def build_path(start: Tuple[int, int], end: Tuple[int, int], shape, rng=None,
+               jitter_chance: float = MICRO_JITTER_CHANCE) -> List[Tuple[int, int]]:
+    """
+    Integer points from `start` to `end` following a curve shape.
+
+    Args:
+        start, end: Cursor position and target
+        shape: Eased progress per point (from `curve_shape`)
+        rng: RandomStream for the micro-jitter (None = no jitter)
+        jitter_chance: Share of points moved by a gaussian pixel offset
+
+    Returns:
+        List of (x, y) points, the last one at the (jittered) end
+    """
+    (sx, sy), (ex, ey) = start, end
+    steps = len(shape)
+    np = numpy()
+    if np is not None:
+        xs = sx + (ex - sx) * shape
+        ys = sy + (ey - sy) * shape
+        if rng is not None:
+            mask = np.frombuffer(rng.uniforms(steps), dtype=float) < jitter_chance
+            noise = np.frombuffer(rng.normals(2 * steps), dtype=float) * MICRO_JITTER_SIGMA
+            xs = xs + mask * noise[:steps]
+            ys = ys + mask * noise[steps:]
+        return list(zip(xs.astype(int).tolist(), ys.astype(int).tolist()))
+
+    dx, dy = ex - sx, ey - sy
+    if rng is None:
+        return [(int(sx + dx * t), int(sy + dy * t)) for t in shape]
+    uniforms, noise = rng.uniforms(steps), rng.normals(2 * steps)
+    points = []
+    for i, t in enumerate(shape):
+        x, y = sx + dx * t, sy + dy * t
+        if uniforms[i] < jitter_chance:
+            x += noise[i] * MICRO_JITTER_SIGMA
+            y += noise[steps + i] * MICRO_JITTER_SIGMA
+        points.append((int(x), int(y)))
+    return points
+
+
+def gaussian_delays(steps: int, base: float, sigma: float, rng, floor: float = 0.01) -> array:
+    """
+    Pauses of a paced path: `base` with gaussian variation clipped at 3 sigma.
+
+    Same distribution as AntiDetectionBypass.gaussian_variation, drawn in
+    one batch. `sigma` is relative to `base`.
+    """
+    spread = base * sigma
+    limit = 3 * spread
+    return array("d", [max(floor, base + max(-limit, min(limit, spread * n))) for n in rng.normals(steps)])
+
+
+def uniform_delays(steps: int, base: float, variation: float, rng) -> array:
+    """Pauses of a paced path: `base` +- `variation`, never negative."""
+    low, span = base - variation, 2 * variation
+    return array("d", [max(0.0, low + span * u) for u in rng.uniforms(steps)])
+
+
+def path_events(start: Tuple[int, int], points: Sequence[Tuple[int, int]], relative: bool = False) -> List[Tuple]:
+    """
+    Move events of a path, for one batched injection.
+
+    Points that would not move the cursor are dropped.
+
+    Args:
+        start: Cursor position before the path
+        points: Path points
+        relative: Emit ("move_rel", dx, dy) deltas instead of absolute moves
+    """
+    events = []
+    last_x, last_y = start
+    for x, y in points:
+        if x == last_x and y == last_y:
+            continue
+        events.append(("move_rel", x - last_x, y - last_y) if relative else ("move", x, y))
+        last_x, last_y = x, y
+    return events
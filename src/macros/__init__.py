@@ -0,0 +1,11 @@
+from .timeline import MacroError, MacroTimeline
+from .recorder import MacroRecorder
+from .macro_file import MACRO_EXTENSION, MacroFile, MacroWriter, save_macro
+from .player import MAX_SPEED, MIN_SPEED, MacroReplay, StreamingReplay, compile_macro
+from .script import SCRIPT_EXTENSION, Script, ScriptError, ScriptRunner, compile_script, load_script, parse_script
+
+__all__ = [
+    "MacroError", "MacroTimeline", "MacroRecorder", "MacroReplay", "StreamingReplay", "compile_macro", "MIN_SPEED", "MAX_SPEED",
+    "MACRO_EXTENSION", "MacroFile", "MacroWriter", "save_macro",
+    "SCRIPT_EXTENSION", "Script", "ScriptError", "ScriptRunner", "compile_script", "load_script", "parse_script"
+]
@@ -0,0 +1,285 @@
+"""
+Macro File - Versioned binary macro format with memory-mapped streaming.
+
+Multi-hour recordings reach millions of events, which JSON or pickle cannot
+load (or keep in memory) cheaply. A macro file is:
+
+    Header (HEADER_SIZE bytes): magic, version, record size, index interval,
+        record/event counts, duration and the offsets of the index and of
+        the name table.
+    Records (RECORD_SIZE bytes each), delta-encoded:
+        dt     u32  microseconds since the previous record
+        type   u8   trace EVENT_* constant (0 = padding for long gaps)
+        -      u8   reserved
+        code   u16  index into the name table (buttons and keys)
+        dx, dy i32  move: offset from the previous absolute position;
+                    relative move: the offset itself
+    Index (INDEX_SIZE bytes per entry): every `index_interval` records, the
+        record number with the absolute time and cursor position before it,
+        so playback can start anywhere without decoding from the beginning.
+    Name table: UTF-8 JSON list of button/key names.
+
+The reader maps the file and decodes records lazily, so memory use does not
+grow with the macro length and the first event is available right away.
+"""
+
+import os
+import json
+import mmap
+import struct
+import tempfile
+from typing import Iterator, List, Optional, Tuple, Union
+from src.macros.timeline import MacroError, MacroTimeline
+from src.utils.trace import EVENT_MOVE, EVENT_MOVE_REL, EVENT_NAMES, EVENT_TYPES
+
+MACRO_EXTENSION = ".sacm"
+
+MAGIC = b"SACMACRO"
+VERSION = 2
+
+HEADER_FORMAT = "<8sHHIQQQQQQI"
+HEADER_SIZE = 128
+RECORD_FORMAT = "<IBBHii"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+INDEX_FORMAT = "<QQii"
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+
+INDEX_INTERVAL = 4096      # Records between index entries
+EVENT_PAD = 0              # Record that only advances the time
+
+MAX_DT = 0xFFFFFFFF
+
+# Records packed in memory before each file write.
+WRITE_CHUNK = 4096
+
+
+class MacroWriter:
+    """
+    Streams events into a macro file.
+
+    Args:
+        path: Output file (replaced once closed; a failed write leaves it untouched)
+        index_interval: Records between index entries
+    """
+
+    def __init__(self, path: str, index_interval: int = INDEX_INTERVAL):
+        self.path = path
+        self.index_interval = index_interval
+        self.names: List[str] = [""]
+        self._codes = {"": 0}
+        # Written to a temp file next to the target, renamed over it by close().
+        descriptor, self._temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=MACRO_EXTENSION, dir=os.path.dirname(path) or ".")
+        self._file = os.fdopen(descriptor, "wb")
+        self._file.write(bytes(HEADER_SIZE))
+        self._chunk = bytearray()
+        self._index = bytearray()
+        self._pack = struct.Struct(RECORD_FORMAT).pack
+        self.record_count = 0
+        self.event_count = 0
+        self._time = 0      # Microseconds
+        self._x = 0
+        self._y = 0
+
+    def _code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            if len(self.names) > 0xFFFF:
+                raise MacroError("Too many distinct buttons and keys in the macro")
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def _record(self, dt: int, event_type: int, code: int = 0, dx: int = 0, dy: int = 0):
+        if self.record_count % self.index_interval == 0:
+            self._index += struct.pack(INDEX_FORMAT, self.record_count, self._time, self._x, self._y)
+        self._chunk += self._pack(dt, event_type, 0, code, dx, dy)
+        self.record_count += 1
+        self._time += dt
+        if event_type == EVENT_MOVE:
+            self._x += dx
+            self._y += dy
+        if len(self._chunk) >= WRITE_CHUNK * RECORD_SIZE:
+            self._file.write(self._chunk)
+            self._chunk = bytearray()
+
+    def append(self, time: float, kind: str, name: str = "", x: int = 0, y: int = 0):
+        """Add an event (same arguments as MacroTimeline.append)."""
+        event_type = EVENT_TYPES.get(kind)
+        if event_type is None:
+            raise MacroError(f"Unknown macro event '{kind}'")
+        dt = round(time * 1_000_000) - self._time
+        if dt < 0:
+            raise MacroError("Macro events must be in time order")
+        while dt > MAX_DT:
+            self._record(MAX_DT, EVENT_PAD)
+            dt -= MAX_DT
+        code = self._code(name) if name else 0
+        if event_type == EVENT_MOVE:
+            dx, dy = int(x) - self._x, int(y) - self._y
+        else:
+            dx, dy = int(x), int(y)
+        self._record(dt, event_type, code, dx, dy)
+        self.event_count += 1
+
+    def close(self):
+        """Write the index, the name table and the final header, then replace the target."""
+        if self._file.closed:
+            return
+        try:
+            self._finish()
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self):
+        """Drop what was written; the target is left as it was."""
+        self._file.close()
+        try: os.remove(self._temp_path)
+        except OSError: pass
+
+    def _finish(self):
+        self._file.write(self._chunk)
+        index_offset = HEADER_SIZE + self.record_count * RECORD_SIZE
+        self._file.write(self._index)
+        names = json.dumps(self.names).encode("utf-8")
+        names_offset = index_offset + len(self._index)
+        self._file.write(names)
+        self._file.seek(0)
+        self._file.write(struct.pack(
+            HEADER_FORMAT, MAGIC, VERSION, RECORD_SIZE, self.index_interval, self.record_count, self.event_count,
+            self._time, index_offset, len(self._index) // INDEX_SIZE, names_offset, len(names)
+        ))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self) -> "MacroWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif not self._file.closed:
+            self.discard()
+
+
+def save_macro(macro: Union[MacroTimeline, "MacroFile"], path: str):
+    """Write a recorded timeline (or another macro file) to a macro file."""
+    if isinstance(macro, MacroFile) and os.path.abspath(macro.path) == os.path.abspath(path):
+        return
+    with MacroWriter(path) as writer:
+        for time, event in macro.events():
+            if len(event) == 3:
+                writer.append(time, event[0], x=event[1], y=event[2])
+            else:
+                writer.append(time, event[0], event[1])
+
+
+class MacroFile:
+    """
+    Memory-mapped macro file, decoded on demand.
+
+    Args:
+        path: Macro file
+
+    Raises:
+        MacroError: If the file is not a macro or uses another version
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise MacroError("The macro file is empty")
+        buffer = self._buffer
+        if len(buffer) < HEADER_SIZE:
+            raise MacroError("Not a macro file")
+        (magic, version, record_size, self.index_interval, self.record_count, self.event_count, self.duration_us,
+         self._index_offset, self._index_count, names_offset, names_length) = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+        if magic != MAGIC:
+            raise MacroError("Not a macro file")
+        if version != VERSION or record_size != RECORD_SIZE:
+            raise MacroError(f"Unsupported macro file version {version}")
+        if len(buffer) < names_offset + names_length or self._index_offset < HEADER_SIZE + self.record_count * RECORD_SIZE:
+            raise MacroError("The macro file is truncated")
+        self.names: List[str] = json.loads(buffer[names_offset:names_offset + names_length])
+
+    def __len__(self) -> int:
+        return self.event_count
+
+    @property
+    def duration(self) -> float:
+        """Time of the last event, in seconds."""
+        return self.duration_us / 1_000_000
+
+    def close(self):
+        self._buffer.close()
+
+    def _checkpoint(self, entry: int) -> Tuple[int, int, int, int]:
+        return struct.unpack_from(INDEX_FORMAT, self._buffer, self._index_offset + entry * INDEX_SIZE)
+
+    def seek(self, time: float) -> int:
+        """Index entry of the last checkpoint at or before `time` seconds."""
+        target = round(time * 1_000_000)
+        low, high = 0, self._index_count - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._checkpoint(middle)[1] <= target:
+                low = middle
+            else:
+                high = middle - 1
+        return max(0, low)
+
+    def records_from(self, entry: int = 0) -> Iterator[Tuple[int, int, int, int, int]]:
+        """
+        Decode records from an index entry on.
+
+        Yields:
+            (time_us, type, code, x, y) of every event; x, y are absolute
+            for moves and offsets for relative moves
+        """
+        if not self._index_count:
+            return
+        record, time, x, y = self._checkpoint(entry)
+        buffer, unpack_from = self._buffer, struct.Struct(RECORD_FORMAT).unpack_from
+        offset = HEADER_SIZE + record * RECORD_SIZE
+        for offset in range(offset, HEADER_SIZE + self.record_count * RECORD_SIZE, RECORD_SIZE):
+            dt, event_type, _, code, dx, dy = unpack_from(buffer, offset)
+            time += dt
+            if event_type == EVENT_MOVE:
+                x += dx
+                y += dy
+                yield time, event_type, code, x, y
+            elif event_type == EVENT_MOVE_REL:
+                yield time, event_type, code, dx, dy
+            elif event_type != EVENT_PAD:
+                yield time, event_type, code, 0, 0
+
+    def event(self, event_type: int, code: int, x: int, y: int) -> Tuple:
+        """Decoded record in the InputBackend tuple format."""
+        kind = EVENT_NAMES[event_type]
+        if event_type == EVENT_MOVE or event_type == EVENT_MOVE_REL:
+            return kind, x, y
+        return kind, self.names[code]
+
+    def events(self, start: float = 0.0) -> Iterator[Tuple[float, Tuple]]:
+        """(time, event) pairs from `start` seconds on."""
+        start_us = round(start * 1_000_000)
+        for time, event_type, code, x, y in self.records_from(self.seek(start)):
+            if time >= start_us:
+                yield time / 1_000_000, self.event(event_type, code, x, y)
+
+    def to_timeline(self, limit: Optional[int] = None) -> MacroTimeline:
+        """Load (up to `limit`) events into memory."""
+        timeline = MacroTimeline(self.names)
+        for count, (time, event) in enumerate(self.events()):
+            if limit is not None and count >= limit:
+                break
+            if len(event) == 3:
+                timeline.append(time, event[0], x=event[1], y=event[2])
+            else:
+                timeline.append(time, event[0], event[1])
+        return timeline
@@ -0,0 +1,225 @@
+"""
+Macro Player - Replays a MacroTimeline on the click engine.
+
+A macro becomes an ordinary engine job: every tick sends one frame (the
+events recorded within GROUP_WINDOW of each other, compiled once into a
+single backend batch) and asks for the delay until the next frame. The
+engine's deadline grid keeps the recorded relative timing without drift,
+and the job ends by itself after the last frame.
+
+Playback can be scaled (0.5x to 20x) or run as fast as possible, in which
+case events go out in batches of ASAP_BATCH with no delay in between.
+Stopping or pausing releases any button or key the macro still holds.
+
+Macros opened from a file (MacroFile) are streamed instead: StreamingReplay
+decodes one frame ahead from the memory map, so memory use stays flat and
+the first frame is ready as soon as the header has been read.
+"""
+
+from array import array
+from typing import Callable, List, Optional, Tuple, Union
+from src.clickers.click_job import ClickJob, JobProgram
+from src.clickers.scheduler import OverrunPolicy
+from src.macros.macro_file import MacroFile
+from src.macros.timeline import MacroError, MacroTimeline
+from src.utils.trace import EVENT_DOWN, EVENT_KEY_DOWN, EVENT_KEY_UP, EVENT_UP
+
+MIN_SPEED = 0.5
+MAX_SPEED = 20.0
+
+# Events closer than this (after scaling) to the start of a frame join it.
+GROUP_WINDOW = 0.0005
+# Events per frame in as-fast-as-possible mode.
+ASAP_BATCH = 64
+
+
+def check_speed(speed: float, asap: bool = False):
+    if not asap and not MIN_SPEED <= speed <= MAX_SPEED:
+        raise MacroError(f"Speed must be between {MIN_SPEED:g}x and {MAX_SPEED:g}x")
+
+
+def split_frames(timeline: MacroTimeline, speed: float = 1.0, asap: bool = False) -> Tuple[List[Tuple[int, int]], array]:
+    """
+    Group the events of a timeline into frames sent together.
+
+    Returns:
+        Tuple (bounds, delays): (start, end) event indexes of each frame and
+        the delay from each frame to the next one
+    """
+    times = timeline.times
+    count = len(times)
+    bounds = []
+    delays = array("d")
+    index = 0
+    while index < count:
+        start = index
+        if asap:
+            index = min(count, start + ASAP_BATCH)
+        else:
+            index += 1
+            while index < count and (times[index] - times[start]) / speed <= GROUP_WINDOW:
+                index += 1
+        bounds.append((start, index))
+        delays.append(0.0 if asap or index >= count else (times[index] - times[start]) / speed)
+    return bounds, delays
+
+
+class MacroReplay:
+    """
+    Playback state of one macro run (compiled fresh for every run).
+
+    Args:
+        timeline: Recorded events
+        backend: InputBackend the events are sent through
+        speed: Time scale (2.0 = twice as fast)
+        asap: Ignore the recorded timing and send everything at once
+    """
+
+    def __init__(self, timeline: MacroTimeline, backend, speed: float = 1.0, asap: bool = False):
+        if not len(timeline):
+            raise MacroError("The macro has no events")
+        check_speed(speed, asap)
+        self.timeline = timeline
+        self.backend = backend
+        self.bounds, self.delays = split_frames(timeline, speed, asap)
+        self.frames: List[Callable[[], None]] = [
+            backend.compile_events([timeline.event(i) for i in range(start, end)]) for start, end in self.bounds
+        ]
+        self.position = 0   # Next frame to send
+
+    def action(self):
+        self.frames[self.position]()
+
+    def next_delay(self) -> Optional[float]:
+        """Delay until the next frame; None after the last one."""
+        delay = self.delays[self.position]
+        self.position += 1
+        return delay if self.position < len(self.frames) else None
+
+    def held(self) -> List[Tuple]:
+        """Release events of the buttons and keys left down by the frames sent so far."""
+        sent = self.bounds[self.position - 1][1] if self.position else 0
+        timeline = self.timeline
+        types, codes = timeline.types, timeline.codes
+        down = {}
+        for i in range(sent):
+            event_type = types[i]
+            if event_type == EVENT_DOWN or event_type == EVENT_KEY_DOWN:
+                down[(event_type, codes[i])] = True
+            elif event_type == EVENT_UP:
+                down.pop((EVENT_DOWN, codes[i]), None)
+            elif event_type == EVENT_KEY_UP:
+                down.pop((EVENT_KEY_DOWN, codes[i]), None)
+        return [("up" if event_type == EVENT_DOWN else "key_up", timeline.names[code]) for event_type, code in down]
+
+    def cleanup(self):
+        """Release whatever the macro still holds."""
+        events = self.held()
+        if events:
+            self.backend.send_batch(events)
+
+
+class StreamingReplay:
+    """
+    Playback state of one run of a macro file, decoded while it plays.
+
+    Only the frame being sent and the next one are kept in memory; the held
+    buttons and keys are tracked as frames go out.
+
+    Args:
+        macro_file: Memory-mapped macro
+        backend: InputBackend the events are sent through
+        speed: Time scale (2.0 = twice as fast)
+        asap: Ignore the recorded timing and send everything at once
+        start: Recorded time (seconds) to start from
+    """
+
+    def __init__(self, macro_file: MacroFile, backend, speed: float = 1.0, asap: bool = False, start: float = 0.0):
+        check_speed(speed, asap)
+        self.macro_file = macro_file
+        self.backend = backend
+        self.window = GROUP_WINDOW * speed * 1_000_000   # Recorded microseconds
+        self.asap = asap
+        self.scale = 1 / (speed * 1_000_000)
+        start_us = round(start * 1_000_000)
+        self._records = (record for record in macro_file.records_from(macro_file.seek(start)) if record[0] >= start_us)
+        self._pending = next(self._records, None)
+        self.held = {}
+        self.frame, self.frame_time = self._read_frame()
+        if not self.frame:
+            raise MacroError("The macro has no events")
+        self.next_frame, self.next_time = self._read_frame()
+
+    def _read_frame(self) -> Tuple[List[Tuple], int]:
+        """Decode the next frame (events, recorded time in microseconds)."""
+        record = self._pending
+        if record is None:
+            return [], 0
+        records, macro_file = self._records, self.macro_file
+        start = record[0]
+        end = start + self.window
+        frame = []
+        while record is not None and (len(frame) < ASAP_BATCH if self.asap else record[0] <= end):
+            frame.append(record)
+            record = next(records, None)
+        self._pending = record
+        return [macro_file.event(event_type, code, x, y) for _, event_type, code, x, y in frame], start
+
+    def action(self):
+        held = self.held
+        for event in self.frame:
+            kind = event[0]
+            if kind == "down" or kind == "key_down":
+                held[event] = True
+            elif kind == "up":
+                held.pop(("down", event[1]), None)
+            elif kind == "key_up":
+                held.pop(("key_down", event[1]), None)
+        self.backend.send_batch(self.frame)
+
+    def next_delay(self) -> Optional[float]:
+        """Delay until the next frame; None after the last one."""
+        if not self.next_frame:
+            return None
+        delay = 0.0 if self.asap else (self.next_time - self.frame_time) * self.scale
+        self.frame, self.frame_time = self.next_frame, self.next_time
+        self.next_frame, self.next_time = self._read_frame()
+        return delay
+
+    def cleanup(self):
+        """Release whatever the macro still holds."""
+        events = [("up" if kind == "down" else "key_up", name) for kind, name in self.held]
+        self.held.clear()
+        if events:
+            self.backend.send_batch(events)
+
+
+def compile_macro(macro: Union[MacroTimeline, MacroFile], backend, speed: float = 1.0, asap: bool = False,
+                  use_native_input: bool = False) -> JobProgram:
+    """
+    Compile a macro into a program for the click engine.
+
+    Args:
+        macro: Recorded events, in memory or streamed from a macro file
+        backend: InputBackend the events are sent through
+        speed: Time scale between MIN_SPEED and MAX_SPEED (ignored with `asap`)
+        asap: Send the events as fast as possible
+        use_native_input: Recorded in the job, for the backend choice
+
+    Raises:
+        MacroError: If the macro is empty or the speed is out of range
+    """
+    if isinstance(macro, MacroFile):
+        replay = StreamingReplay(macro, backend, speed, asap)
+    else:
+        replay = MacroReplay(macro, backend, speed, asap)
+    # Late frames are caught up (bounded) so the recorded rhythm is kept.
+    job = ClickJob(
+        click_key="macro",
+        interval=max(macro.duration / len(macro), 0.001),
+        use_native_input=use_native_input,
+        high_rate=True,
+        press_duration=0,
+        overrun_policy=OverrunPolicy.CATCH_UP
+    )
+    return JobProgram(job, replay.action, replay.next_delay, cleanup=replay.cleanup)
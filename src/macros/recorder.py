@@ -0,0 +1,120 @@
+"""
+Macro Recorder - Captures mouse and keyboard input into a MacroTimeline.
+
+The `mouse` and `keyboard` hook callbacks run on the libraries' listener
+threads, on the path of every real input event, so they must not slow the
+user down: each one only stores the event object the library already built
+into a preallocated slot of a per-source buffer (one writer per buffer, no
+locks). Converting to the compact timeline happens once, when recording
+stops.
+
+Mouse wheel events are not recorded (the input backends cannot replay them).
+"""
+
+from typing import Iterable, List, Optional
+from src.macros.timeline import MacroError, MacroTimeline
+
+# Events kept per source before new ones are dropped.
+DEFAULT_CAPACITY = 1 << 20
+
+
+class _EventBuffer:
+    """Preallocated list of hook events, filled by a single thread."""
+
+    def __init__(self, capacity: int):
+        self.slots: List[object] = [None] * capacity
+        self.size = 0
+        self.dropped = 0
+
+    def push(self, event):
+        size = self.size
+        if size < len(self.slots):
+            self.slots[size] = event
+            self.size = size + 1
+        else:
+            self.dropped += 1
+
+    def drain(self) -> List[object]:
+        events = self.slots[:self.size]
+        self.slots = []
+        return events
+
+
+class MacroRecorder:
+    """
+    Records real mouse and keyboard input.
+
+    Args:
+        capacity: Events kept per source (mouse, keyboard)
+        ignore_keys: Key names never recorded (e.g. the record hotkey)
+        record_moves: Record mouse moves as well as buttons
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, ignore_keys: Iterable[str] = (), record_moves: bool = True):
+        self.capacity = capacity
+        self.ignore_keys = {key.lower() for key in ignore_keys}
+        self.record_moves = record_moves
+        self.recording = False
+        self.dropped = 0
+        self._mouse = None
+        self._keyboard = None
+        self._mouse_events: Optional[_EventBuffer] = None
+        self._key_events: Optional[_EventBuffer] = None
+        self._key_hook = None
+
+    def start(self):
+        """
+        Start capturing input.
+
+        Raises:
+            MacroError: If the hook libraries are not available
+        """
+        if self.recording:
+            return
+        try:
+            import mouse, keyboard
+        except ImportError as e:
+            raise MacroError(f"mouse/keyboard libraries not available: {e}")
+        self._mouse, self._keyboard = mouse, keyboard
+        self._mouse_events = _EventBuffer(self.capacity)
+        self._key_events = _EventBuffer(self.capacity)
+        self.dropped = 0
+        self.recording = True
+        mouse.hook(self._mouse_events.push)
+        self._key_hook = keyboard.hook(self._key_events.push)
+
+    def stop(self) -> MacroTimeline:
+        """Stop capturing and return the recorded timeline."""
+        if not self.recording:
+            return MacroTimeline()
+        self.recording = False
+        self._mouse.unhook(self._mouse_events.push)
+        self._keyboard.unhook(self._key_hook)
+        self.dropped = self._mouse_events.dropped + self._key_events.dropped
+        return self.build_timeline(self._mouse_events.drain(), self._key_events.drain())
+
+    def build_timeline(self, mouse_events: List[object], key_events: List[object]) -> MacroTimeline:
+        """Merge the raw hook events of both sources into a timeline."""
+        mouse = self._mouse
+        events = []
+        for event in mouse_events:
+            if isinstance(event, mouse.ButtonEvent):
+                # The second press of a double click is reported as "double".
+                kind = "up" if event.event_type == mouse.UP else "down"
+                events.append((event.time, kind, event.button, 0, 0))
+            elif isinstance(event, mouse.MoveEvent) and self.record_moves:
+                events.append((event.time, "move", "", event.x, event.y))
+        for event in key_events:
+            name = (event.name or "").lower()
+            if not name or name in self.ignore_keys:
+                continue
+            kind = "key_down" if event.event_type == self._keyboard.KEY_DOWN else "key_up"
+            events.append((event.time, kind, name, 0, 0))
+        events.sort(key=lambda event: event[0])
+
+        timeline = MacroTimeline()
+        if events:
+            start = events[0][0]
+            for time, kind, name, x, y in events:
+                timeline.append(time - start, kind, name, x, y)
+        return timeline
@@ -0,0 +1,314 @@
+"""
+Macro Script - Small action language compiled to a flat opcode program.
+
+Scripts describe input sequences, one command per line ('#' starts a
+comment, durations take "ms" or "s" and default to milliseconds):
+
+    click [BUTTON] [X Y]     Click (left by default), moving first if X Y given
+    move X Y                 Move the cursor to screen coordinates
+    move_rel DX DY           Move the cursor relative to its position
+    press KEY                Press and release a key
+    down KEY|BUTTON          Press without releasing
+    up KEY|BUTTON            Release
+    hold KEY|BUTTON TIME     Press, wait TIME, release
+    wait TIME                Pause
+    repeat N ... end         Run the block N times
+    loop ... end             Run the block until the job is stopped
+
+Example:
+
+    click 640 360
+    wait 50ms
+    repeat 20
+        press e
+        wait 100
+    end
+    hold w 2s
+
+`parse_script` validates the whole script and reports the first error with
+its line number, before anything runs. `compile_script` then resolves every
+run of consecutive input commands into one compiled backend call, so the
+interpreter only walks a list of (opcode, argument) pairs: no parsing, name
+or dict lookups happen while the script plays.
+"""
+
+import re
+from typing import List, Optional, Tuple
+from src.clickers.backends import BackendError
+from src.clickers.click_job import MOUSE_BUTTONS, ClickJob, JobProgram
+from src.clickers.scheduler import OverrunPolicy
+from src.macros.timeline import MacroError
+
+SCRIPT_EXTENSION = ".sacs"
+
+# Opcodes.
+OP_SEND = 0     # arg: events (compiled: function sending them)
+OP_WAIT = 1     # arg: seconds
+OP_REPEAT = 2   # arg: (counter slot, count)
+OP_NEXT = 3     # arg: (counter slot, first op of the block)
+OP_JUMP = 4     # arg: op index
+
+MAX_WAIT = 3600.0
+MAX_REPEAT = 1_000_000
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s)?$")
+
+
+class ScriptError(MacroError):
+    """Raised when a script cannot be parsed or compiled."""
+
+    def __init__(self, message: str, line: int = 0):
+        super().__init__(f"Line {line}: {message}" if line else message)
+        self.line = line
+
+
+class Script:
+    """
+    A parsed script: flat opcodes with event tuples, not bound to a backend.
+
+    Args:
+        ops: (opcode, argument) pairs
+        counters: Number of repeat counters used
+        releases: Release events of everything the script can leave held
+        source: Script text
+    """
+
+    def __init__(self, ops: List[Tuple[int, object]], counters: int, releases: List[Tuple], source: str = ""):
+        self.ops = ops
+        self.counters = counters
+        self.releases = releases
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+
+def _duration(token: str, line: int) -> float:
+    match = _DURATION.match(token.lower())
+    if not match:
+        raise ScriptError(f"Invalid duration '{token}' (use e.g. 50ms or 1.5s)", line)
+    value = float(match.group(1))
+    seconds = value if match.group(2) == "s" else value / 1000
+    if seconds > MAX_WAIT:
+        raise ScriptError(f"Duration '{token}' is longer than {MAX_WAIT:g} seconds", line)
+    return seconds
+
+
+def _integer(token: str, line: int, what: str) -> int:
+    try:
+        return int(token)
+    except ValueError:
+        raise ScriptError(f"Invalid {what} '{token}'", line)
+
+
+def _transition(target: str, down: bool) -> Tuple[str, str]:
+    """Event pressing or releasing a mouse button or a key."""
+    if target in MOUSE_BUTTONS:
+        return ("down" if down else "up"), target
+    return ("key_down" if down else "key_up"), target
+
+
+def _arguments(args: List[str], low: int, high: int, usage: str, line: int):
+    if not low <= len(args) <= high:
+        raise ScriptError(f"Usage: {usage}", line)
+
+
+def parse_script(source: str) -> Script:
+    """
+    Parse and validate a script.
+
+    Raises:
+        ScriptError: On the first invalid line
+    """
+    ops: List[Tuple[int, object]] = []
+    blocks: List[Tuple[str, int, int, int]] = []    # (kind, counter slot, first op, line)
+    waits: List[bool] = []                          # Whether each open block waits
+    counters = 0
+    held = {}
+
+    def emit_events(*events):
+        # Events are only merged within a block, never across its first op.
+        if len(ops) > barrier and ops[-1][0] == OP_SEND:
+            ops[-1] = (OP_SEND, ops[-1][1] + events)
+        else:
+            ops.append((OP_SEND, events))
+
+    def emit_wait(seconds):
+        ops.append((OP_WAIT, seconds))
+        if waits:
+            waits[-1] = True
+
+    barrier = 0
+    number = 0
+    for number, text in enumerate(source.splitlines(), 1):
+        words = text.split("#", 1)[0].lower().split()
+        if not words:
+            continue
+        command, args = words[0], words[1:]
+        if command == "click":
+            _arguments(args, 0, 3, "click [BUTTON] [X Y]", number)
+            button = args.pop(0) if args and not args[0].lstrip("-").isdigit() else "left"
+            if button not in MOUSE_BUTTONS:
+                raise ScriptError(f"Unknown mouse button '{button}'", number)
+            if len(args) == 1:
+                raise ScriptError("Usage: click [BUTTON] [X Y]", number)
+            move = (("move", _integer(args[0], number, "X"), _integer(args[1], number, "Y")),) if args else ()
+            emit_events(*move, ("down", button), ("up", button))
+        elif command in ("move", "move_rel"):
+            _arguments(args, 2, 2, f"{command} X Y", number)
+            emit_events((command, _integer(args[0], number, "X"), _integer(args[1], number, "Y")))
+        elif command == "press":
+            _arguments(args, 1, 1, "press KEY", number)
+            emit_events(_transition(args[0], True), _transition(args[0], False))
+        elif command in ("down", "up"):
+            _arguments(args, 1, 1, f"{command} KEY|BUTTON", number)
+            event = _transition(args[0], command == "down")
+            if command == "down":
+                held[_transition(args[0], False)] = True
+            emit_events(event)
+        elif command == "hold":
+            _arguments(args, 2, 2, "hold KEY|BUTTON TIME", number)
+            seconds = _duration(args[1], number)
+            held[_transition(args[0], False)] = True
+            emit_events(_transition(args[0], True))
+            emit_wait(seconds)
+            emit_events(_transition(args[0], False))
+        elif command == "wait":
+            _arguments(args, 1, 1, "wait TIME", number)
+            emit_wait(_duration(args[0], number))
+        elif command == "repeat":
+            _arguments(args, 1, 1, "repeat N", number)
+            count = _integer(args[0], number, "repeat count")
+            if not 1 <= count <= MAX_REPEAT:
+                raise ScriptError(f"Repeat count must be between 1 and {MAX_REPEAT}", number)
+            ops.append((OP_REPEAT, (counters, count)))
+            blocks.append(("repeat", counters, len(ops), number))
+            waits.append(False)
+            counters += 1
+        elif command == "loop":
+            _arguments(args, 0, 0, "loop", number)
+            blocks.append(("loop", -1, len(ops), number))
+            waits.append(False)
+        elif command == "end":
+            _arguments(args, 0, 0, "end", number)
+            if not blocks:
+                raise ScriptError("'end' without 'repeat' or 'loop'", number)
+            kind, slot, first, line = blocks.pop()
+            waited = waits.pop()
+            if kind == "loop":
+                # An endless block that never waits would never give the engine back.
+                if not waited:
+                    raise ScriptError("A loop must contain a wait", line)
+                ops.append((OP_JUMP, first))
+            else:
+                ops.append((OP_NEXT, (slot, first)))
+            if waited and waits:
+                waits[-1] = True
+        else:
+            raise ScriptError(f"Unknown command '{command}'", number)
+        if command in ("repeat", "loop", "end"):
+            barrier = len(ops)
+    if blocks:
+        kind, _, _, line = blocks[-1]
+        raise ScriptError(f"'{kind}' is never closed with 'end'", line)
+    if not any(op == OP_SEND for op, _ in ops):
+        raise ScriptError("The script has no input commands")
+    return Script(ops, counters, list(held), source)
+
+
+def load_script(path: str) -> Script:
+    """
+    Read and parse a script file.
+
+    Raises:
+        ScriptError: If the file cannot be read or is not a valid script
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        raise ScriptError(f"Cannot read the script: {e}")
+    return parse_script(source)
+
+
+class ScriptRunner:
+    """
+    Interpreter of one script run, bound to a backend.
+
+    Args:
+        script: Parsed script
+        backend: InputBackend the events are sent through
+
+    Raises:
+        ScriptError: If the backend cannot compile the events
+    """
+
+    def __init__(self, script: Script, backend):
+        self.backend = backend
+        self.releases = script.releases
+        try:
+            self.ops: List[Tuple[int, object]] = [
+                (OP_SEND, backend.compile_events(arg)) if op == OP_SEND else (op, arg) for op, arg in script.ops
+            ]
+        except BackendError as e:
+            raise ScriptError(str(e))
+        self.counters = [0] * script.counters
+        self.pc = 0
+        self.delay: Optional[float] = None
+        self.sent = False   # Whether anything may be held since the last cleanup
+
+    def action(self):
+        """Run the ops up to the next wait (or the end of the script)."""
+        ops, counters = self.ops, self.counters
+        pc, count = self.pc, len(ops)
+        delay = None
+        while pc < count:
+            op, arg = ops[pc]
+            pc += 1
+            if op == OP_SEND:
+                arg()
+            elif op == OP_WAIT:
+                delay = arg
+                break
+            elif op == OP_NEXT:
+                slot, first = arg
+                counters[slot] -= 1
+                if counters[slot]:
+                    pc = first
+            elif op == OP_REPEAT:
+                counters[arg[0]] = arg[1]
+            else:
+                pc = arg
+        self.pc = pc
+        self.delay = delay
+        self.sent = True
+
+    def next_delay(self) -> Optional[float]:
+        """Wait reached by the last tick; None once the script has finished."""
+        return self.delay
+
+    def cleanup(self):
+        """Release every button and key the script presses without releasing."""
+        if self.sent and self.releases:
+            self.backend.send_batch(self.releases)
+        self.sent = False
+
+
+def compile_script(script: Script, backend, use_native_input: bool = False) -> JobProgram:
+    """
+    Compile a script into a program for the click engine.
+
+    Raises:
+        ScriptError: If the backend cannot compile the events
+    """
+    runner = ScriptRunner(script, backend)
+    waits = [arg for op, arg in script.ops if op == OP_WAIT]
+    job = ClickJob(
+        click_key="script",
+        interval=max(sum(waits) / len(waits), 0.001) if waits else 0.001,
+        use_native_input=use_native_input,
+        high_rate=True,
+        press_duration=0,
+        overrun_policy=OverrunPolicy.REANCHOR
+    )
+    return JobProgram(job, runner.action, runner.next_delay, cleanup=runner.cleanup)
@@ -0,0 +1,87 @@
+"""
+Macro Timeline - Compact, array-backed list of recorded input events.
+
+Each event is stored across parallel typed arrays (time, type, code, x, y)
+instead of one Python object per event, so long recordings stay small and
+can be scanned or replayed without touching per-event objects. Button and
+key names are interned in a name table indexed by `code`.
+
+Event types are the ones of the input trace (EVENT_DOWN, EVENT_KEY_UP, ...)
+and convert to the tuple format every InputBackend accepts.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.utils.trace import EVENT_MOVE, EVENT_MOVE_REL, EVENT_NAMES, EVENT_TYPES
+
+
+class MacroError(ValueError):
+    """Raised when a macro cannot be recorded, loaded or played."""
+
+
+class MacroTimeline:
+    """
+    Recorded events with their times, in seconds from the first event.
+
+    Args:
+        names: Initial button/key name table (index 0 is "no name")
+    """
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self.times = array("d")
+        self.types = array("B")
+        self.codes = array("H")
+        self.xs = array("i")
+        self.ys = array("i")
+        self.names: List[str] = list(names) if names else [""]
+        self._codes: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def duration(self) -> float:
+        """Time of the last event."""
+        return self.times[-1] if self.times else 0.0
+
+    def code(self, name: str) -> int:
+        """Index of a button/key name, added to the table on first use."""
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def append(self, time: float, kind: str, name: str = "", x: int = 0, y: int = 0):
+        """
+        Add an event at the end of the timeline.
+
+        Args:
+            time: Seconds from the start of the macro (non-decreasing)
+            kind: Backend event kind ("down", "key_up", "move", ...)
+            name: Button or key name of button and key events
+            x, y: Coordinates of move events
+        """
+        event_type = EVENT_TYPES.get(kind)
+        if event_type is None:
+            raise MacroError(f"Unknown macro event '{kind}'")
+        if self.times and time < self.times[-1]:
+            raise MacroError("Macro events must be in time order")
+        self.times.append(time)
+        self.types.append(event_type)
+        self.codes.append(self.code(name) if name else 0)
+        self.xs.append(int(x))
+        self.ys.append(int(y))
+
+    def event(self, index: int) -> Tuple:
+        """Event `index` in the InputBackend tuple format."""
+        event_type = self.types[index]
+        kind = EVENT_NAMES[event_type]
+        if event_type in (EVENT_MOVE, EVENT_MOVE_REL):
+            return kind, self.xs[index], self.ys[index]
+        return kind, self.names[self.codes[index]]
+
+    def events(self) -> Iterator[Tuple[float, Tuple]]:
+        """(time, event) pairs in order."""
+        for index in range(len(self.times)):
+            yield self.times[index], self.event(index)
@@ -1,17 +1,33 @@
-from threading import Thread
-from PIL import Image, ImageTk
-from src.memory import MemoryManager
+from src.memory import MemoryManager, Settings
 from src.windows import WindowsManager
-from tkinter import ttk, messagebox
-from keyboard import hook, unhook_all
+from tkinter import ttk, messagebox, filedialog
 from src.clickers.simulating_game import GameSimulator
+from src.clickers.scheduler import OverrunPolicy
+from src.clickers.timing import TimingPrecision, get_sleeper
+from src.clickers.click_job import ClickJob, ClickJobError, compile_program, human_delay
 from src.clickers.antidetection_bypass import AntiDetectionBypass, BypassProfile
 from src.clickers.native_input import NativeInput, InputMethod, get_native_input
-import os, json, time, mouse, random, tkinter as tk, keyboard, src.lib.globals as globals
+from src.clickers.movement import compile_move, move_naturally
+from src.clickers.rng import JobRandom
+from src.utils.lazy import preload
+from src.utils.startup import StartupProfile
+from dataclasses import replace
+from threading import Thread
+import os, sys, time, argparse, tkinter as tk, src.lib.globals as globals
 
 class AutoClicker:
-    def __init__(self):
+    # Native input methods selectable in the window.
+    INPUT_METHODS = {
+        "auto": InputMethod.AUTO,
+        "sendinput": InputMethod.SENDINPUT,
+        "mouse_event": InputMethod.MOUSE_EVENT,
+    }
+
+    def __init__(self, seed=None, recalibrate=False, startup=None):
+        # Startup phases, reported with --startup-profile.
+        self.startup = startup or StartupProfile()
         self.root = tk.Tk()
+        self.startup.mark("tk root")
         self.startup_mode = MemoryManager.get("startup_mode", "normal")
         if self.startup_mode == "minimized":
             self.root.withdraw()
@@ -21,11 +37,11 @@ class AutoClicker:
             self.setup_system_tray()
         elif MemoryManager.get("use_current_pos", True): 
             self.root.withdraw()
-            self.root.geometry(f"+{MemoryManager.get("window_x", 100)}+{MemoryManager.get("window_y", 100)}")
+            self.root.geometry(f"+{MemoryManager.get('window_x', 100)}+{MemoryManager.get('window_y', 100)}")
             self.root.deiconify()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.root.title("Smart Auto Clicker - FJRG2007")
-        self.root.geometry("400x920")
+        self.root.geometry("400x1235")
         self.root.resizable(False, False)
         globals.app_config_file_path = os.path.join(globals.app_config_path, "autoclicker_config.json")
         self.windows_manager = WindowsManager(self.root)
@@ -35,25 +51,94 @@ class AutoClicker:
         
         # Variables.
         self.is_running = False
-        self.click_thread = None
         self.trigger_key = "F6"
         self.click_key = "left"
         self.use_current_pos = True
         self.click_pos = (0, 0)
+        # Reference image clicked instead of the fixed position ("" = none); locators keep their last match.
+        self.target_image = ""
+        self.locators = {}
         self.recording_click = False
         self.hold_mode = False
         self.hold_duration = 0.1 # Default hold duration in seconds.
+        self.overrun_policy = OverrunPolicy.SKIP
+
+        # Compiled job snapshot; rebuilt only when a setting changes.
+        self.click_job = None
+
+        # High-resolution timing.
+        self.high_rate_mode = False
+        self.timing_precision = TimingPrecision.BALANCED
+        self.sleeper = get_sleeper(self.timing_precision)
+
+        # Seed of the main job's random streams (None = new every run); --seed overrides the config.
+        self.cli_seed = seed
+        self.config_seed = None
+        self.seed = seed
+
+        # Single scheduler thread shared by the main job and any extra jobs (created once the window is shown, see start_services).
+        self.engine = None
+        self.main_job = None
+
+        # Periodic metrics export to the config directory (seconds, 0 = off).
+        self.metrics_export_interval = 10
+        self.metrics_exporter = None
+
+        # On-demand profiler of the click thread (hotkey enabled in Settings).
+        self.profiler_hotkey_enabled = False
+        self.profiler_hotkey = "ctrl+alt+p"
+        self.profiler = None
+        self.extra_jobs = []
+
+        # Macro recording and replay.
+        self.macro_record_key = "F9"
+        self.macro_recorder = None
+        self.macro = None
+        self.macro_job = None
+        self.script = None
+        self.script_path = None
+
+        # Screen-region condition gating the main job (off the click thread), and its last settings.
+        self.watcher = None
+        self.watch_settings = {"region": [0, 0, 8, 8], "color": None, "tolerance": 30.0, "action": "gate", "rate": 20.0}
         self.trigger_key_text = tk.StringVar(value=f"Current trigger key: {self.trigger_key}")
 
-        # Anti-detection bypass system.
+        # Anti-detection bypass system (one per profile, created once).
         self.bypass_enabled = False
         self.bypass_profile = BypassProfile.MODERATE
-        self.bypass_system = AntiDetectionBypass(self.bypass_profile)
+        self.bypass_systems = {}
+        self.bypass_system = self.get_bypass_system(self.bypass_profile.value)
 
         # Native input system for game compatibility.
         self.use_native_input = False
         self.native_input_method = InputMethod.AUTO
-        self.native_input = get_native_input()
+        self.sendinput_batch_size = NativeInput.DEFAULT_BATCH_SIZE
+        # Created on first use, with the fastest calibrated method as "auto" (Windows only).
+        self.native_available = sys.platform == "win32"
+        self.native_input = None
+
+        # Backend calibration (probed once, then read from the config directory unless recalibrating).
+        self.backend_registry = None
+        self.recalibrate = recalibrate
+        self.calibrating = False
+
+        # Input backends: the default one and one native backend per method (Windows only), sharing the driver context.
+        self.input_backend_name = "auto"
+        self.input_backend = None
+        self.native_backends = {}
+
+        # Optional binary trace of every injected event (enabled in the config file; capacity None = the trace default).
+        self.trace_enabled = False
+        self.trace_capacity = None
+        self.trace_recorder = None
+        self.traced_backends = {}
+
+        # Named settings of the main job, switched by hotkey while running (programs compiled at start).
+        self.presets = None
+        self.active_preset = None
+        # Saved presets and extra jobs, added by start_services.
+        self.saved_presets = []
+        self.saved_jobs = []
         
         # Default interval values.
         self.hours = 0
@@ -62,8 +147,15 @@ class AutoClicker:
         self.milliseconds = 100
         
         self.setup_gui()
+        self.startup.mark("gui")
         self.load_config()
-        self.setup_keyboard_listener()
+        self.startup.mark("config")
+        # The engine, input backends, hooks and heavy modules wait until the window is mapped (or the first idle time when starting hidden).
+        if self.root.state() == "normal": self.root.bind("<Map>", self.on_mapped)
+        else: self.root.after_idle(lambda: self.on_started("ready (hidden)"))
+        # Sent by the Settings window after it saves the config file.
+        self.root.bind("<<SettingsSaved>>", self.on_settings_saved)
+        self.root.bind("<<RecalibrateInput>>", self.recalibrate_input)
 
     def setup_gui(self):
         # Report button.
@@ -74,8 +166,8 @@ class AutoClicker:
             import webbrowser
             webbrowser.open("https://github.com/FJRG2007/smart-auto-clicker/issues/new")
         try:
-            image = Image.open(globals.app_report_icon_path)
-            report_icon = ImageTk.PhotoImage(image)
+            # Tk reads the PNG itself, so Pillow is not loaded for the main window.
+            report_icon = tk.PhotoImage(file=globals.app_report_icon_path)
             report_button = ttk.Button(menu_frame, text="Report Error", image=report_icon, compound="left", command=open_error_report)
             report_button.image = report_icon
         except Exception as e:
@@ -84,7 +176,7 @@ class AutoClicker:
 
         # Simulate game button.
         simulate_button = ttk.Button(menu_frame, text="Simulate Playing")
-        self.game_simulator = GameSimulator(self.root, simulate_button)
+        self.game_simulator = GameSimulator(self.root, simulate_button, self.input_backend)
 
         # Settings button.
         settings_button = ttk.Button(menu_frame, text="Open Settings", command=self.windows_manager.open_config_window)
@@ -119,6 +211,7 @@ class AutoClicker:
         self.hours_entry = ttk.Entry(hours_frame, width=5)
         self.hours_entry.insert(0, "0")
         self.hours_entry.pack()
+        self.hours_entry.bind("<KeyRelease>", self.invalidate_click_job)
         
         # Minutes.
         minutes_frame = ttk.Frame(time_frame)
@@ -127,6 +220,7 @@ class AutoClicker:
         self.minutes_entry = ttk.Entry(minutes_frame, width=5)
         self.minutes_entry.insert(0, "0")
         self.minutes_entry.pack()
+        self.minutes_entry.bind("<KeyRelease>", self.invalidate_click_job)
         
         # Seconds.
         seconds_frame = ttk.Frame(time_frame)
@@ -135,6 +229,7 @@ class AutoClicker:
         self.seconds_entry = ttk.Entry(seconds_frame, width=5)
         self.seconds_entry.insert(0, "0")
         self.seconds_entry.pack()
+        self.seconds_entry.bind("<KeyRelease>", self.invalidate_click_job)
         
         # Milliseconds.
         ms_frame = ttk.Frame(time_frame)
@@ -143,6 +238,63 @@ class AutoClicker:
         self.ms_entry = ttk.Entry(ms_frame, width=5)
         self.ms_entry.insert(0, "100")
         self.ms_entry.pack()
+        self.ms_entry.bind("<KeyRelease>", self.invalidate_click_job)
+
+        # Overrun policy (what to do when a click runs past its deadline).
+        overrun_frame = ttk.Frame(interval_frame)
+        overrun_frame.pack(fill="x", padx=5)
+        ttk.Label(overrun_frame, text="If late:").pack(side=tk.LEFT, padx=5)
+        self.overrun_var = tk.StringVar(value="skip")
+        overrun_options = [
+            ("Skip missed", "skip"),
+            ("Catch up", "catch_up"),
+            ("Re-anchor", "reanchor")
+        ]
+        for text, value in overrun_options:
+            ttk.Radiobutton(
+                overrun_frame,
+                text=text,
+                variable=self.overrun_var,
+                value=value,
+                command=self.change_overrun_policy
+            ).pack(side=tk.LEFT, padx=3)
+
+        # High-rate mode (sub-100 ms intervals).
+        self.high_rate_var = tk.BooleanVar(value=False)
+        high_rate_frame = ttk.Frame(interval_frame)
+        high_rate_frame.pack(fill="x", padx=5)
+        ttk.Checkbutton(
+            high_rate_frame,
+            text="High-rate mode (down to 1 ms)",
+            variable=self.high_rate_var,
+            command=self.toggle_high_rate
+        ).pack(side=tk.LEFT)
+
+        # Clicks sent together on each tick (batched into one SendInput call with native input).
+        ttk.Label(high_rate_frame, text="Clicks/tick:").pack(side=tk.LEFT, padx=(10, 2))
+        self.clicks_per_tick_entry = ttk.Spinbox(high_rate_frame, from_=1, to=100, width=4, command=self.invalidate_click_job)
+        self.clicks_per_tick_entry.set("1")
+        self.clicks_per_tick_entry.pack(side=tk.LEFT)
+        self.clicks_per_tick_entry.bind("<KeyRelease>", self.invalidate_click_job)
+
+        # Timing precision (accuracy vs CPU usage).
+        precision_frame = ttk.Frame(interval_frame)
+        precision_frame.pack(fill="x", padx=5)
+        ttk.Label(precision_frame, text="Precision:").pack(side=tk.LEFT, padx=5)
+        self.precision_var = tk.StringVar(value="balanced")
+        precision_options = [
+            ("Efficient", "efficient"),
+            ("Balanced", "balanced"),
+            ("Precise", "precise")
+        ]
+        for text, value in precision_options:
+            ttk.Radiobutton(
+                precision_frame,
+                text=text,
+                variable=self.precision_var,
+                value=value,
+                command=self.change_timing_precision
+            ).pack(side=tk.LEFT, padx=3)
         
         # Click mode settings.
         click_mode_frame = ttk.LabelFrame(self.root, text="Click Mode Settings", padding=10)
@@ -159,11 +311,22 @@ class AutoClicker:
         self.hold_entry = ttk.Entry(self.hold_frame, width=8)
         self.hold_entry.insert(0, "0.1")
         self.hold_entry.pack(side=tk.LEFT, padx=5)
+        self.hold_entry.bind("<KeyRelease>", self.invalidate_click_job)
 
         # Add explanatory note.
         self.hold_note = ttk.Label(self.hold_frame, text="Set to 0 for infinite hold.", font=("Arial", 8), foreground="gray")
         self.hold_note.pack(side=tk.LEFT, padx=5)
 
+        # Press duration section (single clicks; the release is scheduled, not slept).
+        self.press_frame = ttk.Frame(click_mode_frame)
+        ttk.Label(self.press_frame, text="Press Duration (ms):").pack(side=tk.LEFT, padx=5)
+        self.press_entry = ttk.Entry(self.press_frame, width=8)
+        self.press_entry.insert(0, "20")
+        self.press_entry.pack(side=tk.LEFT, padx=5)
+        self.press_entry.bind("<KeyRelease>", self.invalidate_click_job)
+        ttk.Label(self.press_frame, text="0 sends down and up together.", font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=5)
+        self.press_frame.pack()
+
         # Anti-Detection Bypass Settings.
         bypass_frame = ttk.LabelFrame(self.root, text="Anti-Detection Bypass", padding=10)
         bypass_frame.pack(fill="x", padx=10, pady=5)
@@ -238,6 +401,7 @@ class AutoClicker:
             command=self.toggle_native_input
         )
         self.native_checkbox.pack(side=tk.LEFT)
+        if not self.native_available: self.native_checkbox.state(["disabled"])
 
         # Input method selector.
         self.native_method_frame = ttk.Frame(native_frame)
@@ -263,11 +427,10 @@ class AutoClicker:
         # Native input info.
         self.native_info_frame = ttk.Frame(native_frame)
 
-        # Check if interception is available.
-        interception_status = "Available" if self.native_input.is_interception_available() else "Not installed"
+        # Interception availability (known once the native input is calibrated).
         self.native_status_label = ttk.Label(
             self.native_info_frame,
-            text=f"Low-level input for anti-cheat games | Interception: {interception_status}",
+            text=self.get_native_status(),
             font=("Arial", 8),
             foreground="gray"
         )
@@ -275,7 +438,7 @@ class AutoClicker:
 
         self.native_method_label = ttk.Label(
             self.native_info_frame,
-            text=f"Active: {self.native_input.get_method_name()}",
+            text="",
             font=("Arial", 8),
             foreground="green"
         )
@@ -311,6 +474,12 @@ class AutoClicker:
         self.position_label.pack()
         self.set_position_button = ttk.Button(self.position_frame, text="Set Position", command=self.set_position)
         self.set_position_button.pack()
+        self.target_label = ttk.Label(self.position_frame, text="Target image: none", font=("Arial", 8), foreground="gray")
+        self.target_label.pack()
+        target_buttons = ttk.Frame(self.position_frame)
+        target_buttons.pack()
+        ttk.Button(target_buttons, text="Choose Image...", command=self.choose_target_image).pack(side=tk.LEFT, padx=2)
+        ttk.Button(target_buttons, text="Clear", command=lambda: self.set_target_image("")).pack(side=tk.LEFT, padx=2)
         
         # Status.
         status_frame = ttk.LabelFrame(self.root, text="Status", padding=10)
@@ -319,16 +488,34 @@ class AutoClicker:
         self.status_label = ttk.Label(status_frame, text="Status: Stopped")
         self.status_label.pack()
 
+        # Achieved versus requested timing (shows during runtime).
+        self.timing_stats_label = ttk.Label(status_frame, text="", font=("Arial", 8), foreground="blue")
+        self.timing_stats_label.pack()
+
+        # Profiler state (shows while profiling and after a profile is saved).
+        self.profiler_label = ttk.Label(status_frame, text="", font=("Arial", 8), foreground="gray")
+        self.profiler_label.pack()
+
         self.trigger_label = ttk.Label(status_frame, text=f"Press ({self.trigger_key}) to start/stop")
         self.trigger_label.pack()
 
         self.start_stop_button = ttk.Button(status_frame, text="Start", command=self.toggle_clicking)
         self.start_stop_button.pack()
 
+        ttk.Button(status_frame, text="Manage Jobs", command=lambda: self.windows_manager.open_jobs_window(self)).pack(pady=(5, 0))
+        ttk.Button(status_frame, text="Macros", command=lambda: self.windows_manager.open_macro_window(self)).pack(pady=(5, 0))
+        ttk.Button(status_frame, text="Conditions", command=lambda: self.windows_manager.open_condition_window(self)).pack(pady=(5, 0))
+        ttk.Button(status_frame, text="Presets", command=lambda: self.windows_manager.open_presets_window(self)).pack(pady=(5, 0))
+
     def toggle_mode(self):
         self.hold_mode = self.mode_var.get()
-        if self.hold_mode: self.hold_frame.pack()
-        else: self.hold_frame.pack_forget()
+        if self.hold_mode:
+            self.press_frame.pack_forget()
+            self.hold_frame.pack()
+        else:
+            self.hold_frame.pack_forget()
+            self.press_frame.pack()
+        self.invalidate_click_job()
 
     def toggle_bypass(self):
         """Toggle anti-detection bypass mode."""
@@ -349,18 +536,13 @@ class AutoClicker:
             self.bypass_profile_frame.pack_forget()
             self.bypass_info_frame.pack_forget()
             self.bypass_stats_label.config(text="")
+        self.invalidate_click_job()
 
     def change_bypass_profile(self):
         """Change the bypass profile."""
-        profile_map = {
-            "light": BypassProfile.LIGHT,
-            "moderate": BypassProfile.MODERATE,
-            "aggressive": BypassProfile.AGGRESSIVE,
-            "adaptive": BypassProfile.ADAPTIVE
-        }
         profile_name = self.profile_var.get()
-        self.bypass_profile = profile_map.get(profile_name, BypassProfile.MODERATE)
-        self.bypass_system = AntiDetectionBypass(self.bypass_profile)
+        self.bypass_system = self.get_bypass_system(profile_name)
+        self.bypass_profile = self.bypass_system.profile
 
         profile_descriptions = {
             "light": "Light: Minimal variation, faster but less safe",
@@ -370,13 +552,74 @@ class AutoClicker:
         }
         desc = profile_descriptions.get(profile_name, "")
         self.bypass_status_label.config(text=desc)
+        self.invalidate_click_job()
+
+    def get_bypass_system(self, profile_name):
+        """Bypass system of a profile for the main job, created once."""
+        try: profile = BypassProfile(profile_name)
+        except ValueError: profile = BypassProfile.MODERATE
+        if profile not in self.bypass_systems: self.bypass_systems[profile] = AntiDetectionBypass(profile)
+        return self.bypass_systems[profile]
+
+    def new_bypass_system(self, profile_name):
+        """Separate bypass system for a job humanizing independently of the main job."""
+        try: profile = BypassProfile(profile_name)
+        except ValueError: profile = BypassProfile.MODERATE
+        return AntiDetectionBypass(profile)
+
+    def change_overrun_policy(self):
+        """Change what the scheduler does with ticks that run late."""
+        try: self.overrun_policy = OverrunPolicy(self.overrun_var.get())
+        except ValueError: self.overrun_policy = OverrunPolicy.SKIP
+        self.invalidate_click_job()
+
+    def toggle_high_rate(self):
+        """Toggle high-rate mode (1 ms minimum interval, exact timing)."""
+        self.high_rate_mode = self.high_rate_var.get()
+        # Sub-millisecond holds need the spinning sleeper to be meaningful.
+        if self.high_rate_mode and self.precision_var.get() == "efficient":
+            self.precision_var.set("precise")
+            self.change_timing_precision()
+        self.invalidate_click_job()
+
+    def change_timing_precision(self):
+        """Change the accuracy-vs-CPU trade-off of the timing engine."""
+        try: self.timing_precision = TimingPrecision(self.precision_var.get())
+        except ValueError: self.timing_precision = TimingPrecision.BALANCED
+        self.sleeper = get_sleeper(self.timing_precision)
+        if self.engine is not None: self.engine.sleeper = self.sleeper
+        self.invalidate_click_job()
+
+    def update_timing_stats(self):
+        """Update the achieved versus requested interval display."""
+        if self.is_running and self.main_job:
+            stats = self.main_job.get_stats()
+            if stats.ticks > 1:
+                metrics = self.main_job.metrics
+                errors = f" | Failed: {metrics.failed}" if metrics.failed else ""
+                self.timing_stats_label.config(
+                    text=f"Rate: {stats.achieved_rate:.2f}/s of {stats.requested_rate:.2f}/s | "
+                         f"Interval: {stats.achieved_interval * 1000:.1f} ms of {stats.requested_interval * 1000:.1f} ms\n"
+                         f"Late: {stats.overruns} (p99 {metrics.lateness.percentile(0.99) * 1000:.2f} ms) | "
+                         f"Skipped: {stats.skipped_ticks} | "
+                         f"Inject p99: {metrics.injection.percentile(0.99) * 1e6:.0f} us{errors}"
+                )
+            self.root.after(1000, self.update_timing_stats)
+
+    def export_metrics(self):
+        """Rewrite the metrics JSON/Prometheus files for monitoring."""
+        if not self.metrics_export_interval: return
+        self.metrics_exporter.export(list(self.engine.jobs), {"timestamp": time.time()})
+        self.root.after(int(self.metrics_export_interval * 1000), self.export_metrics)
 
     def update_bypass_stats(self):
         """Update bypass statistics display."""
         if self.bypass_enabled and self.is_running:
             stats = self.bypass_system.get_stats()
             risk_level = "Low" if stats['detection_risk'] < 0.3 else "Medium" if stats['detection_risk'] < 0.6 else "High"
-            stats_text = f"Clicks: {stats['click_count']} | Fatigue: {stats['fatigue_level']:.1%} | Risk: {risk_level}"
+            # Delays are precomputed, so count the clicks actually fired.
+            clicks = self.main_job.get_stats().ticks if self.main_job else 0
+            stats_text = f"Clicks: {clicks} | Fatigue: {stats['fatigue_level']:.1%} | Risk: {risk_level}"
             self.bypass_stats_label.config(text=stats_text)
             if self.is_running:
                 self.root.after(1000, self.update_bypass_stats)
@@ -389,44 +632,321 @@ class AutoClicker:
         if self.use_native_input:
             self.native_method_frame.pack(fill="x", pady=5)
             self.native_info_frame.pack(fill="x")
-            self.native_method_label.config(text=f"Active: {self.native_input.get_method_name()}")
+            self.native_method_label.config(text=f"Active: {self.get_native_method_name()}")
+            self.native_status_label.config(text=self.get_native_status())
         else:
             self.native_method_frame.pack_forget()
             self.native_info_frame.pack_forget()
+        self.invalidate_click_job()
 
     def change_input_method(self):
-        """Change the native input method."""
-        method_map = {
-            "auto": InputMethod.AUTO,
-            "sendinput": InputMethod.SENDINPUT,
-            "mouse_event": InputMethod.MOUSE_EVENT,
-        }
-        method_name = self.input_method_var.get()
-        method = method_map.get(method_name, InputMethod.AUTO)
-
-        # Recreate native input with new method.
-        self.native_input = NativeInput(method)
-        self.native_method_label.config(text=f"Active: {self.native_input.get_method_name()}")
-
-    def get_interval(self):
+        """Change the native input method (its backend is created once and reused)."""
+        if not self.native_available: return
+        # The native input is only created once it is enabled.
+        if self.use_native_input: self.native_method_label.config(text=f"Active: {self.get_native_method_name()}")
+        self.invalidate_click_job()
+
+    def get_native_input(self):
+        """Native input, created on first use with the fastest calibrated method (None if unavailable)."""
+        if self.native_input is None and self.native_available:
+            from src.clickers.backends import NATIVE_METHODS
+            preferred = self.backend_registry.best(NATIVE_METHODS)
+            self.native_input = get_native_input(InputMethod(preferred) if preferred else None)
+            self.native_input.set_batch_size(self.sendinput_batch_size)
+        return self.native_input
+
+    def get_native_backend(self, method_name):
+        """Native backend of an input method; every method shares the one driver context."""
+        native_input = self.get_native_input()
+        if native_input is None: return None
+        if method_name not in self.native_backends:
+            from src.clickers.backends import WindowsBackend
+            method = self.INPUT_METHODS.get(method_name, InputMethod.AUTO)
+            self.native_backends[method_name] = WindowsBackend(native_input.for_method(method))
+        return self.native_backends[method_name]
+
+    def get_native_status(self):
+        if not self.native_available: interception_status = "Windows only"
+        else:
+            result = self.backend_registry.results.get("interception") if self.backend_registry else None
+            if result is None: interception_status = "Checked on first use"
+            else: interception_status = "Available" if result.working else "Not installed"
+        return f"Low-level input for anti-cheat games | Interception: {interception_status}"
+
+    def recalibrate_input(self, event=None):
+        """Probe every input backend again on a worker thread, then switch to the fastest ones."""
+        if self.calibrating or self.backend_registry is None: return
+        from src.clickers.backends import BackendRegistry
+        self.calibrating = True
+        self.native_status_label.config(text="Calibrating input backends...")
+        # A separate registry, so the Tk thread never reads one being probed.
+        registry = BackendRegistry(self.backend_registry.cache_path)
+        def calibrate():
+            registry.clear()
+            results = registry.calibrate()
+            self.root.after(0, lambda: self.on_calibrated(registry, results))
+        Thread(target=calibrate, name="Calibration", daemon=True).start()
+
+    def on_calibrated(self, registry, results):
+        self.calibrating = False
+        self.backend_registry = registry
+        if self.native_input is not None:
+            from src.clickers.backends import NATIVE_METHODS
+            preferred = registry.best(NATIVE_METHODS)
+            if preferred: self.native_input.prefer(InputMethod(preferred))
+        # Also recompiles the jobs, so they use the fastest backends.
+        self.set_input_backend(self.input_backend_name, reload=True)
+        if self.native_input is not None and self.use_native_input: self.native_method_label.config(text=f"Active: {self.get_native_method_name()}")
+        self.native_status_label.config(text=self.get_native_status())
+        lines = []
+        for name, result in results.items():
+            if result.working: lines.append(f"{name}: {result.latency * 1e6:.0f} us/event, {result.throughput:,.0f} events/s")
+            else: lines.append(f"{name}: not working ({result.error})")
+        messagebox.showinfo("Input calibration", "\n".join(lines) or "No input backend on this system.")
+
+    def get_native_method_name(self):
+        # The native input follows the calibration, read once the window is shown.
+        if self.backend_registry is None: return "checked once started"
+        backend = self.get_native_backend(self.input_method_var.get())
+        return backend.native_input.get_method_name() if backend else "unavailable"
+
+    def set_input_backend(self, name, reload=False):
+        """Switch the default (non-native) input backend ("auto" = fastest calibrated one)."""
+        if name == self.input_backend_name and not reload: return
+        # Before start_services, only the choice is kept.
+        if self.input_backend is None:
+            self.input_backend_name = name
+            return
+        from src.clickers.backends import BackendError, create_backend
+        try: backend = create_backend(name, registry=self.backend_registry)
+        except BackendError as e:
+            print(f"Input backend '{name}' not available: {e}")
+            return
+        old_backend = self.input_backend
+        self.input_backend_name = name
+        self.input_backend = backend
+        self.traced_backends.clear()
+        self.game_simulator.backend = backend
+        self.refresh_presets()
+        self.invalidate_click_job()
+        self.rebind_jobs()
+        # Closed on the engine thread once the jobs have left it (commands run in order).
+        self.engine.call_soon(old_backend.close)
+
+    def rebind_jobs(self):
+        """Move the engine jobs to the current backends: the main and extra jobs are recompiled, a macro stops."""
+        if self.is_running and self.main_job is not None:
+            job = self.build_click_job(show_errors=False)
+            if job is None: self.toggle_clicking()
+            else:
+                self.main_job.set_program(self.compile_program(job))
+                from src.clickers.engine import JobState
+                # A press held until stopped is released by the swap: press it again through the new backend.
+                if job.holds_forever and self.main_job.state == JobState.RUNNING: self.main_job.start()
+        for handle in self.extra_jobs: handle.set_program(self.compile_program(handle.job, self.new_bypass_system(handle.job.bypass_profile)))
+        if self.macro_job is not None: self.macro_job.stop()
+
+    def get_backend(self, job):
+        """Input backend a job is injected through."""
+        return self.get_input_backend(job.use_native_input, job.input_method)
+
+    def get_input_backend(self, use_native_input, input_method=None):
+        """Native (of the given or selected method) or default input backend, traced when tracing is on."""
+        native_backend = self.get_native_backend(input_method or self.input_method_var.get()) if use_native_input else None
+        backend = native_backend or self.input_backend
+        if self.trace_recorder is None: return backend
+        # Trace through a wrapper, stamped with the engine deadline being fired.
+        if backend not in self.traced_backends:
+            from src.clickers.backends import TracingBackend
+            self.traced_backends[backend] = TracingBackend(backend, self.trace_recorder, lambda: self.engine.deadline, self.engine.clock)
+        return self.traced_backends[backend]
+
+    def start_trace(self):
+        """Open the input trace ring file in the config directory."""
+        if self.trace_recorder is not None: return
+        from src.utils.trace import DEFAULT_CAPACITY, TraceRecorder
+        try: self.trace_recorder = TraceRecorder(os.path.join(globals.app_config_path, "input.trace"), self.trace_capacity or DEFAULT_CAPACITY)
+        except (OSError, ValueError) as e: print(f"Could not open the input trace: {e}")
+        self.refresh_presets()
+        self.invalidate_click_job()
+
+    def invalidate_click_job(self, event=None):
+        """Drop the cached job snapshot after a setting changed."""
+        self.click_job = None
+        # A running loop keeps its program until the new settings are valid.
+        if self.is_running: self.root.after_idle(self.refresh_running_job)
+
+    def build_click_job(self, show_errors=True):
+        """Snapshot and validate the current settings (Tk thread only)."""
+        if self.click_job is not None: return self.click_job
+        from src.vision import LocatorError
         try:
-            hours = int(self.hours_entry.get())
-            minutes = int(self.minutes_entry.get())
-            seconds = int(self.seconds_entry.get())
-            milliseconds = int(self.ms_entry.get())
-            total_seconds = (hours * 3600) + (minutes * 60) + seconds + (milliseconds / 1000)
-            if total_seconds < 0.1:
-                messagebox.showwarning("Warning", "Total interval must be at least 0.1 seconds")
-                return None  
-            return total_seconds
-        except ValueError:
-            messagebox.showerror("Error", "Invalid time values")
+            self.click_job = ClickJob.from_settings(
+                hours=self.hours_entry.get(),
+                minutes=self.minutes_entry.get(),
+                seconds=self.seconds_entry.get(),
+                milliseconds=self.ms_entry.get(),
+                hold_duration=self.hold_entry.get(),
+                press_ms=self.press_entry.get(),
+                click_key=self.click_key,
+                hold_mode=self.hold_mode,
+                use_current_pos=self.use_current_pos,
+                click_pos=self.click_pos,
+                use_native_input=self.use_native_input,
+                input_method=self.input_method_var.get(),
+                bypass_enabled=self.bypass_enabled,
+                bypass_profile=self.profile_var.get(),
+                high_rate=self.high_rate_mode,
+                clicks_per_tick=self.clicks_per_tick_entry.get(),
+                timing_precision=self.timing_precision,
+                overrun_policy=self.overrun_policy,
+                seed=self.seed,
+                target_image=self.target_image
+            )
+            if self.click_job.target_image and not self.click_job.use_current_pos: self.get_locator(self.click_job.target_image)
+        except (ClickJobError, LocatorError) as e:
+            self.click_job = None
+            if show_errors: messagebox.showwarning("Warning", str(e))
             return None
+        return self.click_job
+
+    def compile_program(self, job, bypass_system=None):
+        """Compile a job into the program run by the click engine."""
+        bypass_system = bypass_system or self.get_bypass_system(job.bypass_profile)
+        backend = self.get_backend(job)
+        # One set of seeded streams per compile, shared by the timing and the mouse moves.
+        rng = JobRandom(job.seed)
+        # High-rate jobs inject the whole path to a fixed position in one batch.
+        move_to = compile_move(backend, bypass_system if job.bypass_enabled else None, rng.movement, batched=job.high_rate)
+        locate = None
+        if job.target_image and not job.use_current_pos:
+            from src.vision import LocatorError
+            try: locate = self.get_locator(job.target_image)
+            except LocatorError as e:
+                # Never fall back to the fixed position: the job clicks nothing.
+                print(f"Target image unusable: {e}")
+                locate = lambda: None
+        return compile_program(job, backend, bypass_system, move_to, rng, locate)
+
+    def get_locator(self, path):
+        """Locator of a target image, shared by the jobs using it (raises LocatorError)."""
+        from src.vision import TemplateLocator
+        if path not in self.locators: self.locators[path] = TemplateLocator(path)
+        return self.locators[path]
+
+    def refresh_running_job(self):
+        """Swap in a new program if the settings changed while running."""
+        if not self.is_running or self.main_job is None: return
+        job = self.build_click_job(show_errors=False)
+        if job is None or job == self.main_job.job: return
+        # Switching to or from an infinite hold needs a restart of the job.
+        if job.holds_forever != self.main_job.job.holds_forever: return
+        self.main_job.set_program(self.compile_program(job))
+
+    def compile_preset(self, job):
+        # Presets follow the run's seed, like the settings in the window. Each one gets its own
+        # bypass state: compiling against the main job's would advance its fatigue and reseed its streams.
+        return self.compile_program(replace(job, seed=self.seed), self.new_bypass_system(job.bypass_profile))
+
+    def refresh_presets(self):
+        """Recompile the preset programs of a running job after a backend changed."""
+        if self.is_running: self.presets.compile_all()
+        else: self.presets.clear_programs()
+
+    def save_preset(self, name, hotkey=""):
+        """Save the current settings as a preset; returns an error message or None."""
+        name, hotkey = name.strip(), hotkey.strip().lower()
+        if not name: return "Enter a preset name."
+        if hotkey:
+            import keyboard
+            try: keyboard.parse_hotkey(hotkey)
+            except ValueError as e: return f"Invalid hotkey '{hotkey}': {e}"
+        job = self.build_click_job()
+        if job is None: return "The current settings are not valid."
+        from src.clickers.presets import Preset
+        self.presets.add(Preset(name, job, hotkey))
+        self.active_preset = name
+        self.reset_keyboard_listener()
+        return None
+
+    def delete_preset(self, name):
+        self.presets.remove(name)
+        if self.active_preset == name: self.active_preset = None
+        self.reset_keyboard_listener()
+
+    def switch_preset(self, name):
+        """Switch the main job to a preset (hotkey thread or Tk thread)."""
+        preset = self.presets.get(name)
+        if preset is None: return
+        # Only the precompiled program is swapped here; the window follows on the Tk thread.
+        if self.is_running and self.main_job is not None: self.presets.switch(name, self.main_job)
+        self.root.after(0, lambda: self.show_preset(name))
+
+    def show_preset(self, name):
+        """Load a preset's settings into the window (Tk thread)."""
+        preset = self.presets.get(name)
+        if preset is None: return
+        program = self.presets.programs.get(name)
+        self.active_preset = name
+        self.show_job(program.job if program is not None else replace(preset.job, seed=self.seed))
+        # Switched before it was compiled (e.g. just started): apply the settings the usual way.
+        if program is None: self.invalidate_click_job()
+
+    def show_job(self, job):
+        """Show the settings of a job in the window; the job becomes the current snapshot."""
+        total_ms = round(job.interval * 1000)
+        parts = (total_ms // 3600000, total_ms // 60000 % 60, total_ms // 1000 % 60, total_ms % 1000)
+        for entry, value in zip((self.hours_entry, self.minutes_entry, self.seconds_entry, self.ms_entry), parts):
+            entry.delete(0, tk.END)
+            entry.insert(0, str(value))
+        self.click_key = job.click_key
+        self.click_key_button.config(text=f"Current: {self.click_key}")
+        self.click_pos = job.click_pos
+        self.position_label.config(text=f"Current: {self.click_pos}")
+        self.pos_var.set(job.use_current_pos)
+        self.toggle_position()
+        self.set_target_image(job.target_image)
+        self.hold_entry.delete(0, tk.END)
+        self.hold_entry.insert(0, f"{job.hold_duration:g}")
+        self.press_entry.delete(0, tk.END)
+        self.press_entry.insert(0, f"{job.press_duration * 1000:g}")
+        self.mode_var.set(job.hold_mode)
+        self.toggle_mode()
+        self.profile_var.set(job.bypass_profile)
+        self.change_bypass_profile()
+        self.bypass_var.set(job.bypass_enabled)
+        self.toggle_bypass()
+        self.input_method_var.set(job.input_method)
+        self.change_input_method()
+        self.native_var.set(job.use_native_input)
+        self.toggle_native_input()
+        self.overrun_var.set(job.overrun_policy.value)
+        self.change_overrun_policy()
+        self.precision_var.set(job.timing_precision.value)
+        self.change_timing_precision()
+        self.high_rate_var.set(job.high_rate)
+        self.toggle_high_rate()
+        self.clicks_per_tick_entry.set(str(job.clicks_per_tick))
+        # The widgets now match the job: the pending refresh keeps the swapped program.
+        self.click_job = job
+
+    def add_extra_job(self, job, name=None):
+        """Register an additional job on the shared engine (stopped)."""
+        # Each job humanizes independently, so it gets its own bypass state.
+        handle = self.engine.add_job(name or f"Job {len(self.extra_jobs) + 1}", self.compile_program(job, self.new_bypass_system(job.bypass_profile)))
+        self.extra_jobs.append(handle)
+        return handle
+
+    def remove_extra_job(self, handle):
+        """Stop and forget an additional job."""
+        self.engine.remove_job(handle)
+        if handle in self.extra_jobs: self.extra_jobs.remove(handle)
 
     def record_trigger_key(self):
         if not self.recording_click:
             self.recording_click = True
             self.trigger_button.config(text="Press F1-F12...")
+            import keyboard
             def on_key(event):
                 if event.name.upper().startswith("F"):
                     try:
@@ -438,232 +958,344 @@ class AutoClicker:
                             self.trigger_label.config(text=f"Press ({self.trigger_key}) to start/stop")
                             self.recording_click = False
                             self.save_config()
-                            unhook_all()
-                            self.setup_keyboard_listener()
+                            self.reset_keyboard_listener()
                     except ValueError: pass
-            hook(on_key)
+            keyboard.hook(on_key)
 
     def set_mouse_button(self, button):
         self.click_key = button
         self.click_key_button.config(text=f"Current: {button} mouse button")
+        self.invalidate_click_job()
         
     def record_click_key(self):
         if not self.recording_click:
             self.recording_click = True
             self.click_key_button.config(text="Press any key...")
+            import keyboard
             def on_key(event):
                 if event.name.upper() != self.trigger_key:
                     self.click_key = event.name
                     self.click_key_button.config(text=f"Current: {event.name}")
                     self.recording_click = False
-                    unhook_all()
-                    self.setup_keyboard_listener()
-            hook(on_key)
+                    self.invalidate_click_job()
+                    self.reset_keyboard_listener()
+            keyboard.hook(on_key)
         
     def toggle_position(self):
         self.use_current_pos = self.pos_var.get()
         if self.use_current_pos: self.position_frame.pack_forget()
         else: self.position_frame.pack()
+        self.invalidate_click_job()
             
-    def set_position(self):
+    def pick_cursor_position(self):
         self.root.iconify() # Minimize window.
         time.sleep(2) # Give time to position cursor.
-        self.click_pos = mouse.get_position()
-        self.position_label.config(text=f"Current: {self.click_pos}")
+        position = self.input_backend.get_position()
         self.root.deiconify() # Restore window.
+        return position
+
+    def set_position(self):
+        self.click_pos = self.pick_cursor_position()
+        self.position_label.config(text=f"Current: {self.click_pos}")
+        self.invalidate_click_job()
+
+    def choose_target_image(self):
+        path = filedialog.askopenfilename(title="Target image", filetypes=[("Images", "*.png *.bmp *.jpg *.jpeg"), ("All files", "*.*")])
+        if not path: return
+        from src.vision import LocatorError
+        try: self.get_locator(path)
+        except LocatorError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+        self.set_target_image(path)
+
+    def set_target_image(self, path):
+        """Click the center of `path` on screen instead of the fixed position ("" = fixed position)."""
+        self.target_image = path
+        if path: self.target_label.config(text=f"Target image: {os.path.basename(path)}", foreground="black")
+        else: self.target_label.config(text="Target image: none", foreground="gray")
+        self.invalidate_click_job()
         
     def setup_keyboard_listener(self):
+        # Loaded once the window is shown (see on_started).
+        import keyboard
         keyboard.on_press_key(self.trigger_key, lambda e: self.start_stop_listener(e), suppress=True)
+        keyboard.on_press_key(self.macro_record_key, lambda e: self.root.after(0, self.toggle_macro_recording), suppress=True)
+        if self.profiler_hotkey_enabled:
+            try: keyboard.add_hotkey(self.profiler_hotkey, lambda: self.root.after(0, self.toggle_profiler))
+            except ValueError as e: print(f"Invalid profiler hotkey '{self.profiler_hotkey}': {e}")
+        # Preset hotkeys switch right from the hook thread.
+        for preset in self.presets:
+            if not preset.hotkey: continue
+            try: keyboard.add_hotkey(preset.hotkey, lambda name=preset.name: self.switch_preset(name))
+            except ValueError as e: print(f"Invalid hotkey '{preset.hotkey}' of preset '{preset.name}': {e}")
+
+    def on_mapped(self, event):
+        # The children's <Map> events reach the root binding too.
+        if event.widget is not self.root: return
+        self.root.unbind("<Map>")
+        self.on_started()
+
+    def on_started(self, phase="window shown"):
+        """Finish starting once the window is shown: engine and input backends, keyboard hooks, then preloading off the Tk thread."""
+        self.startup.mark(phase)
+        # Paint the window first: a first launch calibrates the input backends.
+        self.root.update_idletasks()
+        self.start_services()
+        self.startup.mark("services")
+        self.setup_keyboard_listener()
+        self.startup.mark("hooks")
+        # The first Start needs NumPy (and a target image the vision modules): import them now, off the Tk thread.
+        preload("numpy", "src.vision")
+        self.startup.finish(globals.app_config_path)
+
+    def start_services(self):
+        """Create what the window does not need: the engine, input backends, saved presets and jobs, metrics export."""
+        from src.clickers.engine import ClickEngine
+        from src.clickers.presets import Preset, PresetBank
+        from src.clickers.backends import CALIBRATION_FILE_NAME, BackendError, BackendRegistry, RecordingBackend, create_backend
+        from src.macros import MacroTimeline
+        from src.utils.metrics import MetricsExporter
+        from src.utils.profiler import ClickThreadProfiler
+        self.engine = ClickEngine(self.sleeper)
+        self.metrics_exporter = MetricsExporter(globals.app_config_path)
+        self.profiler = ClickThreadProfiler(self.engine, globals.app_config_path, self.on_profile_saved)
+        self.macro = MacroTimeline()
+        self.presets = PresetBank(self.compile_preset)
+
+        # Probed on the first launch (or with --recalibrate), read from the cache afterwards.
+        self.backend_registry = BackendRegistry(os.path.join(globals.app_config_path, CALIBRATION_FILE_NAME))
+        if self.recalibrate: self.backend_registry.clear()
+        try: self.input_backend = create_backend(self.input_backend_name, registry=self.backend_registry)
+        except BackendError as e:
+            print(f"Input backend '{self.input_backend_name}' not available: {e}")
+            try: self.input_backend = create_backend("auto", registry=self.backend_registry)
+            except BackendError as e:
+                # Nothing can inject (e.g. no X display and no root for the hook): start anyway, recording instead of clicking.
+                message = f"No input backend available, clicks are not sent:\n{e}"
+                print(message)
+                self.input_backend = RecordingBackend()
+                self.root.after_idle(lambda: messagebox.showerror("Error", message))
+            self.input_backend_name = "auto"
+        self.game_simulator.backend = self.input_backend
+        if self.use_native_input:
+            self.native_method_label.config(text=f"Active: {self.get_native_method_name()}")
+            self.native_status_label.config(text=self.get_native_status())
+        if self.trace_enabled: self.start_trace()
+
+        # Presets (their hotkeys are hooked by setup_keyboard_listener), then the additional jobs (they start stopped).
+        for saved_preset in self.saved_presets:
+            try: self.presets.add(Preset.from_dict(saved_preset))
+            except ClickJobError as e: print(f"Skipping saved preset: {e}")
+        for saved_job in self.saved_jobs:
+            try: self.add_extra_job(ClickJob.from_dict(saved_job), saved_job.get("name"))
+            except ClickJobError as e: print(f"Skipping saved job: {e}")
+        self.export_metrics()
+
+    def reset_keyboard_listener(self):
+        import keyboard
+        keyboard.unhook_all()
+        self.setup_keyboard_listener()
+
+    def on_settings_saved(self, event=None):
+        """Apply the settings saved from the Settings window."""
+        self.profiler_hotkey_enabled = Settings.get("profiler_hotkey_enabled", False)
+        self.profiler_hotkey = Settings.get("profiler_hotkey", "ctrl+alt+p")
+        if not self.profiler_hotkey_enabled and self.profiler.active: self.toggle_profiler()
+        self.reset_keyboard_listener()
+
+    def toggle_profiler(self):
+        """Start or stop profiling the click thread (Tk thread only)."""
+        if self.profiler.toggle(): self.profiler_label.config(text="Profiling click thread...", foreground="orange")
+        else: self.profiler_label.config(text="Saving profile...", foreground="gray")
+
+    def on_profile_saved(self, result):
+        # Called from the profile writer thread.
+        if isinstance(result, Exception): text, color = f"Profile not saved: {result}", "red"
+        else: text, color = f"Profile saved: {os.path.basename(result)}", "green"
+        self.root.after(0, lambda: self.profiler_label.config(text=text, foreground=color))
+
+    def toggle_macro_recording(self):
+        """Start recording a macro, or stop and keep the recorded one."""
+        if self.macro_recorder is not None and self.macro_recorder.recording:
+            self.macro = self.macro_recorder.stop()
+            if self.macro_recorder.dropped: print(f"Macro recording dropped {self.macro_recorder.dropped} events")
+            return
+        if self.macro_job is not None: self.macro_job.stop()
+        from src.macros import MacroError, MacroRecorder
+        self.macro_recorder = MacroRecorder(ignore_keys=(self.macro_record_key, self.trigger_key))
+        try: self.macro_recorder.start()
+        except MacroError as e: messagebox.showerror("Error", f"Cannot record macros:\n{e}")
+
+    def play_macro(self, speed=1.0, asap=False):
+        """Replay the recorded macro on the engine; returns an error message or None."""
+        if self.macro_recorder is not None and self.macro_recorder.recording: return "Stop recording first."
+        from src.macros import MacroError, compile_macro
+        try: program = compile_macro(self.macro, self.get_input_backend(self.use_native_input), speed, asap, self.use_native_input)
+        except MacroError as e: return str(e)
+        if self.macro_job is None: self.macro_job = self.engine.add_job("Macro", program)
+        else: self.macro_job.set_program(program)
+        self.macro_job.start()
+        return None
+
+    def stop_macro(self):
+        if self.macro_job is not None: self.macro_job.stop()
+
+    def save_macro_file(self, path):
+        """Write the current macro to a macro file; returns an error message or None."""
+        if not len(self.macro): return "There is no macro to save."
+        from src.macros import MacroError, save_macro
+        try: save_macro(self.macro, path)
+        except (OSError, MacroError) as e: return f"Cannot save the macro: {e}"
+        return None
+
+    def open_macro_file(self, path):
+        """Use a macro file as the current macro (streamed, not loaded); returns an error message or None."""
+        if self.macro_recorder is not None and self.macro_recorder.recording: return "Stop recording first."
+        from src.macros import MacroError, MacroFile
+        try: macro = MacroFile(path)
+        except (OSError, MacroError) as e: return f"Cannot open the macro: {e}"
+        # A playing replay keeps its own reference to the previous file.
+        self.stop_macro()
+        self.macro = macro
+        return None
+
+    def open_script_file(self, path):
+        """Load and validate a script; returns an error message or None."""
+        from src.macros import MacroError, load_script
+        try: self.script = load_script(path)
+        except MacroError as e: return f"Invalid script {os.path.basename(path)}:\n{e}"
+        self.script_path = path
+        return None
+
+    def play_script(self):
+        """Run the loaded script on the engine (same job as the macros); returns an error message or None."""
+        if self.script is None: return "No script loaded."
+        if self.macro_recorder is not None and self.macro_recorder.recording: return "Stop recording first."
+        from src.macros import MacroError, compile_script
+        try: program = compile_script(self.script, self.get_input_backend(self.use_native_input), self.use_native_input)
+        except MacroError as e: return str(e)
+        if self.macro_job is None: self.macro_job = self.engine.add_job("Macro", program)
+        else: self.macro_job.set_program(program)
+        self.macro_job.start()
+        return None
+
+    def start_watcher(self, rule, rate):
+        """Watch a screen region and drive the main job from it; returns an error message or None."""
+        self.stop_watcher()
+        from src.vision import ConditionWatcher, WatcherError
+        try: watcher = ConditionWatcher([rule], lambda action: self.root.after(0, lambda: self.apply_watch_action(action)), rate)
+        except WatcherError as e: return str(e)
+        self.watch_settings = {
+            "region": list(rule.condition.region),
+            "color": list(rule.condition.color) if rule.condition.color is not None else None,
+            "tolerance": rule.condition.tolerance,
+            "action": rule.action.value,
+            "rate": rate
+        }
+        self.watcher = watcher
+        watcher.start()
+        return None
+
+    def stop_watcher(self):
+        if self.watcher is None: return
+        self.watcher.stop()
+        # A job paused by the condition must not stay paused.
+        if self.is_running and self.main_job is not None: self.main_job.resume()
+        self.watcher = None
+
+    def apply_watch_action(self, action):
+        """Apply a watcher decision (Tk thread)."""
+        if self.watcher is None: return
+        if action == "start":
+            if not self.is_running: self.toggle_clicking()
+        elif action == "stop":
+            if self.is_running: self.toggle_clicking()
+        elif self.is_running and self.main_job is not None:
+            if action == "pause": self.main_job.pause()
+            else: self.main_job.resume()
+            self.status_label.config(text="Status: Paused (condition)" if action == "pause" else "Status: Running")
 
     def start_stop_listener(self, event):
-        if not self.recording_click: self.toggle_clicking()
+        # Called from the keyboard hook thread; widgets must be read on the Tk thread.
+        if not self.recording_click: self.root.after(0, self.toggle_clicking)
         
     def toggle_clicking(self):
         if not self.is_running:
-            interval = self.get_interval()
-            if interval is None: return
+            job = self.build_click_job()
+            if job is None: return
+            # Reset bypass system for new session (before delays are precomputed).
+            if self.bypass_enabled: self.bypass_system.reset_session()
+            program = self.compile_program(job)
             self.is_running = True
             self.status_label.config(text="Status: Running")
-            # Reset bypass system for new session.
-            if self.bypass_enabled:
-                self.bypass_system.reset_session()
-                self.update_bypass_stats()
-            self.click_thread = Thread(target=self.clicking_loop)
-            self.click_thread.daemon = True
-            self.click_thread.start()
+            if self.bypass_enabled: self.update_bypass_stats()
+            if self.main_job is None: self.main_job = self.engine.add_job("Main", program)
+            else: self.main_job.set_program(program)
+            # Built once per run, so hotkeys only swap programs.
+            self.presets.compile_all()
+            self.main_job.start()
+            if self.watcher is not None and not self.watcher.gate_open:
+                self.main_job.pause()
+                self.status_label.config(text="Status: Paused (condition)")
+            self.root.after(1000, self.update_timing_stats)
         else:
             self.is_running = False
+            if self.main_job: self.main_job.stop()
+            self.presets.clear_programs()
             self.status_label.config(text="Status: Stopped")
             self.bypass_stats_label.config(text="")
+            self.timing_stats_label.config(text="")
         self.start_stop_button.config(text="Stop" if self.is_running else "Start")
 
     def human_delay(self, base: float, variation: float = 0.02):
-        return max(0, base + random.uniform(-variation, variation))
+        return human_delay(base, variation)
 
-    def move_mouse_naturally(self, x, y):
+    def move_mouse_naturally(self, x, y, backend=None):
         """Move mouse with natural human-like motion."""
-        current_x, current_y = mouse.position
-
-        if self.bypass_enabled:
-            # Use bypass system for enhanced humanization.
-            params = self.bypass_system.get_mouse_movement_params()
-            steps = params['steps']
-            base_delay = params['delay']
-            curve = params['curve']
-
-            # Apply jitter to target position.
-            x, y = self.bypass_system.get_mouse_jitter(x, y)
-
-            for i in range(1, steps + 1):
-                t = i / steps
-                # Apply movement curve for more natural motion.
-                t_curved = self.bypass_system.apply_movement_curve(t, curve)
-
-                new_x = current_x + (x - current_x) * t_curved
-                new_y = current_y + (y - current_y) * t_curved
-
-                # Add micro-jitter during movement.
-                if random.random() < 0.2:
-                    new_x += random.gauss(0, 1)
-                    new_y += random.gauss(0, 1)
-
-                mouse.position = (int(new_x), int(new_y))
-
-                # Variable delay with gaussian distribution.
-                delay = self.bypass_system.gaussian_variation(base_delay)
-                time.sleep(max(0.001, delay))
-        else:
-            # Original simple movement.
-            steps = random.randint(5, 15)
-            for i in range(1, steps + 1):
-                new_x = current_x + (x - current_x) * i / steps
-                new_y = current_y + (y - current_y) * i / steps
-                mouse.position = (int(new_x), int(new_y))
-                time.sleep(self.human_delay(0.005, 0.003))
-
-    def clicking_loop(self):
-        """Main clicking loop with optional anti-detection bypass and native input."""
-        # Handle infinite hold mode.
-        if self.hold_mode and float(self.hold_entry.get()) == 0:
-            if self.click_key in ["left", "right", "middle"]:
-                if self.use_native_input:
-                    self.native_input.mouse_down(self.click_key)
-                else:
-                    mouse.press(self.click_key)
-            else:
-                if self.use_native_input:
-                    self.native_input.key_down(self.click_key)
-                else:
-                    keyboard.press(self.click_key)
-            while self.is_running:
-                time.sleep(0.1)
-            if self.click_key in ["left", "right", "middle"]:
-                if self.use_native_input:
-                    self.native_input.mouse_up(self.click_key)
-                else:
-                    mouse.release(self.click_key)
-            else:
-                if self.use_native_input:
-                    self.native_input.key_up(self.click_key)
-                else:
-                    keyboard.release(self.click_key)
-            return
-
-        while self.is_running:
-            # Move mouse if using fixed position.
-            if not self.use_current_pos:
-                self.move_mouse_naturally(*self.click_pos)
-
-            hold_time = float(self.hold_entry.get())
-
-            # Determine hold duration.
-            if self.bypass_enabled and self.hold_mode:
-                actual_hold_time = self.bypass_system.get_hold_duration(hold_time)
-            else:
-                actual_hold_time = self.human_delay(hold_time)
-
-            # Execute click or hold using native input or standard library.
-            if self.click_key in ["left", "right", "middle"]:
-                if self.hold_mode:
-                    if self.use_native_input:
-                        self.native_input.mouse_down(self.click_key)
-                        time.sleep(actual_hold_time)
-                        self.native_input.mouse_up(self.click_key)
-                    else:
-                        mouse.press(self.click_key)
-                        time.sleep(actual_hold_time)
-                        mouse.release(self.click_key)
-                else:
-                    if self.use_native_input:
-                        self.native_input.click(self.click_key)
-                    else:
-                        mouse.click(self.click_key)
-            else:
-                if self.hold_mode:
-                    if self.use_native_input:
-                        self.native_input.key_down(self.click_key)
-                        time.sleep(actual_hold_time)
-                        self.native_input.key_up(self.click_key)
-                    else:
-                        keyboard.press(self.click_key)
-                        time.sleep(actual_hold_time)
-                        keyboard.release(self.click_key)
-                else:
-                    if self.use_native_input:
-                        self.native_input.key_press(self.click_key)
-                    else:
-                        keyboard.press(self.click_key)
-                        keyboard.release(self.click_key)
-
-            # Get base interval.
-            interval = self.get_interval()
-            if interval is None:
-                self.is_running = False
-                self.status_label.config(text="Status: Stopped")
-                return
-
-            # Calculate delay with or without bypass.
-            if self.bypass_enabled:
-                # Use advanced humanization.
-                delay = self.bypass_system.get_humanized_delay(interval)
-                # Adapt profile if using adaptive mode.
-                self.bypass_system.adapt_profile()
-            else:
-                # Use simple variation.
-                delay = self.human_delay(interval, 0.03)
+        move_naturally(backend or self.input_backend, x, y, self.bypass_system if self.bypass_enabled else None)
 
-            time.sleep(delay)  
-            
     def save_config(self):
-        with open(globals.app_config_file_path, "r") as f:
-            current_config = json.load(f)
+        # Startup settings (use_current_pos, startup_mode, exec_on_startup) belong to the Settings window.
         new_config = {
             "hours": self.hours_entry.get(),
             "minutes": self.minutes_entry.get(),
             "seconds": self.seconds_entry.get(),
             "milliseconds": self.ms_entry.get(),
             "click_key": self.click_key,
-            "use_current_pos": current_config["use_current_pos"],
-            "startup_mode": current_config["startup_mode"],
-            "exec_on_startup": current_config["exec_on_startup"],
             "click_pos": self.click_pos,
+            "target_image": self.target_image,
             "trigger_key": self.trigger_key,
             "hold_mode": self.hold_mode,
             "hold_duration": self.hold_entry.get(),
+            "press_duration": self.press_entry.get(),
             "window_x": self.root.winfo_x(),
             "window_y": self.root.winfo_y(),
             "bypass_enabled": self.bypass_enabled,
             "bypass_profile": self.profile_var.get(),
             "native_input_enabled": self.use_native_input,
-            "native_input_method": self.input_method_var.get()
+            "native_input_method": self.input_method_var.get(),
+            "overrun_policy": self.overrun_var.get(),
+            "high_rate_mode": self.high_rate_mode,
+            "clicks_per_tick": self.clicks_per_tick_entry.get(),
+            "sendinput_batch_size": self.sendinput_batch_size,
+            "metrics_export_interval": self.metrics_export_interval,
+            "profiler_hotkey_enabled": self.profiler_hotkey_enabled,
+            "profiler_hotkey": self.profiler_hotkey,
+            "macro_record_key": self.macro_record_key,
+            "watch_rule": self.watch_settings,
+            "timing_precision": self.precision_var.get(),
+            "input_backend": self.input_backend_name,
+            "trace_enabled": self.trace_enabled,
+            "trace_capacity": self.trace_capacity,
+            "seed": self.config_seed,
+            # Closed before start_services: the saved ones are kept as they were.
+            "jobs": [{"name": handle.name, **handle.job.to_dict()} for handle in self.extra_jobs] if self.engine is not None else self.saved_jobs,
+            "presets": [preset.to_dict() for preset in self.presets] if self.presets is not None else self.saved_presets
         }
-        try:
-            with open(globals.app_config_file_path, "w") as f:
-                json.dump(new_config, f)
-            MemoryManager.set("window_x", new_config["window_x"])
-            MemoryManager.set("window_y", new_config["window_y"])
-            MemoryManager.save_memory()
-        except Exception as e: messagebox.showerror("Error", f"Error saving configuration:\n{e}")
+        # Written behind, on the store's thread.
+        Settings.update(new_config)
+        Settings.save()
             
     def load_config(self, force_create_file=True):
         default_config = {
@@ -676,30 +1308,44 @@ class AutoClicker:
             "startup_mode": "normal",
             "exec_on_startup": False,
             "click_pos": [0, 0],
+            "target_image": "",
             "trigger_key": "F6",
             "hold_mode": False,
             "hold_duration": "0.1",
+            "press_duration": "20",
             "window_x": 100,
             "window_y": 100,
             "bypass_enabled": False,
             "bypass_profile": "moderate",
             "native_input_enabled": False,
-            "native_input_method": "auto"
+            "native_input_method": "auto",
+            "overrun_policy": "skip",
+            "high_rate_mode": False,
+            "clicks_per_tick": "1",
+            "sendinput_batch_size": NativeInput.DEFAULT_BATCH_SIZE,
+            "metrics_export_interval": 10,
+            "profiler_hotkey_enabled": False,
+            "profiler_hotkey": "ctrl+alt+p",
+            "macro_record_key": "F9",
+            "watch_rule": self.watch_settings,
+            "timing_precision": "balanced",
+            "input_backend": "auto",
+            "trace_enabled": False,
+            "trace_capacity": None,
+            "seed": None,
+            "jobs": [],
+            "presets": []
         }
-        if os.path.exists(globals.app_config_file_path):
-            try:
-                with open(globals.app_config_file_path, "r") as f:
-                    config = json.load(f)
-            except Exception as e:
-                messagebox.showwarning("Warning", f"Error loading configuration. Using defaults.\n{e}")
-                config = default_config
-        else: 
+        # The settings file is read once, on the first access to the store.
+        if Settings.load_error:
+            messagebox.showwarning("Warning", f"Error loading configuration. Using defaults.\n{Settings.load_error}")
+            config = default_config
+        elif Settings.exists: config = Settings.snapshot()
+        else:
             config = default_config
             if force_create_file:
-                try:
-                    with open(globals.app_config_file_path, "w") as f:
-                        json.dump(config, f)
-                except Exception as e: messagebox.showerror("Error", f"Error creating configuration file:\n{e}")
+                Settings.update(default_config)
+                Settings.save()
         try:
             # Load time values.
             self.hours_entry.delete(0, tk.END)
@@ -717,18 +1363,22 @@ class AutoClicker:
             self.use_current_pos = config.get("use_current_pos", True)
             self.click_pos = tuple(config.get("click_pos", (0, 0)))
             self.trigger_key = config.get("trigger_key", "F6")
+            self.macro_record_key = config.get("macro_record_key", "F9")
+            self.watch_settings = {**self.watch_settings, **config.get("watch_rule", {})}
             self.trigger_label.config(text=f"Press {self.trigger_key} to start/stop")
             self.hold_mode = config.get("hold_mode", False)
-            self.setup_keyboard_listener()
                 
             # Update GUI.
             self.click_key_button.config(text=f"Current: {self.click_key}")
             self.pos_var.set(self.use_current_pos)
             self.position_label.config(text=f"Current: {self.click_pos}")
+            self.set_target_image(config.get("target_image", ""))
             self.trigger_label.config(text=f"Press {self.trigger_key} to start/stop")
             self.mode_var.set(self.hold_mode)
             self.hold_entry.delete(0, tk.END)
             self.hold_entry.insert(0, config.get("hold_duration", "0.1"))
+            self.press_entry.delete(0, tk.END)
+            self.press_entry.insert(0, config.get("press_duration", "20"))
                 
             self.toggle_position()
             self.toggle_mode()
@@ -741,13 +1391,41 @@ class AutoClicker:
             self.change_bypass_profile()
             self.toggle_bypass()
 
+            # Load the default input backend ("auto", "hook" or "xtest"; no GUI option).
+            self.set_input_backend(config.get("input_backend", "auto"))
+
+            # Load the input trace settings (no GUI option).
+            self.trace_enabled = config.get("trace_enabled", False)
+            trace_capacity = config.get("trace_capacity")
+            self.trace_capacity = max(1, int(trace_capacity)) if trace_capacity else None
+
             # Load native input settings.
+            self.sendinput_batch_size = max(1, int(config.get("sendinput_batch_size", NativeInput.DEFAULT_BATCH_SIZE)))
+            if self.native_input: self.native_input.set_batch_size(self.sendinput_batch_size)
             self.use_native_input = config.get("native_input_enabled", False)
             self.native_var.set(self.use_native_input)
             native_method = config.get("native_input_method", "auto")
             self.input_method_var.set(native_method)
             self.change_input_method()
             self.toggle_native_input()
+
+            # Load timing settings.
+            self.metrics_export_interval = max(0, float(config.get("metrics_export_interval", 10)))
+            self.profiler_hotkey_enabled = config.get("profiler_hotkey_enabled", False)
+            self.profiler_hotkey = config.get("profiler_hotkey", "ctrl+alt+p")
+            self.overrun_var.set(config.get("overrun_policy", "skip"))
+            self.change_overrun_policy()
+            self.precision_var.set(config.get("timing_precision", "balanced"))
+            self.change_timing_precision()
+            self.high_rate_var.set(config.get("high_rate_mode", False))
+            self.toggle_high_rate()
+            self.clicks_per_tick_entry.set(config.get("clicks_per_tick", "1"))
+            self.config_seed = config.get("seed")
+            self.seed = self.cli_seed if self.cli_seed is not None else self.config_seed
+
+            # Presets and additional jobs compile against the input backends: added by start_services.
+            self.saved_presets = config.get("presets", [])
+            self.saved_jobs = config.get("jobs", [])
         except: pass
 
     def setup_system_tray(self):
@@ -773,11 +1451,26 @@ class AutoClicker:
         
     def on_closing(self):
         self.is_running = False
+        if self.macro_recorder is not None: self.macro_recorder.stop()
+        if self.watcher is not None: self.watcher.stop()
+        if self.engine is not None: self.engine.shutdown()
+        import keyboard
         keyboard.unhook_all()
-        self.native_input.cleanup()
+        if self.native_input: self.native_input.cleanup()
+        if self.input_backend is not None: self.input_backend.close()
+        if self.trace_recorder: self.trace_recorder.close()
         self.save_config()
         self.root.destroy()
-
-def main():
-    app = AutoClicker()
+        # Pending settings reach the disk after the window is gone.
+        Settings.close()
+
+def main(startup=None):
+    parser = argparse.ArgumentParser(description="Smart Auto Clicker")
+    parser.add_argument("--seed", type=int, help="Seed the random timing and movement of the main job (reproducible runs)")
+    parser.add_argument("--recalibrate", action="store_true", help="Probe the input backends again instead of using the cached calibration")
+    parser.add_argument("--startup-profile", action="store_true", help="Time the startup phases and imports, and report them once the window is shown")
+    args, _ = parser.parse_known_args()
+    if startup is None: startup = StartupProfile(trace_imports=args.startup_profile)
+    startup.mark("imports")
+    app = AutoClicker(seed=args.seed, recalibrate=args.recalibrate, startup=startup)
     app.run()
\ No newline at end of file
@@ -1,3 +1,4 @@
+from .store import Settings, SettingsStore
 from .manager import MemoryManager
 
-__all__ = ["MemoryManager"]
\ No newline at end of file
+__all__ = ["MemoryManager", "Settings", "SettingsStore"]
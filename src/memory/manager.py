@@ -1,38 +1,41 @@
 import os, pickle
+from src.memory.store import Settings
 from src.utils.basics import get_config_path
 
 class MemoryManagerClass:
-    def __init__(self):
-        self.file_name = os.path.join(get_config_path(), "memory.pkl")
-        self.memory = self._load_memory()
-
-    def _load_memory(self):
-        if os.path.exists(self.file_name):
-            try:
-                with open(self.file_name, "rb") as f:
-                    return pickle.load(f)
-            except Exception as e:
-                print(f"Error loading memory: {e}")
-                return {}
-        return {}
+    """Startup values (window position, startup mode...), kept in the settings store."""
 
-    def save_memory(self):
+    def __init__(self, store=Settings):
+        self.store = store
+        self.legacy_file_name = os.path.join(get_config_path(), "memory.pkl")
+        self._migrate()
+
+    def _migrate(self):
+        # Values of the former memory.pkl move to the settings file once; the settings win on conflicts.
+        if not os.path.exists(self.legacy_file_name): return
         try:
-            with open(self.file_name, "wb") as f:
-                pickle.dump(self.memory, f)
-        except Exception as e: print(f"Error saving memory: {e}")
+            with open(self.legacy_file_name, "rb") as f: memory = pickle.load(f)
+        except Exception as e:
+            print(f"Error loading memory: {e}")
+            memory = {}
+        if isinstance(memory, dict):
+            for key, value in memory.items():
+                if key not in self.store: self.store.set(key, value)
+        self.store.save()
+        if not self.store.flush(5) or self.store.write_error: return
+        try: os.remove(self.legacy_file_name)
+        except OSError as e: print(f"Error removing memory.pkl: {e}")
+
+    def save_memory(self):
+        self.store.save()
 
     def set(self, key, value):
-        self.memory[key] = value
+        self.store.set(key, value)
 
     def get(self, key, default=None):
-        return self.memory.get(key, default)
+        return self.store.get(key, default)
 
     def delete(self, key):
-        if key in self.memory: del self.memory[key]
-
-    def clear(self):
-        self.memory.clear()
-        self.save_memory()
+        self.store.delete(key)
 
-MemoryManager = MemoryManagerClass()
\ No newline at end of file
+MemoryManager = MemoryManagerClass()
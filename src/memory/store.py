@@ -0,0 +1,201 @@
+"""
+Settings Store - All persisted settings in memory, written behind.
+
+The settings live in one JSON file, read once when first used (importing
+the module does not touch it). Changes only
+update the in-memory dict; `save()` asks a background thread to write,
+and changes made within DEFAULT_DELAY of each other are coalesced into one
+write. Every write is atomic (temp file, fsync, rename), so a crash or a
+power loss mid-write leaves the previous file intact.
+
+`flush()` waits for pending changes to reach the disk and `close()` also
+stops the writer (call it when the app exits).
+"""
+
+import os
+import json
+import tempfile
+from threading import Condition, Thread
+from typing import Any, Dict, Optional
+from src.utils.basics import get_config_path
+
+# Seconds a change waits for more changes before it is written.
+DEFAULT_DELAY = 0.5
+
+SETTINGS_FILE_NAME = "autoclicker_config.json"
+
+
+def write_atomic(path: str, data: bytes, durable: bool = True):
+    """
+    Replace `path` with `data` atomically (temp file + fsync + rename).
+
+    Args:
+        durable: Also fsync the data and the rename; without it, readers
+            still never see a partial file but a power loss may lose the write
+    """
+    directory = os.path.dirname(path) or "."
+    descriptor, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try: os.remove(temp_path)
+        except OSError: pass
+        raise
+    if durable and os.name != "nt":
+        # Persist the rename itself.
+        try:
+            descriptor = os.open(directory, os.O_RDONLY)
+            try: os.fsync(descriptor)
+            finally: os.close(descriptor)
+        except OSError: pass
+
+
+class SettingsStore:
+    """
+    In-memory settings persisted by a debounced background writer.
+
+    Args:
+        path: JSON file of the settings
+        delay: Seconds changes are coalesced before a write
+    """
+
+    def __init__(self, path: str, delay: float = DEFAULT_DELAY):
+        self.path = path
+        self.delay = delay
+        self.write_error: Optional[str] = None  # Last failed write
+        self._data: Optional[Dict[str, Any]] = None   # Read on first use
+        self._exists = False
+        self._load_error: Optional[str] = None
+        self._condition = Condition()
+        self._version = 0       # Bumped by every saved change
+        self._written = 0       # Version on disk
+        self._closed = False
+        self._thread: Optional[Thread] = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The settings (the file is read on first access)."""
+        if self._data is None:
+            with self._condition:
+                if self._data is None:
+                    self._data = self._load()
+        return self._data
+
+    @property
+    def exists(self) -> bool:
+        """Whether the settings file exists."""
+        self.data
+        return self._exists
+
+    @property
+    def load_error(self) -> Optional[str]:
+        """Why the file could not be read, if it exists."""
+        self.data
+        return self._load_error
+
+    def _load(self) -> Dict[str, Any]:
+        self._exists = os.path.exists(self.path)
+        if not self._exists:
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("the settings file does not contain an object")
+            return data
+        except (OSError, ValueError) as e:
+            self._load_error = str(e)
+            return {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._condition:
+            self.data[key] = value
+
+    def update(self, values: Dict[str, Any]):
+        with self._condition:
+            self.data.update(values)
+
+    def delete(self, key: str):
+        with self._condition:
+            self.data.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the settings."""
+        with self._condition:
+            return dict(self.data)
+
+    def save(self):
+        """Schedule a write of the current settings (returns immediately)."""
+        with self._condition:
+            if self._closed:
+                return
+            self._version += 1
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="SettingsWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every saved change is on disk.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            if self._thread is None:
+                return True
+            target = self._version
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._written >= target or self._thread is None, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Write pending changes and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._version > self._written or self._closed)
+                if self._version == self._written:
+                    self._thread = None
+                    condition.notify_all()
+                    return
+                # Coalesce the changes arriving within the delay (skipped when closing or flushing).
+                version = self._version
+                while not self._closed and condition.wait(self.delay) and self._version != version:
+                    version = self._version
+                version = self._version
+                try: data = json.dumps(self.data).encode("utf-8")
+                except (TypeError, ValueError) as e: data, self.write_error = None, str(e)
+            try:
+                if data is not None:
+                    write_atomic(self.path, data)
+                    self.write_error = None
+                    self._exists = True
+            except OSError as e:
+                self.write_error = str(e)
+                print(f"Error saving settings: {e}")
+            with condition:
+                self._written = version
+                condition.notify_all()
+
+
+Settings = SettingsStore(os.path.join(get_config_path(), SETTINGS_FILE_NAME))
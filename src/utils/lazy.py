@@ -0,0 +1,44 @@
+"""
+Lazy Imports - Optional heavy modules loaded on first use.
+
+Importing NumPy costs more than building the whole main window, and it is
+only needed once a job is compiled. Modules that use it call `numpy()`
+when they need it instead of importing it at module level; `preload()`
+imports such modules on a background thread once the window is shown, so
+the first Start does not pay for them either.
+"""
+
+import importlib
+from threading import Thread
+from types import ModuleType
+from typing import Dict, Optional
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+
+
+def optional_module(name: str) -> Optional[ModuleType]:
+    """Import a module on first call; None if it is not installed."""
+    if name not in _modules:
+        try:
+            _modules[name] = importlib.import_module(name)
+        except ImportError:
+            _modules[name] = None
+    return _modules[name]
+
+
+def numpy() -> Optional[ModuleType]:
+    """NumPy, or None without it."""
+    return optional_module("numpy")
+
+
+def preload(*names: str) -> Thread:
+    """Import modules on a daemon thread (errors are ignored)."""
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+    thread = Thread(target=run, name="Preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,225 @@
+"""
+Metrics - Cheap always-on latency histograms and a file export.
+
+The click engine records, for every action, how long the injection call
+took and how late it fired against its scheduled deadline. Values go into
+HDR-style log-linear histograms: recording is an integer bucket index and
+one array increment, with about 3% relative precision from 1 us to hours.
+
+The exporter periodically rewrites a JSON file and a Prometheus text file
+(atomically, through a temporary file) so long unattended runs can be
+scraped by monitoring tools. The files are rewritten often and only
+describe the current run, so they are not fsync'd: a write costs no disk
+flush on the thread that exports.
+"""
+
+import json
+import os
+from array import array
+from typing import Dict, Iterable, Optional
+from src.memory.store import write_atomic
+
+# Histogram layout: values below 2**SUB_BITS us get one bucket each, larger
+# values get 2**(SUB_BITS - 1) buckets per power of two.
+SUB_BITS = 6
+SUB_COUNT = 1 << SUB_BITS
+HALF_COUNT = SUB_COUNT >> 1
+MAX_SHIFT = 32                      # Up to ~2**38 us (about 76 hours)
+BUCKETS = SUB_COUNT + MAX_SHIFT * HALF_COUNT
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations, in microsecond resolution.
+
+    Thread-safe enough for one writer and any number of readers: readers
+    may see a count that is one sample ahead of the sum, never garbage.
+    """
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0          # Sum of recorded values in seconds
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add one duration (negative values are recorded as 0)."""
+        value = int(seconds * 1_000_000)
+        if value < SUB_COUNT:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BITS
+            if shift > MAX_SHIFT:
+                shift, value = MAX_SHIFT, (SUB_COUNT << MAX_SHIFT) - 1
+            index = SUB_COUNT + (shift - 1) * HALF_COUNT + (value >> shift) - HALF_COUNT
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def reset(self):
+        """Drop all samples."""
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        """Middle of a bucket, in seconds."""
+        if index < SUB_COUNT:
+            return index / 1_000_000
+        shift = (index - SUB_COUNT) // HALF_COUNT + 1
+        low = ((index - SUB_COUNT) % HALF_COUNT + HALF_COUNT) << shift
+        return (low + (1 << shift) / 2) / 1_000_000
+
+    def percentile(self, fraction: float) -> float:
+        """Value below which `fraction` of the samples fall, in seconds."""
+        count = self.count
+        if not count:
+            return 0.0
+        target = max(1, int(fraction * count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """Count, mean, max and quantiles, in seconds."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "max": self.max,
+            "quantiles": {str(q): self.percentile(q) for q in QUANTILES},
+        }
+
+
+class JobMetrics:
+    """Hot-path counters and histograms of one engine job."""
+
+    def __init__(self):
+        self.injection = LatencyHistogram()   # Duration of the action call
+        self.lateness = LatencyHistogram()    # Actual minus scheduled fire time
+        self.actions = 0
+        self.failed = 0
+
+    def record_action(self, lateness: float, duration: float, ok: bool):
+        """Record one fired tick."""
+        self.actions += 1
+        self.lateness.record(lateness)
+        self.injection.record(duration)
+        if not ok:
+            self.failed += 1
+
+    def record_injection(self, duration: float, ok: bool):
+        """Record an injection outside a tick (e.g. a scheduled release)."""
+        self.injection.record(duration)
+        if not ok:
+            self.failed += 1
+
+    def reset(self):
+        self.injection.reset()
+        self.lateness.reset()
+        self.actions = 0
+        self.failed = 0
+
+
+def job_snapshot(handle) -> dict:
+    """Metrics and scheduler counters of an EngineJob as plain values."""
+    stats = handle.get_stats()
+    metrics = handle.metrics
+    return {
+        "name": handle.name,
+        "state": handle.state.value,
+        "actions": metrics.actions,
+        "failed_injections": metrics.failed,
+        "overruns": stats.overruns,
+        "skipped_ticks": stats.skipped_ticks,
+        "requested_rate": stats.requested_rate,
+        "achieved_rate": stats.achieved_rate,
+        "injection_latency": metrics.injection.summary(),
+        "lateness": metrics.lateness.summary(),
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snapshots: Iterable[dict], prefix: str = "autoclicker") -> str:
+    """Prometheus text exposition of job snapshots."""
+    snapshots = list(snapshots)
+    lines = []
+    counters = (
+        ("actions_total", "actions", "Actions fired."),
+        ("failed_injections_total", "failed_injections", "Injection calls that raised an error."),
+        ("overruns_total", "overruns", "Ticks that fired after their deadline had passed."),
+        ("skipped_ticks_total", "skipped_ticks", "Ticks dropped by the skip overrun policy."),
+    )
+    for name, key, help_text in counters:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for snapshot in snapshots:
+            lines.append(f'{prefix}_{name}{{job="{_label(snapshot["name"])}"}} {snapshot[key]}')
+
+    lines.append(f"# HELP {prefix}_running Whether the job is running.")
+    lines.append(f"# TYPE {prefix}_running gauge")
+    for snapshot in snapshots:
+        lines.append(f'{prefix}_running{{job="{_label(snapshot["name"])}"}} {int(snapshot["state"] == "running")}')
+
+    summaries = (
+        ("injection_latency_seconds", "injection_latency", "Duration of the input injection call."),
+        ("lateness_seconds", "lateness", "Actual minus scheduled fire time."),
+    )
+    for name, key, help_text in summaries:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} summary")
+        for snapshot in snapshots:
+            job = _label(snapshot["name"])
+            summary = snapshot[key]
+            for quantile, value in summary["quantiles"].items():
+                lines.append(f'{prefix}_{name}{{job="{job}",quantile="{quantile}"}} {value:.9f}')
+            lines.append(f'{prefix}_{name}_sum{{job="{job}"}} {summary["sum"]:.9f}')
+            lines.append(f'{prefix}_{name}_count{{job="{job}"}} {summary["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Writes job metrics to `metrics.json` and `metrics.prom` in a directory.
+
+    Args:
+        directory: Output directory (the config directory in the app)
+    """
+
+    JSON_FILE = "metrics.json"
+    PROMETHEUS_FILE = "metrics.prom"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.last_error: Optional[Exception] = None
+
+    def export(self, handles: Iterable, extra: Optional[Dict] = None) -> bool:
+        """Rewrite both files; returns False (and keeps the error) on failure."""
+        snapshots = [job_snapshot(handle) for handle in handles]
+        report = {"jobs": snapshots}
+        if extra:
+            report.update(extra)
+        try:
+            write_atomic(os.path.join(self.directory, self.JSON_FILE), json.dumps(report, indent=2).encode("utf-8"), durable=False)
+            write_atomic(os.path.join(self.directory, self.PROMETHEUS_FILE), to_prometheus(snapshots).encode("utf-8"), durable=False)
+        except OSError as e:
+            self.last_error = e
+            return False
+        self.last_error = None
+        return True
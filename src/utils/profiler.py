@@ -0,0 +1,80 @@
+"""
+Profiler - On-demand cProfile of the click engine thread.
+
+cProfile only traces the thread that enables it, so starting and stopping
+are queued as engine commands and run on the engine thread itself; the Tk
+and keyboard hook threads are left alone. The collected profile is written
+to a timestamped `.pstats` file by a separate thread, so clicking carries
+on while the file is saved.
+
+Open the result with `python -m pstats <file>` or a viewer like snakeviz.
+"""
+
+import cProfile
+import os
+import time
+from threading import Thread
+from typing import Callable, Optional
+
+
+class ClickThreadProfiler:
+    """
+    Toggles a cProfile session scoped to a ClickEngine thread.
+
+    Args:
+        engine: ClickEngine whose thread is profiled
+        directory: Folder receiving the `.pstats` files
+        on_saved: Called with the file path (or an exception) once a
+            profile is written; runs on the writer thread
+    """
+
+    def __init__(self, engine, directory: str, on_saved: Optional[Callable[[object], None]] = None):
+        self.engine = engine
+        self.directory = directory
+        self.on_saved = on_saved
+        self.active = False
+        self._profile: Optional[cProfile.Profile] = None
+
+    def toggle(self) -> bool:
+        """Start or stop profiling; returns True if profiling is now active."""
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+        return self.active
+
+    def start(self):
+        """Begin profiling the engine thread."""
+        if self.active:
+            return
+        self.active = True
+        self._profile = cProfile.Profile()
+        self.engine.start()
+        self.engine._command(self._profile.enable)
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop profiling and save the profile in the background.
+
+        Returns:
+            Path of the file being written
+        """
+        if not self.active:
+            return None
+        self.active = False
+        profile, self._profile = self._profile, None
+        path = os.path.join(self.directory, f"click-thread-{time.strftime('%Y%m%d-%H%M%S')}.pstats")
+        def disable():
+            profile.disable()
+            Thread(target=self._save, args=(profile, path), name="ProfileWriter", daemon=True).start()
+        self.engine._command(disable)
+        return path
+
+    def _save(self, profile: cProfile.Profile, path: str):
+        try:
+            profile.dump_stats(path)
+            result = path
+        except OSError as e:
+            result = e
+        if self.on_saved:
+            self.on_saved(result)
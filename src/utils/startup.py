@@ -0,0 +1,185 @@
+"""
+Startup Profile - Where the time to the main window goes.
+
+The profile is created first thing in init.py and every startup phase is
+marked against it (Tk root, widgets, config, window shown, services,
+keyboard hooks). "window shown" is the first <Map> event of the main
+window; the engine, input backends (calibrated on a first launch), saved
+jobs and metrics export ("services") only start after it.
+With `--startup-profile`, an ImportTimer also times every module imported
+on the main thread, and a report is printed and written to
+`startup_profile.txt` in the config directory once the window is shown:
+1. Phases - time since launch at the end of each phase
+2. Imports - the slowest modules, with their own and cumulative time
+
+Times start when init.py runs, so the interpreter's own startup (and the
+unpacking of a one-file build) is not included.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds from launch to src.main imported. Measured with benchmarks/startup.py
+# (21 fresh processes, warm disk caches, one-core Linux VM): median 48-67 ms,
+# down from about 230 ms before the imports were deferred.
+IMPORT_BUDGET = 0.1
+# Seconds from launch to the main window mapped: the imports above, the Tk root,
+# the widgets and load_config (the engine and input backends start after it).
+# benchmarks/startup.py reports the "window shown" median against it on a display.
+STARTUP_BUDGET = 0.35
+
+REPORT_FILE_NAME = "startup_profile.txt"
+
+
+class _TimedLoader:
+    """Loader proxy timing `exec_module` (everything else goes to the real loader)."""
+
+    def __init__(self, loader, timer: "ImportTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module keeps its real loader.
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit(self._name)
+
+
+class ImportTimer:
+    """
+    Meta path finder timing the modules imported on the installing thread.
+
+    Self time excludes the nested imports; cumulative time includes them.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.times: Dict[str, Tuple[float, float]] = {}  # Module name -> (self, cumulative)
+        self._stack: List[List[float]] = []              # [start, nested time] per module being executed
+        self._thread = threading.get_ident()
+        self._finding = False
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        if self._finding or threading.get_ident() != self._thread:
+            return None
+        # Ask the other finders, then wrap the loader of the spec they return.
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, name)
+        return spec
+
+    def _enter(self):
+        self._stack.append([self.clock(), 0.0])
+
+    def _exit(self, name: str):
+        started, nested = self._stack.pop()
+        cumulative = self.clock() - started
+        self.times[name] = (cumulative - nested, cumulative)
+        if self._stack:
+            self._stack[-1][1] += cumulative
+
+    def slowest(self, count: int = 15) -> List[Tuple[str, float, float]]:
+        """The `count` modules with the highest cumulative time: (name, self, cumulative)."""
+        ranked = sorted(self.times.items(), key=lambda item: item[1][1], reverse=True)
+        return [(name, own, cumulative) for name, (own, cumulative) in ranked[:count]]
+
+
+class StartupProfile:
+    """
+    Startup phases, and the imports when traced.
+
+    Args:
+        trace_imports: Time the imports and report once finished
+        clock: Time source (seconds)
+    """
+
+    def __init__(self, trace_imports: bool = False, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.marks: List[Tuple[str, float]] = []
+        self.enabled = trace_imports
+        self.imports: Optional[ImportTimer] = None
+        self.finished = False
+        if trace_imports:
+            self.imports = ImportTimer(clock)
+            self.imports.install()
+
+    def mark(self, phase: str):
+        """End a phase now."""
+        self.marks.append((phase, self.clock() - self.started))
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """Seconds from launch to the end of a phase (None if not reached)."""
+        for name, elapsed in self.marks:
+            if name == phase:
+                return elapsed
+        return None
+
+    def report(self, imports: int = 15) -> str:
+        lines = ["Startup phases (ms since launch):"]
+        previous = 0.0
+        for phase, elapsed in self.marks:
+            lines.append(f"  {phase:<16}{elapsed * 1000:>9.1f}{(elapsed - previous) * 1000:>+9.1f}")
+            previous = elapsed
+        for phase, budget in (("imports", IMPORT_BUDGET), ("window shown", STARTUP_BUDGET)):
+            elapsed = self.elapsed(phase)
+            if elapsed is not None:
+                lines.append(f"{phase.capitalize()} {'within' if elapsed <= budget else 'over'} the {budget * 1000:g} ms budget")
+        if self.imports is not None and self.imports.times:
+            lines.append("Slowest imports (ms):")
+            lines.append(f"  {'self':>8}{'cumulative':>12}  module")
+            for name, own, cumulative in self.imports.slowest(imports):
+                lines.append(f"  {own * 1000:>8.1f}{cumulative * 1000:>12.1f}  {name}")
+        return "\n".join(lines)
+
+    def finish(self, directory: Optional[str] = None):
+        """Stop timing imports; when enabled, print the report and write it to `directory`."""
+        if self.finished:
+            return
+        self.finished = True
+        if self.imports is not None:
+            self.imports.uninstall()
+        if not self.enabled:
+            return
+        report = self.report()
+        print(report)
+        if directory:
+            try:
+                with open(os.path.join(directory, REPORT_FILE_NAME), "w") as f:
+                    f.write(report + "\n")
+            except OSError as e:
+                print(f"Error saving the startup profile: {e}")
@@ -0,0 +1,254 @@
+"""
+Trace - Memory-mapped binary ring of every injected input event.
+
+For post-mortems of long runs: each event sent through a TracingBackend is
+stored as one fixed-size record in a file mapped into memory. Writing a
+record is a single `struct.pack_into` into the mapping - no file writes, no
+allocations beyond the packed values - and the operating system pages the
+data out in the background. When the ring is full the oldest records are
+overwritten.
+
+File layout (little endian):
+    Header (HEADER_SIZE bytes): magic, version, record size, capacity,
+        then the JSON list of button/key names that record codes index.
+    Records (RECORD_SIZE bytes each, `capacity` slots):
+        sequence   u64  1-based write counter (0 = empty slot)
+        timestamp  f64  monotonic time the event was sent
+        scheduled  f64  deadline of the engine tick (0 = not scheduled)
+        type       u16  EVENT_* constant
+        code       u16  index into the name table (0 = none)
+        x, y       i32  move coordinates
+        rc         i32  0 = sent, -1 = raised, > 0 = value the backend returned
+
+Every record carries its own sequence number, so the reader restores the
+order (and the ring position) even if the app crashed before closing.
+
+Usage:
+    python -m src.utils.trace FILE [--csv OUT]
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+MAGIC = b"SACTRACE"
+VERSION = 1
+
+HEADER_FORMAT = "<8sHHI"
+HEADER_SIZE = 4096
+NAMES_OFFSET = 64                  # JSON name table, NUL padded to HEADER_SIZE
+
+RECORD_FORMAT = "<QddHHiii"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+DEFAULT_CAPACITY = 262144          # Records (10 MiB with 40-byte records)
+
+# Event types.
+EVENT_DOWN = 1
+EVENT_UP = 2
+EVENT_KEY_DOWN = 3
+EVENT_KEY_UP = 4
+EVENT_MOVE = 5
+EVENT_MOVE_REL = 6
+
+EVENT_TYPES = {
+    "down": EVENT_DOWN,
+    "up": EVENT_UP,
+    "key_down": EVENT_KEY_DOWN,
+    "key_up": EVENT_KEY_UP,
+    "move": EVENT_MOVE,
+    "move_rel": EVENT_MOVE_REL,
+}
+EVENT_NAMES = {value: name for name, value in EVENT_TYPES.items()}
+
+FIELDS = ("sequence", "timestamp", "scheduled", "type", "code", "x", "y", "rc")
+
+
+class TraceError(ValueError):
+    """Raised when a file is not a readable trace."""
+
+
+class TraceRecorder:
+    """
+    Appends event records to a memory-mapped ring file.
+
+    Only one thread may record (the click engine thread in the app).
+
+    Args:
+        path: Trace file; an existing file is replaced
+        capacity: Number of records kept before the oldest are overwritten
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Trace capacity must be at least 1 record")
+        self.path = path
+        self.capacity = capacity
+        self.sequence = 0
+        self.names: List[str] = [""]
+        self._codes: Dict[str, int] = {}
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        with open(path, "w+b") as f:
+            f.truncate(size)
+            self._buffer = mmap.mmap(f.fileno(), size)
+        struct.pack_into(HEADER_FORMAT, self._buffer, 0, MAGIC, VERSION, RECORD_SIZE, capacity)
+        self._pack_into = struct.Struct(RECORD_FORMAT).pack_into
+
+    def code(self, name: str) -> int:
+        """
+        Code of a button or key name, added to the name table on first use.
+
+        Names are interned when actions are compiled, not per event; a name
+        that no longer fits in the header gets code 0.
+        """
+        code = self._codes.get(name)
+        if code is None:
+            names = self.names + [name]
+            table = json.dumps(names).encode("utf-8")
+            if len(table) >= HEADER_SIZE - NAMES_OFFSET:
+                code = 0
+            else:
+                self.names = names
+                code = len(names) - 1
+                self._buffer[NAMES_OFFSET:NAMES_OFFSET + len(table) + 1] = table + b"\0"
+            self._codes[name] = code
+        return code
+
+    def record(self, timestamp: float, scheduled: float, event_type: int,
+               code: int = 0, x: int = 0, y: int = 0, rc: int = 0):
+        """Store one event (overwrites the oldest record when full)."""
+        sequence = self.sequence + 1
+        self.sequence = sequence
+        self._pack_into(self._buffer, HEADER_SIZE + (sequence - 1) % self.capacity * RECORD_SIZE,
+                        sequence, timestamp, scheduled, event_type, code, x, y, rc)
+
+    def flush(self):
+        """Ask the operating system to write the mapped pages to disk."""
+        self._buffer.flush()
+
+    def close(self):
+        """Flush and unmap the file."""
+        if self._buffer.closed:
+            return
+        self._buffer.flush()
+        self._buffer.close()
+
+
+def _read_header(data, size: int) -> Tuple[int, List[str]]:
+    """Capacity and name table of a trace, given its first bytes and file size."""
+    if size < HEADER_SIZE or len(data) < HEADER_SIZE:
+        raise TraceError("File is too small to be a trace")
+    magic, version, record_size, capacity = struct.unpack_from(HEADER_FORMAT, data, 0)
+    if magic != MAGIC:
+        raise TraceError("Not a trace file")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise TraceError(f"Unsupported trace version {version}")
+    if size < HEADER_SIZE + capacity * RECORD_SIZE:
+        raise TraceError("Trace file is truncated")
+    table = bytes(data[NAMES_OFFSET:HEADER_SIZE]).split(b"\0", 1)[0]
+    names = json.loads(table) if table else [""]
+    return capacity, names
+
+
+def _ordered_slots(data, capacity: int) -> List[int]:
+    """Record slots from oldest to newest, skipping empty ones."""
+    sequences = []
+    for slot in range(capacity):
+        sequence = struct.unpack_from("<Q", data, HEADER_SIZE + slot * RECORD_SIZE)[0]
+        if sequence:
+            sequences.append((sequence, slot))
+    sequences.sort()
+    return [slot for _, slot in sequences]
+
+
+def read_trace(path: str) -> Iterator[Tuple]:
+    """
+    Stream the records of a trace file, oldest first.
+
+    Yields:
+        Tuples in FIELDS order
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            capacity, _ = _read_header(data, len(data))
+            unpack_from = struct.Struct(RECORD_FORMAT).unpack_from
+            for slot in _ordered_slots(data, capacity):
+                yield unpack_from(data, HEADER_SIZE + slot * RECORD_SIZE)
+
+
+def read_names(path: str) -> List[str]:
+    """Button/key name table of a trace file (indexed by record code)."""
+    with open(path, "rb") as f:
+        return _read_header(f.read(HEADER_SIZE), os.fstat(f.fileno()).st_size)[1]
+
+
+def write_csv(path: str, out) -> int:
+    """
+    Write a trace as CSV, with event types and codes spelled out.
+
+    Args:
+        path: Trace file
+        out: Text stream receiving the CSV
+
+    Returns:
+        Number of records written
+    """
+    names = read_names(path)
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    count = 0
+    for sequence, timestamp, scheduled, event_type, code, x, y, rc in read_trace(path):
+        name = names[code] if code < len(names) else str(code)
+        writer.writerow((sequence, f"{timestamp:.9f}", f"{scheduled:.9f}", EVENT_NAMES.get(event_type, event_type), name, x, y, rc))
+        count += 1
+    return count
+
+
+def to_numpy(path: str):
+    """
+    Records of a trace as a NumPy structured array, oldest first.
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("NumPy is required to load traces as arrays (pip install numpy)") from e
+    dtype = np.dtype([
+        ("sequence", "<u8"), ("timestamp", "<f8"), ("scheduled", "<f8"), ("type", "<u2"),
+        ("code", "<u2"), ("x", "<i4"), ("y", "<i4"), ("rc", "<i4"),
+    ])
+    with open(path, "rb") as f:
+        data = f.read()
+    capacity, _ = _read_header(data, len(data))
+    records = np.frombuffer(data, dtype=dtype, count=capacity, offset=HEADER_SIZE)
+    records = records[records["sequence"] != 0]
+    return records[np.argsort(records["sequence"], kind="stable")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an input trace file.")
+    parser.add_argument("trace", help="Trace file")
+    parser.add_argument("--csv", help="Output CSV file (default: standard output)")
+    args = parser.parse_args(argv)
+    try:
+        if args.csv:
+            with open(args.csv, "w", newline="") as f:
+                count = write_csv(args.trace, f)
+            print(f"{count} records written to {args.csv}")
+        else:
+            write_csv(args.trace, sys.stdout)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from .locator import LocatorError, Match, TemplateLocator
+from .watcher import Condition, ConditionWatcher, WatchAction, WatcherError, WatchRule
+
+__all__ = ["LocatorError", "Match", "TemplateLocator", "Condition", "ConditionWatcher", "WatchAction", "WatcherError", "WatchRule"]
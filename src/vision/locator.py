@@ -0,0 +1,357 @@
+"""
+Template Locator - Finds a reference image on screen to click its center.
+
+Fixed click positions break as soon as the target UI moves. A
+TemplateLocator finds the template (a small screenshot of the target) in a
+frame with normalized cross-correlation, which tolerates brightness and
+contrast changes:
+
+1. Coarse search: frame and template are downscaled into pyramids (2x2
+   means) and the whole coarsest level is scored at once with an FFT.
+2. Refinement: the best few candidates are followed down the pyramid,
+   rescoring only a few pixels around them at each level.
+3. Confirmation: a candidate is accepted only if its full-resolution score
+   reaches the threshold.
+
+The last match is cached and, on the next call, searched first in a small
+region around it (only that region is captured from the screen); the full
+search only runs when the target has moved away or disappeared.
+
+Frames can be image files, PIL images or arrays, so the locator can be
+checked offline against screenshot fixtures (or on an Xvfb display).
+Requires NumPy; screen capture uses Pillow's ImageGrab.
+
+Usage:
+    python -m src.vision.locator TEMPLATE SCREENSHOT [--threshold T]
+"""
+
+import sys
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_THRESHOLD = 0.9
+# Pixels around the last match searched before the whole frame.
+SEARCH_MARGIN = 32
+# Smallest template side kept at the coarsest pyramid level.
+MIN_TEMPLATE_SIZE = 12
+MAX_LEVELS = 4
+# Coarse candidates followed down the pyramid.
+CANDIDATES = 3
+# Pixels rescored around a candidate at each finer level.
+REFINE_RADIUS = 2
+
+
+class LocatorError(RuntimeError):
+    """Raised when a template cannot be loaded or the screen cannot be captured."""
+
+
+@dataclass(frozen=True)
+class Match:
+    """Location of the template, in screen (or frame) coordinates."""
+    left: int
+    top: int
+    width: int
+    height: int
+    score: float
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.left + self.width // 2, self.top + self.height // 2
+
+
+def to_gray(image) -> "np.ndarray":
+    """
+    Grayscale float32 array of an image.
+
+    Args:
+        image: File path, PIL image or array (HxW, HxWx3 or HxWx4)
+
+    Raises:
+        LocatorError: If NumPy is missing or the image cannot be read
+    """
+    if np is None:
+        raise LocatorError("NumPy is required to locate images")
+    if isinstance(image, str):
+        try:
+            from PIL import Image
+            with Image.open(image) as file:
+                return np.asarray(file.convert("L"), dtype=np.float32)
+        except (OSError, ImportError) as e:
+            raise LocatorError(f"Cannot read image {image}: {e}")
+    if hasattr(image, "convert"):
+        return np.asarray(image.convert("L"), dtype=np.float32)
+    array = np.asarray(image, dtype=np.float32)
+    if array.ndim == 3:
+        array = array[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    if array.ndim != 2:
+        raise LocatorError("Images must be 2D (grayscale) or 3D (color) arrays")
+    return array
+
+
+def downscale(image: "np.ndarray") -> "np.ndarray":
+    """Half-size image, each pixel the mean of a 2x2 block."""
+    height, width = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    # Rows first: adding whole rows is much faster than four strided views.
+    rows = image[0:height:2, :width] + image[1:height:2, :width]
+    return (rows[:, 0::2] + rows[:, 1::2]) * 0.25
+
+
+def _fast_length(n: int) -> int:
+    """Smallest 2^a * 3^b * 5^c >= n (fast FFT size)."""
+    best = 1 << (n - 1).bit_length()
+    power3 = 1
+    while power3 < best:
+        power5 = power3
+        while power5 < best:
+            length = power5
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power5 *= 5
+        power3 *= 3
+    return best
+
+
+class _Template:
+    """One pyramid level of the template, with what the scoring reuses."""
+
+    def __init__(self, image: "np.ndarray"):
+        self.height, self.width = image.shape
+        self.size = image.size
+        self.zero_mean = image - image.mean()
+        self.norm = float(np.sqrt((self.zero_mean.astype(np.float64) ** 2).sum()))
+        self._spectra: Dict[Tuple[int, int], "np.ndarray"] = {}
+
+    def spectrum(self, shape: Tuple[int, int]) -> "np.ndarray":
+        """FFT of the flipped template for a transform size (cached)."""
+        spectrum = self._spectra.get(shape)
+        if spectrum is None:
+            spectrum = self._spectra[shape] = np.fft.rfft2(self.zero_mean[::-1, ::-1], shape)
+        return spectrum
+
+
+def _window_sums(image: "np.ndarray", height: int, width: int) -> "np.ndarray":
+    """Sum of every height x width window (summed-area table)."""
+    table = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(image, axis=0, dtype=np.float64), axis=1, out=table[1:, 1:])
+    return table[height:, width:] - table[:-height, width:] - table[height:, :-width] + table[:-height, :-width]
+
+
+def score_map(image: "np.ndarray", template: _Template) -> "np.ndarray":
+    """
+    Normalized cross-correlation of the template at every position.
+
+    Returns:
+        Array of scores in [-1, 1], one per top-left position where the
+        template fits inside the image
+    """
+    height, width = image.shape
+    th, tw = template.height, template.width
+    shape = (_fast_length(height), _fast_length(width))
+    spectrum = np.fft.rfft2(image, shape) * template.spectrum(shape)
+    correlation = np.fft.irfft2(spectrum, shape)[th - 1:height, tw - 1:width]
+    sums = _window_sums(image, th, tw)
+    squares = _window_sums(image * image, th, tw)
+    variance = np.maximum(squares - sums * sums / template.size, 0.0)
+    denominator = np.sqrt(variance) * template.norm
+    # Flat windows (no detail) cannot match.
+    valid = denominator > 1e-6 * template.size
+    scores = np.zeros_like(correlation)
+    np.divide(correlation, denominator, out=scores, where=valid)
+    return np.clip(scores, -1.0, 1.0, out=scores)
+
+
+def _peaks(scores: "np.ndarray", count: int, spacing: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Top-left positions of the best `count` separate peaks."""
+    scores = scores.copy()
+    peaks = []
+    for _ in range(count):
+        y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        if scores[y, x] <= 0:
+            break
+        peaks.append((int(y), int(x)))
+        scores[max(0, y - spacing[0]):y + spacing[0] + 1, max(0, x - spacing[1]):x + spacing[1] + 1] = -1
+    return peaks
+
+
+def _best_near(image: "np.ndarray", template: _Template, y: int, x: int, radius: int) -> Tuple[int, int, float]:
+    """Best position within `radius` pixels of (y, x), with its score."""
+    top, left = max(0, y - radius), max(0, x - radius)
+    crop = image[top:y + radius + template.height, left:x + radius + template.width]
+    if crop.shape[0] < template.height or crop.shape[1] < template.width:
+        return y, x, -1.0
+    scores = score_map(crop, template)
+    dy, dx = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return top + int(dy), left + int(dx), float(scores[dy, dx])
+
+
+def grab_screen(bbox: Optional[Tuple[int, int, int, int]] = None) -> "np.ndarray":
+    """
+    Capture (part of) the screen as a grayscale array.
+
+    Args:
+        bbox: (left, top, right, bottom) region, None for the whole screen
+
+    Raises:
+        LocatorError: If the screen cannot be captured
+    """
+    try:
+        from PIL import ImageGrab
+        return to_gray(ImageGrab.grab(bbox=bbox))
+    except (OSError, ImportError) as e:
+        raise LocatorError(f"Cannot capture the screen: {e}")
+
+
+class TemplateLocator:
+    """
+    Finds one template in frames or on screen.
+
+    Args:
+        template: Reference image (file path, PIL image or array)
+        threshold: Minimum full-resolution score of a match (0-1)
+        margin: Pixels around the last match searched first
+        grab: Screen capture function, taking an optional bbox
+
+    Raises:
+        LocatorError: If NumPy is missing or the template is unusable
+    """
+
+    def __init__(self, template, threshold: float = DEFAULT_THRESHOLD, margin: int = SEARCH_MARGIN,
+                 grab: Callable[[Optional[Tuple[int, int, int, int]]], "np.ndarray"] = grab_screen):
+        image = to_gray(template)
+        if min(image.shape) < 2:
+            raise LocatorError("The template is too small")
+        self.threshold = threshold
+        self.margin = margin
+        self.grab = grab
+        self.last: Optional[Match] = None
+        self.levels: List[_Template] = [_Template(image)]
+        while len(self.levels) < MAX_LEVELS and min(image.shape) // 2 >= MIN_TEMPLATE_SIZE:
+            image = downscale(image)
+            self.levels.append(_Template(image))
+        if self.levels[0].norm == 0:
+            raise LocatorError("The template is a flat color and cannot be located")
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the template."""
+        return self.levels[0].width, self.levels[0].height
+
+    def _match(self, left: int, top: int, score: float) -> Match:
+        width, height = self.size
+        self.last = Match(left, top, width, height, score)
+        return self.last
+
+    def search(self, frame: "np.ndarray") -> Optional[Tuple[int, int, float]]:
+        """
+        Full pyramid search of a grayscale frame.
+
+        Returns:
+            (left, top, score) of the best confirmed match, None if no
+            position reaches the threshold
+        """
+        template = self.levels[0]
+        if frame.shape[0] < template.height or frame.shape[1] < template.width:
+            return None
+        pyramid = [frame]
+        for _ in range(1, len(self.levels)):
+            pyramid.append(downscale(pyramid[-1]))
+        # Coarse levels too small for their template are skipped.
+        level = len(self.levels) - 1
+        while level and (pyramid[level].shape[0] < self.levels[level].height or pyramid[level].shape[1] < self.levels[level].width):
+            level -= 1
+        coarse = self.levels[level]
+        scores = score_map(pyramid[level], coarse)
+        best = None
+        for y, x in _peaks(scores, CANDIDATES, (max(1, coarse.height // 2), max(1, coarse.width // 2))):
+            score = 0.0
+            for finer in range(level - 1, -1, -1):
+                y, x, score = _best_near(pyramid[finer], self.levels[finer], y * 2, x * 2, REFINE_RADIUS)
+            if level == 0:
+                score = float(scores[y, x])
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = (x, y, score)
+        return best
+
+    def locate(self, frame, origin: Tuple[int, int] = (0, 0)) -> Optional[Match]:
+        """
+        Find the template in a frame, near the last match first.
+
+        Args:
+            frame: Image file path, PIL image or array
+            origin: Screen coordinates of the frame's top-left corner
+
+        Returns:
+            The match in screen coordinates, None if not found
+        """
+        frame = to_gray(frame)
+        ox, oy = origin
+        if self.last is not None:
+            y, x, score = _best_near(frame, self.levels[0], self.last.top - oy, self.last.left - ox, self.margin)
+            if score >= self.threshold:
+                return self._match(x + ox, y + oy, score)
+        found = self.search(frame)
+        if found is None:
+            self.last = None
+            return None
+        x, y, score = found
+        return self._match(x + ox, y + oy, score)
+
+    def locate_on_screen(self) -> Optional[Match]:
+        """
+        Find the template on screen, capturing only the region around the
+        last match when it is still there.
+
+        Raises:
+            LocatorError: If the screen cannot be captured
+        """
+        last = self.last
+        if last is not None:
+            left, top = max(0, last.left - self.margin), max(0, last.top - self.margin)
+            region = self.grab((left, top, last.left + last.width + self.margin, last.top + last.height + self.margin))
+            y, x, score = _best_near(region, self.levels[0], last.top - top, last.left - left, self.margin)
+            if score >= self.threshold:
+                return self._match(x + left, y + top, score)
+        self.last = None
+        return self.locate(self.grab(None))
+
+    def __call__(self) -> Optional[Tuple[int, int]]:
+        """Screen position to click (the template's center), None if not visible."""
+        try:
+            match = self.locate_on_screen()
+        except LocatorError:
+            return None
+        return match.center if match is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Locate a template image in a screenshot.")
+    parser.add_argument("template", help="Reference image")
+    parser.add_argument("screenshot", help="Screenshot to search")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum match score")
+    args = parser.parse_args(argv)
+    try:
+        locator = TemplateLocator(args.template, args.threshold)
+        frame = to_gray(args.screenshot)
+    except LocatorError as e:
+        print(e, file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    match = locator.locate(frame)
+    elapsed = time.perf_counter() - started
+    if match is None:
+        print(f"Not found ({elapsed * 1000:.1f} ms)")
+        return 1
+    print(f"Found at {match.center}, score {match.score:.3f} ({elapsed * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
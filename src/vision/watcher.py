@@ -0,0 +1,387 @@
+"""
+Condition Watcher - Starts, stops or pauses a job from the color of screen regions.
+
+Typical rules: "click only while this region is green" (gate), "start when
+this pixel turns red" (start) or "stop when this region changes" (stop).
+
+A ConditionWatcher runs on its own thread, never on the click engine thread,
+and samples only the small regions of interest at a configurable rate:
+- Windows: one BitBlt per region into a DIB section created once
+- X11: one GetImage request per region (python-xlib)
+- Fixtures: regions cut from an image (ImageSampler)
+
+Each check compares the pixels with vectorized color distances (NumPy), so
+a check of a small region costs a fraction of a millisecond. Actions are
+sent only when a condition changes, through a callback (e.g. the methods of
+an EngineJob, which only queue commands for the engine thread).
+
+Requires NumPy.
+"""
+
+import sys
+import time
+import ctypes
+from dataclasses import dataclass
+from enum import Enum
+from threading import Event, Thread
+from typing import Callable, List, Optional, Tuple
+from src.vision.locator import np
+
+DEFAULT_RATE = 20.0       # Checks per second
+MAX_RATE = 200.0
+DEFAULT_TOLERANCE = 30.0  # RGB distance (0-441)
+
+
+class WatcherError(RuntimeError):
+    """Raised when a region cannot be sampled or a rule is invalid."""
+
+
+class WatchAction(Enum):
+    """What a rule does to the job when its condition changes."""
+    GATE = "gate"    # Run while the condition holds, pause otherwise
+    START = "start"  # Start the job when the condition becomes true
+    STOP = "stop"    # Stop the job when the condition becomes true
+
+
+Region = Tuple[int, int, int, int]   # left, top, width, height
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    Test of the pixels of one screen region.
+
+    With a `color`, it holds while at least `coverage` of the pixels are
+    within `tolerance` of that color. Without one, it holds once the region
+    differs from its first sample by a mean distance above `tolerance`.
+    """
+    region: Region
+    color: Optional[Tuple[int, int, int]] = None
+    tolerance: float = DEFAULT_TOLERANCE
+    coverage: float = 0.9
+
+    def __post_init__(self):
+        if len(self.region) != 4 or self.region[2] <= 0 or self.region[3] <= 0:
+            raise WatcherError("Regions need a positive width and height")
+        if self.tolerance < 0:
+            raise WatcherError("Tolerance cannot be negative")
+        if not 0 < self.coverage <= 1:
+            raise WatcherError("Coverage must be between 0 and 1")
+
+    def test(self, pixels: "np.ndarray", reference: Optional["np.ndarray"]) -> bool:
+        """
+        Evaluate the condition on an RGB sample (height x width x 3).
+
+        Args:
+            pixels: Current sample
+            reference: First sample of the region (change conditions)
+        """
+        pixels = pixels.astype(np.int32)
+        if self.color is None:
+            if reference is None:
+                return False
+            difference = pixels - reference
+            distances = np.einsum("ijk,ijk->ij", difference, difference)
+            return float(np.sqrt(distances).mean()) > self.tolerance
+        difference = pixels - np.asarray(self.color, dtype=np.int32)
+        distances = np.einsum("ijk,ijk->ij", difference, difference)
+        matching = np.count_nonzero(distances <= self.tolerance * self.tolerance)
+        return bool(matching >= self.coverage * distances.size)
+
+
+@dataclass(frozen=True)
+class WatchRule:
+    """A condition and what it does to the job."""
+    condition: Condition
+    action: WatchAction = WatchAction.GATE
+
+
+# Samplers. Each one belongs to the thread that calls `sample`.
+
+class RegionSampler:
+    """Captures one region as an RGB array."""
+
+    def sample(self) -> "np.ndarray":
+        raise NotImplementedError
+
+    def close(self):
+        """Release the resources of the sampler."""
+
+
+class ImageSampler(RegionSampler):
+    """
+    Region of a still image (screenshot fixtures, tests).
+
+    Args:
+        image: File path, PIL image or HxWx3 array; `image` can be replaced
+            later to simulate the screen changing
+        region: Region cut from the image
+    """
+
+    def __init__(self, image, region: Region):
+        self.region = region
+        self.image = image
+
+    @property
+    def image(self) -> "np.ndarray":
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        if isinstance(image, str) or hasattr(image, "convert"):
+            from PIL import Image
+            image = Image.open(image) if isinstance(image, str) else image
+            image = np.asarray(image.convert("RGB"))
+        self._image = np.asarray(image)
+
+    def sample(self) -> "np.ndarray":
+        left, top, width, height = self.region
+        return self._image[top:top + height, left:left + width, :3]
+
+
+class XlibSampler(RegionSampler):
+    """Region of the X11 screen, read with one GetImage request."""
+
+    def __init__(self, region: Region, display=None):
+        try:
+            from Xlib import X, display as xdisplay
+            self.display = xdisplay.Display(display)
+        except Exception as e:
+            raise WatcherError(f"X display not available: {e}")
+        self.root = self.display.screen().root
+        self.format = X.ZPixmap
+        self.region = region
+
+    def sample(self) -> "np.ndarray":
+        left, top, width, height = self.region
+        image = self.root.get_image(left, top, width, height, self.format, 0xFFFFFFFF)
+        # 24/32-bit visuals: BGRX pixels.
+        pixels = np.frombuffer(image.data, dtype=np.uint8).reshape(height, width, 4)
+        return pixels[..., 2::-1]
+
+    def close(self):
+        self.display.close()
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.c_uint32), ("biWidth", ctypes.c_int32), ("biHeight", ctypes.c_int32),
+        ("biPlanes", ctypes.c_uint16), ("biBitCount", ctypes.c_uint16), ("biCompression", ctypes.c_uint32),
+        ("biSizeImage", ctypes.c_uint32), ("biXPelsPerMeter", ctypes.c_int32), ("biYPelsPerMeter", ctypes.c_int32),
+        ("biClrUsed", ctypes.c_uint32), ("biClrImportant", ctypes.c_uint32),
+    ]
+
+
+SRCCOPY = 0x00CC0020
+
+
+class GdiSampler(RegionSampler):
+    """Region of the Windows screen, copied with BitBlt into a DIB section created once."""
+
+    def __init__(self, region: Region):
+        if sys.platform != "win32":
+            raise WatcherError("GDI capture is only available on Windows")
+        from ctypes import wintypes
+        self.user32, self.gdi32 = ctypes.windll.user32, ctypes.windll.gdi32
+        user32, gdi32 = self.user32, self.gdi32
+        user32.GetDC.restype = wintypes.HDC
+        user32.GetDC.argtypes = [wintypes.HWND]
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+        gdi32.CreateDIBSection.argtypes = [wintypes.HDC, ctypes.c_void_p, wintypes.UINT, ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD]
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.BitBlt.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+
+        self.region = region
+        left, top, width, height = region
+        header = _BITMAPINFOHEADER(ctypes.sizeof(_BITMAPINFOHEADER), width, -height, 1, 32, 0)  # Top-down BGRA
+        bits = ctypes.c_void_p()
+        self.screen_dc = user32.GetDC(None)
+        self.dc = gdi32.CreateCompatibleDC(self.screen_dc)
+        self.bitmap = gdi32.CreateDIBSection(self.dc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+        if not self.bitmap:
+            self.close()
+            raise WatcherError("Could not create the capture bitmap")
+        gdi32.SelectObject(self.dc, self.bitmap)
+        buffer = (ctypes.c_ubyte * (width * height * 4)).from_address(bits.value)
+        self.pixels = np.ctypeslib.as_array(buffer).reshape(height, width, 4)
+
+    def sample(self) -> "np.ndarray":
+        left, top, width, height = self.region
+        self.gdi32.BitBlt(self.dc, 0, 0, width, height, self.screen_dc, left, top, SRCCOPY)
+        return self.pixels[..., 2::-1]
+
+    def close(self):
+        if getattr(self, "bitmap", None):
+            self.gdi32.DeleteObject(self.bitmap)
+            self.bitmap = None
+        if getattr(self, "dc", None):
+            self.gdi32.DeleteDC(self.dc)
+            self.dc = None
+        if getattr(self, "screen_dc", None):
+            self.user32.ReleaseDC(None, self.screen_dc)
+            self.screen_dc = None
+
+
+def screen_sampler(region: Region) -> RegionSampler:
+    """
+    Sampler of a screen region for this platform.
+
+    Raises:
+        WatcherError: If NumPy is missing or the screen cannot be read
+    """
+    if np is None:
+        raise WatcherError("NumPy is required to watch screen regions")
+    if sys.platform == "win32":
+        return GdiSampler(region)
+    return XlibSampler(region)
+
+
+@dataclass
+class WatcherStats:
+    """Cost of the checks (one check samples and tests every rule)."""
+    checks: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.checks if self.checks else 0.0
+
+
+class ConditionWatcher:
+    """
+    Evaluates rules on a background thread and reports what to do.
+
+    Args:
+        rules: Rules to evaluate
+        on_action: Called from the watcher thread with "start", "stop",
+            "pause" or "resume" when a condition changes
+        rate: Checks per second
+        sampler_factory: Sampler of a region (default: the screen)
+        clock: Clock timing the checks
+    """
+
+    def __init__(self, rules: List[WatchRule], on_action: Callable[[str], None], rate: float = DEFAULT_RATE,
+                 sampler_factory: Callable[[Region], RegionSampler] = screen_sampler,
+                 clock: Callable[[], float] = time.perf_counter):
+        if not rules:
+            raise WatcherError("No rules to watch")
+        if not 0 < rate <= MAX_RATE:
+            raise WatcherError(f"Rate must be between 0 and {MAX_RATE:g} checks per second")
+        self.rules = list(rules)
+        self.on_action = on_action
+        self.period = 1 / rate
+        self.sampler_factory = sampler_factory
+        self.clock = clock
+        self.stats = WatcherStats()
+        self.states: List[Optional[bool]] = [None] * len(self.rules)
+        self.last_error: Optional[str] = None
+        self._samplers: List[RegionSampler] = []
+        self._references: List[Optional["np.ndarray"]] = []
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def gate_open(self) -> bool:
+        """Whether every gate rule currently allows the job to run."""
+        return all(state is not False for rule, state in zip(self.rules, self.states) if rule.action == WatchAction.GATE)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def open(self):
+        """
+        Create the samplers (also done by `start`).
+
+        Raises:
+            WatcherError: If a region cannot be sampled
+        """
+        if self._samplers:
+            return
+        try:
+            for rule in self.rules:
+                self._samplers.append(self.sampler_factory(rule.condition.region))
+        except WatcherError:
+            self.close()
+            raise
+        self._references = [None] * len(self.rules)
+
+    def close(self):
+        for sampler in self._samplers:
+            sampler.close()
+        self._samplers = []
+
+    def check(self) -> List[str]:
+        """
+        Sample and test every rule once.
+
+        Returns:
+            Actions triggered by the conditions that changed
+        """
+        started = self.clock()
+        actions = []
+        gate_was_open = self.gate_open
+        for index, (rule, sampler) in enumerate(zip(self.rules, self._samplers)):
+            pixels = sampler.sample()
+            if rule.condition.color is None and self._references[index] is None:
+                self._references[index] = pixels.astype(np.int32)
+            state = rule.condition.test(pixels, self._references[index])
+            previous, self.states[index] = self.states[index], state
+            if state and not previous:
+                if rule.action == WatchAction.START:
+                    actions.append("start")
+                elif rule.action == WatchAction.STOP:
+                    actions.append("stop")
+        gate_open = self.gate_open
+        if gate_open != gate_was_open:
+            actions.append("resume" if gate_open else "pause")
+        elapsed = self.clock() - started
+        stats = self.stats
+        stats.checks += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        return actions
+
+    def start(self):
+        """Start watching on a background thread (sampling errors end it, see `last_error`)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="ConditionWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # Samplers are created on the thread that uses them (X connections, DCs).
+        try:
+            self.open()
+        except WatcherError as e:
+            self.last_error = str(e)
+            return
+        try:
+            next_check = self.clock()
+            while not self._stop.is_set():
+                for action in self.check():
+                    self.on_action(action)
+                next_check += self.period
+                delay = next_check - self.clock()
+                if delay < 0:
+                    # Slow checks: do not try to catch up.
+                    next_check, delay = self.clock(), 0
+                self._stop.wait(delay)
+        except Exception as e:
+            self.last_error = str(e)
+        finally:
+            self.close()
@@ -1,10 +1,35 @@
-from .config_window import ConfigWindow
+# The windows are imported when first opened: they pull in modules the main window does not need at startup.
 
 class WindowsManager:
     def __init__(self, parent):
         self.parent = parent
         self.config_window = None
+        self.jobs_window = None
+        self.macro_window = None
+        self.condition_window = None
+        self.presets_window = None
 
     def open_config_window(self):
+        from .config_window import ConfigWindow
         if self.config_window is None or not self.config_window.window.winfo_exists(): self.config_window = ConfigWindow(self.parent)
-        else: self.config_window.window.lift()
\ No newline at end of file
+        else: self.config_window.window.lift()
+
+    def open_jobs_window(self, app):
+        from .jobs_window import JobsWindow
+        if self.jobs_window is None or not self.jobs_window.window.winfo_exists(): self.jobs_window = JobsWindow(self.parent, app)
+        else: self.jobs_window.window.lift()
+
+    def open_macro_window(self, app):
+        from .macro_window import MacroWindow
+        if self.macro_window is None or not self.macro_window.window.winfo_exists(): self.macro_window = MacroWindow(self.parent, app)
+        else: self.macro_window.window.lift()
+
+    def open_condition_window(self, app):
+        from .condition_window import ConditionWindow
+        if self.condition_window is None or not self.condition_window.window.winfo_exists(): self.condition_window = ConditionWindow(self.parent, app)
+        else: self.condition_window.window.lift()
+
+    def open_presets_window(self, app):
+        from .presets_window import PresetsWindow
+        if self.presets_window is None or not self.presets_window.window.winfo_exists(): self.presets_window = PresetsWindow(self.parent, app)
+        else: self.presets_window.window.lift()
@@ -0,0 +1,117 @@
+from tkinter import ttk, messagebox
+from src.vision.watcher import Condition, WatchAction, WatcherError, WatchRule, screen_sampler
+import tkinter as tk, src.lib.globals as globals
+
+class ConditionWindow:
+    REFRESH_MS = 500
+
+    def __init__(self, parent, app):
+        self.parent = parent
+        self.app = app
+        settings = app.watch_settings
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Conditions")
+        self.window.geometry("300x390")
+        self.window.resizable(False, False)
+
+        # Icon.
+        self.window.iconbitmap(globals.app_icon_path)
+
+        # Region of interest.
+        region_frame = ttk.LabelFrame(self.window, text="Region", padding=10)
+        region_frame.pack(fill="x", padx=10, pady=5)
+        self.region_vars = []
+        for column, (name, value) in enumerate(zip(("X", "Y", "W", "H"), settings["region"])):
+            ttk.Label(region_frame, text=f"{name}:").grid(row=0, column=column * 2, sticky="e")
+            var = tk.StringVar(value=str(value))
+            ttk.Entry(region_frame, textvariable=var, width=5).grid(row=0, column=column * 2 + 1, padx=(0, 4))
+            self.region_vars.append(var)
+        ttk.Button(region_frame, text="Set Position", command=self.pick_position).grid(row=1, column=0, columnspan=8, pady=(5, 0))
+
+        # Condition.
+        condition_frame = ttk.LabelFrame(self.window, text="Condition", padding=10)
+        condition_frame.pack(fill="x", padx=10, pady=5)
+        self.mode_var = tk.StringVar(value="color" if settings["color"] is not None else "change")
+        color_row = ttk.Frame(condition_frame)
+        color_row.pack(fill="x")
+        ttk.Radiobutton(color_row, text="Color is", variable=self.mode_var, value="color").pack(side=tk.LEFT)
+        self.color_var = tk.StringVar(value=",".join(str(c) for c in settings["color"] or (0, 255, 0)))
+        ttk.Entry(color_row, textvariable=self.color_var, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(color_row, text="Pick", command=self.pick_color, width=5).pack(side=tk.LEFT)
+        ttk.Radiobutton(condition_frame, text="Region changes", variable=self.mode_var, value="change").pack(anchor="w")
+        tolerance_row = ttk.Frame(condition_frame)
+        tolerance_row.pack(fill="x", pady=(5, 0))
+        ttk.Label(tolerance_row, text="Tolerance:").pack(side=tk.LEFT)
+        self.tolerance_var = tk.StringVar(value=str(settings["tolerance"]))
+        ttk.Entry(tolerance_row, textvariable=self.tolerance_var, width=6).pack(side=tk.LEFT, padx=5)
+
+        # What the condition does.
+        action_frame = ttk.LabelFrame(self.window, text="Action", padding=10)
+        action_frame.pack(fill="x", padx=10, pady=5)
+        self.action_var = tk.StringVar(value=settings["action"])
+        ttk.Radiobutton(action_frame, text="Click only while it holds", variable=self.action_var, value=WatchAction.GATE.value).pack(anchor="w")
+        ttk.Radiobutton(action_frame, text="Start clicking when it holds", variable=self.action_var, value=WatchAction.START.value).pack(anchor="w")
+        ttk.Radiobutton(action_frame, text="Stop clicking when it holds", variable=self.action_var, value=WatchAction.STOP.value).pack(anchor="w")
+        rate_row = ttk.Frame(action_frame)
+        rate_row.pack(fill="x", pady=(5, 0))
+        ttk.Label(rate_row, text="Checks per second:").pack(side=tk.LEFT)
+        self.rate_var = tk.StringVar(value=str(settings["rate"]))
+        ttk.Entry(rate_row, textvariable=self.rate_var, width=6).pack(side=tk.LEFT, padx=5)
+
+        buttons_frame = ttk.Frame(self.window)
+        buttons_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Button(buttons_frame, text="Watch", command=self.watch).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        ttk.Button(buttons_frame, text="Stop", command=self.stop).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        self.status_label = ttk.Label(self.window, text="", font=("Arial", 8), foreground="blue")
+        self.status_label.pack(anchor="w", padx=10)
+
+        self.refresh()
+
+    def read_region(self):
+        return tuple(int(var.get()) for var in self.region_vars)
+
+    def pick_position(self):
+        x, y = self.app.pick_cursor_position()
+        self.region_vars[0].set(str(x))
+        self.region_vars[1].set(str(y))
+
+    def pick_color(self):
+        try:
+            sampler = screen_sampler(self.read_region())
+            try: pixels = sampler.sample()
+            finally: sampler.close()
+        except (ValueError, WatcherError) as e:
+            messagebox.showwarning("Conditions", f"Cannot read the region: {e}", parent=self.window)
+            return
+        self.color_var.set(",".join(str(int(c)) for c in pixels.reshape(-1, 3).mean(axis=0)))
+        self.mode_var.set("color")
+
+    def watch(self):
+        try:
+            color = None
+            if self.mode_var.get() == "color":
+                color = tuple(int(c) for c in self.color_var.get().split(","))
+                if len(color) != 3: raise ValueError("Colors are R,G,B")
+            rule = WatchRule(Condition(self.read_region(), color, float(self.tolerance_var.get())), WatchAction(self.action_var.get()))
+            rate = float(self.rate_var.get())
+        except (ValueError, WatcherError) as e:
+            messagebox.showwarning("Conditions", f"Invalid condition: {e}", parent=self.window)
+            return
+        error = self.app.start_watcher(rule, rate)
+        if error: messagebox.showwarning("Conditions", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def stop(self):
+        self.app.stop_watcher()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.window.winfo_exists(): return
+        watcher = self.app.watcher
+        if watcher is not None and watcher.running:
+            stats = watcher.stats
+            state = watcher.states[0]
+            self.status_label.config(text=f"Watching: {'holds' if state else 'does not hold'}, {stats.checks} checks, {stats.mean_time * 1000:.2f} ms mean", foreground="blue")
+        elif watcher is not None and watcher.last_error: self.status_label.config(text=f"Stopped: {watcher.last_error}", foreground="red")
+        else: self.status_label.config(text="Not watching", foreground="gray")
+        if reschedule: self.window.after(self.REFRESH_MS, self.refresh)
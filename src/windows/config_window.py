@@ -1,7 +1,7 @@
 from tkinter import ttk, messagebox
-from src.memory import MemoryManager
+from src.memory import Settings
 from src.driver.executions import enable_startup, disable_startup
-import json, time, tkinter as tk, requests, webbrowser, src.lib.globals as globals
+import json, time, tkinter as tk, src.lib.globals as globals
 
 class ConfigWindow:
     CACHE_TIMEOUT = 60
@@ -11,7 +11,7 @@ class ConfigWindow:
         self.cache = {"data": None, "timestamp": 0}
         self.window = tk.Toplevel(self.parent)
         self.window.title("Settings")
-        self.window.geometry("300x300")
+        self.window.geometry("300x415")
         self.window.resizable(False, False)
 
         # Icon.
@@ -110,6 +110,49 @@ class ConfigWindow:
         if globals.local_is_developer_mode: startup_note.config(text="ⓘ This option does not work in development mode.", foreground="red")
         else: startup_note.config(text="This feature is in beta.", foreground="gray")
 
+        # Frame for the profiling option.
+        profiler_frame = ttk.Frame(self.window)
+        profiler_frame.pack(pady=(0, 10), fill="x", padx=10)
+
+        # Variable to track the profiler hotkey state.
+        self.profiler_var = tk.BooleanVar(value=self.config.get("profiler_hotkey_enabled", False))
+        self.profiler_hotkey = self.config.get("profiler_hotkey", "ctrl+alt+p")
+
+        # Checkbox for enabling/disabling the profiler hotkey.
+        ttk.Checkbutton(
+            profiler_frame,
+            text=f"Enable profiler hotkey ({self.profiler_hotkey})",
+            variable=self.profiler_var,
+            command=self.on_config_change
+        ).pack(anchor="w")
+        ttk.Label(
+            profiler_frame,
+            text="Profiles the click thread into .pstats files in the config folder.",
+            font=("Arial", 8),
+            foreground="gray",
+            anchor="w",
+            justify="left"
+        ).pack(anchor="w")
+
+        # Frame for the input calibration.
+        calibration_frame = ttk.Frame(self.window)
+        calibration_frame.pack(pady=(0, 10), fill="x", padx=10)
+
+        # Button to probe the input backends again (the results are cached).
+        ttk.Button(
+            calibration_frame,
+            text="Recalibrate input backends",
+            command=lambda: self.parent.event_generate("<<RecalibrateInput>>")
+        ).pack(anchor="w")
+        ttk.Label(
+            calibration_frame,
+            text="Measures every input method and uses the fastest one.",
+            font=("Arial", 8),
+            foreground="gray",
+            anchor="w",
+            justify="left"
+        ).pack(anchor="w")
+
         self.update_label = ttk.Label(self.window, text="Loading...", foreground="blue")
         self.update_label.pack(pady=5)
 
@@ -135,6 +178,8 @@ class ConfigWindow:
 
     def fetch_update_data(self):
         try:
+            # Imported here: requests is slow to import and only used for this check.
+            import requests
             response = requests.get("https://github.com/FJRG2007/smart-auto-clicker/raw/refs/heads/main/assets/remote.json")
             if response.status_code == 200:
                 remote_data = response.json()
@@ -151,6 +196,7 @@ class ConfigWindow:
         remote_version = remote_data.get("version", "")
         download_url = remote_data.get("download_url", "https://github.com/FJRG2007/smart-auto-clicker/releases")
         if remote_version and remote_version != current_version:
+            import webbrowser
             self.update_label.config(text=f"New version available: {remote_version}", foreground="red")
             update_button = ttk.Button(self.window, text="Update", command=lambda: webbrowser.open(download_url))
             update_button.pack(pady=5, ipadx=10, fill="x", anchor="center", expand=True)
@@ -168,32 +214,27 @@ class ConfigWindow:
         new_config = {
             "use_current_pos": self.auto_position_var.get(),
             "startup_mode": self.startup_mode_var.get(),
-            "exec_on_startup": self.startup_var.get()
+            "exec_on_startup": self.startup_var.get(),
+            "profiler_hotkey_enabled": self.profiler_var.get()
         }
         try:
-            with open(globals.app_config_file_path, "r") as f:
-                current_config = json.load(f)
-            current_config["use_current_pos"] = new_config["use_current_pos"]
-            current_config["startup_mode"] = new_config["startup_mode"]
-            current_config["exec_on_startup"] = new_config["exec_on_startup"]
-            with open(globals.app_config_file_path, "w") as f:
-                json.dump(current_config, f)
-            MemoryManager.set("use_current_pos", new_config["use_current_pos"])
-            MemoryManager.set("startup_mode", new_config["startup_mode"])
-            MemoryManager.save_memory()
+            # Written behind by the settings store (also read at startup by MemoryManager).
+            Settings.update(new_config)
+            if "profiler_hotkey" not in Settings: Settings.set("profiler_hotkey", self.profiler_hotkey)
+            Settings.save()
             self.original_config = new_config.copy()
             # Apply the changes to the system.
             if new_config["exec_on_startup"]: enable_startup()
             else: disable_startup()
             self.config_changed = False
+            # Let the main window apply the changes.
+            self.parent.event_generate("<<SettingsSaved>>")
         except Exception as e: messagebox.showerror("Error", f"Error saving configuration:\n{e}")
 
     def load_config(self):
-        # Try to load the configuration from a file.
-        try:
-            with open(globals.app_config_file_path, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        # Settings already loaded at startup.
+        if Settings.exists and not Settings.load_error: return Settings.snapshot()
+        else:
             # If the file doesn't exist or is corrupt, return default values.
             return {
             "hours": "0",
@@ -0,0 +1,88 @@
+from tkinter import ttk, messagebox
+from src.clickers.engine import JobState
+import tkinter as tk, src.lib.globals as globals
+
+class JobsWindow:
+    REFRESH_MS = 500
+
+    def __init__(self, parent, app):
+        self.parent = parent
+        self.app = app
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Click Jobs")
+        self.window.geometry("560x320")
+        self.window.resizable(False, False)
+
+        # Icon.
+        self.window.iconbitmap(globals.app_icon_path)
+
+        # Job list with per-job stats.
+        columns = ("name", "key", "interval", "state", "fired", "rate", "late")
+        headings = ("Name", "Key", "Interval", "State", "Fired", "Rate", "Late")
+        widths = (90, 70, 70, 70, 60, 110, 50)
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", height=10)
+        for column, heading, width in zip(columns, headings, widths):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="center")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Job controls.
+        controls_frame = ttk.Frame(self.window)
+        controls_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Button(controls_frame, text="Add current settings", command=self.add_job).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls_frame, text="Start", command=lambda: self.for_selected(lambda handle: handle.start())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls_frame, text="Pause/Resume", command=lambda: self.for_selected(self.toggle_pause)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls_frame, text="Stop", command=lambda: self.for_selected(lambda handle: handle.stop())).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls_frame, text="Remove", command=lambda: self.for_selected(self.app.remove_extra_job)).pack(side=tk.LEFT, padx=2)
+
+        ttk.Label(
+            self.window,
+            text="All jobs share one scheduler thread. The main job is controlled with the trigger key.",
+            font=("Arial", 8),
+            foreground="gray"
+        ).pack(pady=(0, 5))
+
+        self.refresh()
+
+    def add_job(self):
+        job = self.app.build_click_job()
+        if job is None: return
+        self.app.add_extra_job(job)
+        self.refresh(reschedule=False)
+
+    def toggle_pause(self, handle):
+        if handle.state == JobState.PAUSED: handle.resume()
+        elif handle.state == JobState.RUNNING: handle.pause()
+
+    def for_selected(self, action):
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showinfo("Click Jobs", "Select a job first.", parent=self.window)
+            return
+        handles = {str(id(handle)): handle for handle in self.app.extra_jobs}
+        for item in selection:
+            handle = handles.get(item)
+            if handle: action(handle)
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.window.winfo_exists(): return
+        current = set()
+        for handle in self.app.extra_jobs:
+            item = str(id(handle))
+            current.add(item)
+            job, stats = handle.job, handle.get_stats()
+            values = (
+                handle.name,
+                job.click_key,
+                f"{job.interval * 1000:g} ms",
+                handle.state.value,
+                stats.ticks,
+                f"{stats.achieved_rate:.2f}/{stats.requested_rate:.2f}/s" if stats.ticks > 1 else "-",
+                stats.overruns
+            )
+            if self.tree.exists(item): self.tree.item(item, values=values)
+            else: self.tree.insert("", tk.END, iid=item, values=values)
+        for item in self.tree.get_children():
+            if item not in current: self.tree.delete(item)
+        if reschedule: self.window.after(self.REFRESH_MS, self.refresh)
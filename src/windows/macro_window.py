@@ -0,0 +1,122 @@
+from tkinter import ttk, messagebox, filedialog
+from src.clickers.engine import JobState
+from src.macros import MACRO_EXTENSION, MAX_SPEED, MIN_SPEED, SCRIPT_EXTENSION
+import os, tkinter as tk, src.lib.globals as globals
+
+class MacroWindow:
+    REFRESH_MS = 200
+
+    def __init__(self, parent, app):
+        self.parent = parent
+        self.app = app
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Macros")
+        self.window.geometry("300x375")
+        self.window.resizable(False, False)
+
+        # Icon.
+        self.window.iconbitmap(globals.app_icon_path)
+
+        # Recorded macro.
+        record_frame = ttk.LabelFrame(self.window, text="Recording", padding=10)
+        record_frame.pack(fill="x", padx=10, pady=5)
+        self.macro_label = ttk.Label(record_frame, text="")
+        self.macro_label.pack(anchor="w")
+        self.record_button = ttk.Button(record_frame, command=self.app.toggle_macro_recording)
+        self.record_button.pack(fill="x", pady=(5, 0))
+        ttk.Label(
+            record_frame,
+            text=f"Use {self.app.macro_record_key} to start/stop without recording this window.",
+            font=("Arial", 8),
+            foreground="gray"
+        ).pack(anchor="w")
+        file_frame = ttk.Frame(record_frame)
+        file_frame.pack(fill="x", pady=(5, 0))
+        ttk.Button(file_frame, text="Open...", command=self.open_file).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        ttk.Button(file_frame, text="Save as...", command=self.save_file).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+
+        # Playback options.
+        play_frame = ttk.LabelFrame(self.window, text="Playback", padding=10)
+        play_frame.pack(fill="x", padx=10, pady=5)
+        speed_frame = ttk.Frame(play_frame)
+        speed_frame.pack(fill="x")
+        ttk.Label(speed_frame, text="Speed (x):").pack(side=tk.LEFT)
+        self.speed_var = tk.StringVar(value="1.0")
+        self.speed_entry = ttk.Spinbox(speed_frame, from_=MIN_SPEED, to=MAX_SPEED, increment=0.5, textvariable=self.speed_var, width=6)
+        self.speed_entry.pack(side=tk.LEFT, padx=5)
+        self.asap_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(speed_frame, text="As fast as possible", variable=self.asap_var, command=self.toggle_asap).pack(side=tk.LEFT)
+
+        buttons_frame = ttk.Frame(play_frame)
+        buttons_frame.pack(fill="x", pady=(5, 0))
+        ttk.Button(buttons_frame, text="Play", command=self.play).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        ttk.Button(buttons_frame, text="Stop", command=self.app.stop_macro).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        self.status_label = ttk.Label(play_frame, text="", font=("Arial", 8), foreground="blue")
+        self.status_label.pack(anchor="w")
+
+        # Scripts.
+        script_frame = ttk.LabelFrame(self.window, text="Script", padding=10)
+        script_frame.pack(fill="x", padx=10, pady=5)
+        self.script_label = ttk.Label(script_frame, text="")
+        self.script_label.pack(anchor="w")
+        script_buttons = ttk.Frame(script_frame)
+        script_buttons.pack(fill="x", pady=(5, 0))
+        ttk.Button(script_buttons, text="Load...", command=self.open_script).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        ttk.Button(script_buttons, text="Run", command=self.run_script).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+
+        self.refresh()
+
+    def toggle_asap(self):
+        self.speed_entry.config(state="disabled" if self.asap_var.get() else "normal")
+
+    def play(self):
+        try: speed = float(self.speed_var.get())
+        except ValueError:
+            messagebox.showwarning("Macros", "Invalid speed.", parent=self.window)
+            return
+        error = self.app.play_macro(speed, self.asap_var.get())
+        if error: messagebox.showwarning("Macros", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def open_file(self):
+        path = filedialog.askopenfilename(parent=self.window, filetypes=[("Macros", f"*{MACRO_EXTENSION}"), ("All files", "*.*")])
+        if not path: return
+        error = self.app.open_macro_file(path)
+        if error: messagebox.showwarning("Macros", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def save_file(self):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=MACRO_EXTENSION, filetypes=[("Macros", f"*{MACRO_EXTENSION}")])
+        if not path: return
+        error = self.app.save_macro_file(path)
+        if error: messagebox.showwarning("Macros", error, parent=self.window)
+
+    def open_script(self):
+        path = filedialog.askopenfilename(parent=self.window, filetypes=[("Scripts", f"*{SCRIPT_EXTENSION} *.txt"), ("All files", "*.*")])
+        if not path: return
+        error = self.app.open_script_file(path)
+        if error: messagebox.showwarning("Macros", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def run_script(self):
+        error = self.app.play_script()
+        if error: messagebox.showwarning("Macros", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.window.winfo_exists(): return
+        recording = self.app.macro_recorder is not None and self.app.macro_recorder.recording
+        macro = self.app.macro
+        if recording: self.macro_label.config(text="Recording...", foreground="red")
+        elif len(macro): self.macro_label.config(text=f"{len(macro)} events, {macro.duration:.2f} s", foreground="black")
+        else: self.macro_label.config(text="No macro recorded.", foreground="gray")
+        if self.app.script is not None: self.script_label.config(text=f"{os.path.basename(self.app.script_path)} ({len(self.app.script)} ops)", foreground="black")
+        else: self.script_label.config(text="No script loaded.", foreground="gray")
+        self.record_button.config(text=f"{'Stop recording' if recording else 'Record'} ({self.app.macro_record_key})")
+        handle = self.app.macro_job
+        if handle is not None and handle.state != JobState.STOPPED:
+            stats = handle.get_stats()
+            self.status_label.config(text=f"Playing: {stats.ticks} frames sent, late {handle.metrics.lateness.percentile(0.99) * 1000:.2f} ms p99")
+        elif handle is not None and handle.last_error: self.status_label.config(text=f"Last error: {handle.last_error}")
+        else: self.status_label.config(text="Stopped")
+        if reschedule: self.window.after(self.REFRESH_MS, self.refresh)
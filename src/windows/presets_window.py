@@ -0,0 +1,96 @@
+from tkinter import ttk, messagebox
+import tkinter as tk, src.lib.globals as globals
+
+class PresetsWindow:
+    REFRESH_MS = 500
+
+    def __init__(self, parent, app):
+        self.parent = parent
+        self.app = app
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Presets")
+        self.window.geometry("460x340")
+        self.window.resizable(False, False)
+
+        # Icon.
+        self.window.iconbitmap(globals.app_icon_path)
+
+        # Preset list.
+        columns = ("name", "key", "interval", "mode", "hotkey")
+        headings = ("Name", "Key", "Interval", "Mode", "Hotkey")
+        widths = (110, 70, 80, 70, 90)
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", height=8, selectmode="browse")
+        for column, heading, width in zip(columns, headings, widths):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="center")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=5)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+
+        # Save the current settings under a name.
+        save_frame = ttk.LabelFrame(self.window, text="Current settings", padding=10)
+        save_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Label(save_frame, text="Name:").pack(side=tk.LEFT)
+        self.name_var = tk.StringVar()
+        ttk.Entry(save_frame, textvariable=self.name_var, width=14).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(save_frame, text="Hotkey:").pack(side=tk.LEFT)
+        self.hotkey_var = tk.StringVar()
+        ttk.Entry(save_frame, textvariable=self.hotkey_var, width=10).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Button(save_frame, text="Save", command=self.save_preset).pack(side=tk.LEFT, expand=True, fill="x")
+
+        # Preset controls.
+        controls_frame = ttk.Frame(self.window)
+        controls_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Button(controls_frame, text="Apply", command=self.apply_preset).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+        ttk.Button(controls_frame, text="Delete", command=self.delete_preset).pack(side=tk.LEFT, expand=True, fill="x", padx=2)
+
+        ttk.Label(
+            self.window,
+            text="Hotkeys (e.g. ctrl+1) switch the main job instantly, even while clicking.",
+            font=("Arial", 8),
+            foreground="gray"
+        ).pack(pady=(0, 5))
+
+        self.refresh()
+
+    def selected(self):
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showinfo("Presets", "Select a preset first.", parent=self.window)
+            return None
+        return selection[0]
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        preset = self.app.presets.get(selection[0]) if selection else None
+        if preset is None: return
+        self.name_var.set(preset.name)
+        self.hotkey_var.set(preset.hotkey)
+
+    def save_preset(self):
+        error = self.app.save_preset(self.name_var.get(), self.hotkey_var.get())
+        if error: messagebox.showwarning("Presets", error, parent=self.window)
+        self.refresh(reschedule=False)
+
+    def apply_preset(self):
+        name = self.selected()
+        if name is not None: self.app.switch_preset(name)
+
+    def delete_preset(self):
+        name = self.selected()
+        if name is None: return
+        self.app.delete_preset(name)
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule=True):
+        if not self.window.winfo_exists(): return
+        current = set()
+        for preset in self.app.presets:
+            current.add(preset.name)
+            job = preset.job
+            name = f"> {preset.name}" if preset.name == self.app.active_preset else preset.name
+            values = (name, job.click_key, f"{job.interval * 1000:g} ms", "hold" if job.hold_mode else "click", preset.hotkey or "-")
+            if self.tree.exists(preset.name): self.tree.item(preset.name, values=values)
+            else: self.tree.insert("", tk.END, iid=preset.name, values=values)
+        for item in self.tree.get_children():
+            if item not in current: self.tree.delete(item)
+        if reschedule: self.window.after(self.REFRESH_MS, self.refresh)